@@ -1,6 +1,12 @@
 from .endpoints import WhisperTradesEndpoints
+from .async_endpoints import AsyncWhisperTradesEndpoints
 from .bots import WhisperTradesBots
-from .variables import WhisperTradesVariables
+from .positions import WhisperTradesPositionSync
+from .variables import WhisperTradesVariables, WhisperTradesVariableIndex
 from .scheduler import WhisperTradesScheduler
+from .jobstore import WhisperTradesJobStore
+from .market_calendar import WhisperTradesMarketCalendar
 from .throttle import WhisperTradesThrottle
+from .store import WhisperTradesSnapshotStore
+from .cache import WhisperTradesResponseCache
 from .via_ui import SeleniumDriver
\ No newline at end of file
@@ -0,0 +1,502 @@
+########################################################################################################################
+########################################################################################################################
+###   Async Endpoint Objects for WhisperTrades.com API                                                               ###
+###                                                                                                                  ###
+###   Authored by Paul Nobrega   Contact: Paul@PaulNobrega.net                                                       ###
+###   Python Version 3.10                                                                                            ###
+########################################################################################################################
+########################################################################################################################
+import asyncio
+import aiohttp
+from urllib.parse import urljoin
+import posixpath
+import json
+from .endpoints import WhisperTradesEndpoints, json_loads
+
+
+
+class AsyncWhisperTradesEndpoints(object):
+    """
+    Asyncio endpoint handler for WhisperTrades.com API.  Mirrors WhisperTradesEndpoints with awaitable methods.
+
+    All groups share one pooled aiohttp session and one throttle, so concurrent calls (e.g. via asyncio.gather)
+    overlap their network waits while staying within the rate limit.  The throttle may also be shared with a
+    synchronous WhisperTradesEndpoints.
+
+    Args:
+        token (str): API token for authentication.
+        throttle (object): Throttle object for rate limiting.
+        pool_size (int): Maximum number of pooled connections kept open to the API server. Default is 10.
+        keep_alive (bool): Reuse connections between requests. Default is True.
+        max_retries (int): Times an idempotent GET is retried after a 429/503 rate-limit response. Default is 3.
+    """
+    def __init__(self, token: str, throttle: object, pool_size: int = 10, keep_alive: bool = True, max_retries: int = 3) -> None:
+        self.throttle: object = throttle
+        self.config = self.__config(token)
+        self.session = self.__session(self.config, self.throttle, pool_size, keep_alive, max_retries)
+        self.bots = self.__bots(self.config, self.session)
+        self.reports = self.__reports(self.config, self.session)
+        self.variables = self.__variables(self.config, self.session)
+        self.brokers = self.__brokers(self.config, self.session)
+
+    async def __aenter__(self) -> 'AsyncWhisperTradesEndpoints':
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.close()
+        return
+
+    async def close(self) -> None:
+        """
+        Close all pooled connections held by the shared session
+        """
+        await self.session.close()
+        return
+
+    @staticmethod
+    async def format_response(response, unwrap: bool = True):
+        """
+        Format API responses to JSON
+        """
+        txt_to_json = json_loads(await response.read())
+        return WhisperTradesEndpoints.format_json(txt_to_json, response.ok, response.status, response.reason, str(response.url), unwrap)
+
+    class __config(object):
+        def __init__(self, token):
+            self.TOKEN = token
+            self.SERVER = r'https://api.whispertrades.com/v1/'
+            self.HEADERS = {'Accept': 'application/json', 'Content-Type': 'application/json', 'authorization': f'Bearer {self.TOKEN}'}
+
+    class __session(object):
+        """
+        Connection-pooled aiohttp session shared by all endpoint groups.  Created on first use inside the running loop.
+        """
+        RETRY_METHODS = ('GET',)
+
+        def __init__(self, config, throttle, pool_size=10, keep_alive=True, max_retries=3):
+            self.config = config
+            self._throttle = throttle
+            self.pool_size = pool_size
+            self.keep_alive = keep_alive
+            self.max_retries = max_retries
+            self._http = None
+
+        def __client(self):
+            if self._http is None or self._http.closed:
+                connector = aiohttp.TCPConnector(limit=self.pool_size, force_close=not self.keep_alive)
+                self._http = aiohttp.ClientSession(headers=self.config.HEADERS, connector=connector)
+            return self._http
+
+        @staticmethod
+        def _encode_params(params):
+            """
+            Encode query params the way requests does: booleans as 'True'/'False' and lists as repeated keys
+            """
+            encoded = []
+            for key, value in (params or {}).items():
+                for v in (value if isinstance(value, (list, tuple)) else [value]):
+                    encoded.append((key, str(v) if isinstance(v, bool) else v))
+            return encoded
+
+        async def request(self, method: str, url: str, params=None, data=None):
+            """
+            Send a throttled request over the pooled session and return the response with its body read
+            """
+            attempt = 0
+            while True:
+                await self._throttle.acquire_async()
+                response = await self.__client().request(method, url, params=self._encode_params(params), data=data or None)
+                await response.read()
+                self._throttle.feedback(response.status, response.headers)
+                if response.status not in self._throttle.RATE_LIMIT_STATUS_CODES or method.upper() not in self.RETRY_METHODS or attempt >= self.max_retries:
+                    return response
+                attempt += 1
+
+        async def close(self):
+            """
+            Close all pooled connections
+            """
+            if self._http is not None and not self._http.closed:
+                await self._http.close()
+            return
+
+    class __bots(object):
+
+        def __init__(self, config, session):
+            self.endpt = r'bots/'
+            self.config = config
+            self._session = session
+
+        async def get_bot_orders(self, bot_number: str) -> json:
+            """
+            Get all orders for a specific bot by bot_number.
+
+            :param bot_number: number of bot.
+            :type bot_number: String
+
+            :return: json data from response received from WhisperTrades API
+            :type return: json
+            """
+            if not bot_number:
+                raise ValueError("Bot number is required to get orders.")
+            url_path = urljoin(self.config.SERVER, posixpath.join(self.endpt, bot_number, 'orders'))
+            response = await self._session.request("GET", url_path)
+            return await AsyncWhisperTradesEndpoints.format_response(response)
+
+        async def get_bot_positions(self, bot_number: str = '', position_number: str = '', status: str = '', from_date: str = '', to_date: str = '', page: str = '') -> json:
+            """
+            Get a paginated list of bot positions, or a single position if position_number is provided.
+
+            :param bot_number: Bot number to filter positions (optional)
+            :param position_number: Unique position number to retrieve a single position (optional)
+            :param status: Filter by position status (OPEN or CLOSED, optional)
+            :param from_date: Minimum entry date (YYYY-MM-DD, optional)
+            :param to_date: Maximum entry date (YYYY-MM-DD, optional)
+            :param page: Page number (optional)
+            :return: json data from response received from WhisperTrades API
+            """
+            if position_number:
+                url_path = urljoin(self.config.SERVER, posixpath.join('bots/positions', position_number))
+                params = {}
+            else:
+                url_path = urljoin(self.config.SERVER, 'bots/positions')
+                params = {}
+                if bot_number:
+                    params['bot'] = bot_number
+                if status:
+                    params['status'] = status
+                if from_date:
+                    params['from_date'] = from_date
+                if to_date:
+                    params['to_date'] = to_date
+                if page:
+                    params['page'] = page
+            response = await self._session.request("GET", url_path, params=params)
+            return await AsyncWhisperTradesEndpoints.format_response(response)
+
+        async def iter_bot_positions(self, bot_number: str = '', status: str = '', from_date: str = '', to_date: str = '', prefetch: bool = False):
+            """
+            Asynchronously stream bot positions across every page of results (usage: async for pos in ...).
+
+            :param bot_number: Bot number to filter positions (optional)
+            :param status: Filter by position status (OPEN or CLOSED, optional)
+            :param from_date: Minimum entry date (YYYY-MM-DD, optional)
+            :param to_date: Maximum entry date (YYYY-MM-DD, optional)
+            :param prefetch: Request the next page in the background while the current page is consumed. Default = False
+            :return: async generator of position json
+            """
+            fetch_page = lambda page: self.__positions_page(bot_number, status, from_date, to_date, page)
+            if not prefetch:
+                page = 1
+                while page is not None:
+                    positions, page = await fetch_page(page)
+                    for position in positions:
+                        yield position
+                return
+            task = asyncio.ensure_future(fetch_page(1))
+            try:
+                while task is not None:
+                    positions, page = await task
+                    task = asyncio.ensure_future(fetch_page(page)) if page is not None else None
+                    for position in positions:
+                        yield position
+            finally:
+                if task is not None:
+                    task.cancel()
+
+        async def __positions_page(self, bot_number, status, from_date, to_date, page):
+            url_path = urljoin(self.config.SERVER, 'bots/positions')
+            params = {'page': page}
+            if bot_number:
+                params['bot'] = bot_number
+            if status:
+                params['status'] = status
+            if from_date:
+                params['from_date'] = from_date
+            if to_date:
+                params['to_date'] = to_date
+            response = await self._session.request("GET", url_path, params=params)
+            payload = await AsyncWhisperTradesEndpoints.format_response(response, unwrap=False)
+            return WhisperTradesEndpoints.split_page(payload, page)
+
+        async def close_bot_position(self, position_number: str) -> json:
+            """
+            Close a specific bot position by position number.
+
+            :param position_number: Position number to close
+            :return: json data from response received from WhisperTrades API
+            """
+            if not position_number:
+                raise ValueError("Position number is required to close a bot position.")
+            url_path = urljoin(self.config.SERVER, posixpath.join('bots/positions', position_number, 'close'))
+            response = await self._session.request("PUT", url_path)
+            return await AsyncWhisperTradesEndpoints.format_response(response)
+
+        async def get_bot(self, bot_number: str='', status_filter: list=['Enabled', 'Disabled', 'Disable on Close'], include_details: bool=True) -> json:
+            """
+            Query WhisperTrades.com for bot information at endpoint: 'bots/'
+
+            :param bot_number: number of bot. Default = '' to return all bot information
+            :type bot_number: String
+            :param status_filter: Empty list or list containing any combination of: 'Enabled', ' Disabled', 'Disabled on Close'. Default = [] to apply no filter
+            :type password: List
+            :param include_details: Include all bot settings. Default = True
+            :type include_details: Boolean
+
+            :return: json data from response received from WhisperTrades API
+            :type return: json
+            """
+            url_path = urljoin(self.config.SERVER, posixpath.join(self.endpt, bot_number))
+            params = {'include_details':include_details, 'statuses[]': status_filter}
+            response = await self._session.request("GET", url_path, params=params)
+            return await AsyncWhisperTradesEndpoints.format_response(response)
+
+        async def get_all_bots(self) -> json:
+            """
+            Query WhisperTrades.com for ALL bot information at endpoint: 'bots/'
+
+            :return: json data from response recieved from WhisperTrades API
+            :type return: json
+            """
+            return await self.get_bot(bot_number='', status_filter=[])
+
+        async def enable_bot(self, bot_number:str) -> json:
+            """
+            Enable WhisperTrades.com bot by bot_number
+
+            :param bot_number: number of bot.
+            :type bot_number: String
+
+            :return: json data from response recieved from WhisperTrades API
+            :type return: json
+            """
+            url_path = urljoin(self.config.SERVER, posixpath.join(self.endpt, bot_number,'enable'))
+            response = await self._session.request("PUT", url_path)
+            return await AsyncWhisperTradesEndpoints.format_response(response)
+
+        async def disable_bot(self, bot_number:str) -> json:
+            """
+            Disable WhisperTrades.com bot by bot_number.  If bot has open positions, status will be set to 'Disable on Close'
+
+            :param bot_number: number of bot.
+            :type bot_number: String
+
+            :return: json data from response recieved from WhisperTrades API
+            :type return: json
+            """
+            url_path = urljoin(self.config.SERVER, posixpath.join(self.endpt, bot_number,'disable'))
+            response = await self._session.request("PUT", url_path)
+            return await AsyncWhisperTradesEndpoints.format_response(response)
+
+        async def open_position(self, bot_number: str) -> json:
+            """
+            Open a position for the specified bot.
+
+            :param bot_number: number of bot.
+            :type bot_number: String
+
+            :return: json data from response received from WhisperTrades API
+            :type return: json
+            """
+            url_path = urljoin(self.config.SERVER, posixpath.join(self.endpt, bot_number, 'open_position'))
+            response = await self._session.request("PUT", url_path)
+            return await AsyncWhisperTradesEndpoints.format_response(response)
+
+        async def close_position(self, bot_number: str) -> json:
+            """
+            Close a position for the specified bot.
+
+            :param bot_number: number of bot.
+            :type bot_number: String
+
+            :return: json data from response received from WhisperTrades API
+            :type return: json
+            """
+            url_path = urljoin(self.config.SERVER, posixpath.join(self.endpt, bot_number, 'close_position'))
+            response = await self._session.request("PUT", url_path)
+            return await AsyncWhisperTradesEndpoints.format_response(response)
+
+    class __reports(object):
+
+        def __init__(self, config, session):
+            self.endpt = r'bots/reports/'
+            self.config = config
+            self._session = session
+
+        async def get_bot_report(self, report_number: str='') -> json:
+            """
+            Query WhisperTrades.com for report by report_number.
+
+            :param report_number: number of report. Default = '' to return all report information
+            :type report_number: String
+
+            :return: json data from response recieved from WhisperTrades API
+            :type return: json
+            """
+            url_path = urljoin(self.config.SERVER, posixpath.join(self.endpt, report_number))
+            response = await self._session.request("GET", url_path)
+            return await AsyncWhisperTradesEndpoints.format_response(response)
+
+        async def get_all_bot_reports(self) -> json:
+            """
+            Query WhisperTrades.com for ALL reports.
+
+            :return: json data from response recieved from WhisperTrades API
+            :type return: json
+            """
+            return await self.get_bot_report('')
+
+        async def update_bot_report(self, report_number: str, new_name:str = '', new_start_date:str='', new_end_date:str='', run_until_latest_date:bool=False) -> json:
+            """
+            Update report at WhisperTrades.com by report_number.
+
+            Required
+            :param report_number: number of report.
+            :type report_number: String
+
+            Optional
+            :param new_name: New name to rename report as
+            :type new_name: String
+            :param new_start_date: New start date for the report. Expected format is 'YYYY-MM-DD'
+            :type new_start_date: String
+            :param new_end_date: New end date for the report. Expected format is 'YYYY-MM-DD'
+            :type new_end_date: String
+            :param run_until_latest_date: Run report until current date if True. Default = False
+            :type run_until_latest_date: Boolean
+
+            :return: json data from response recieved from WhisperTrades API
+            :type return: json
+            """
+            url_path = urljoin(self.config.SERVER, posixpath.join(self.endpt, report_number))
+            payload = {
+                "name": new_name,
+                "start_date": new_start_date,
+                "end_date": new_end_date,
+                "run_until_latest_date": run_until_latest_date
+                }
+            payload = {key: value for key, value in payload.items() if value != ''}
+            response = await self._session.request("PUT", url_path, data=json.dumps(payload))
+            return await AsyncWhisperTradesEndpoints.format_response(response)
+
+        async def run_bot_report(self, report_number:str=''):
+            """
+            Run report at WhisperTrades.com by report_number.
+
+            Required
+            :param report_number: number of report.
+            :type report_number: String
+
+            :return: json data from response recieved from WhisperTrades API
+            :type return: json
+            """
+            if report_number == '':
+                raise ValueError(f"Insufficient information supplied to run report! (REQUIRED) report_number: {report_number}")
+            url_path = urljoin(self.config.SERVER, posixpath.join(self.endpt, report_number,'run'))
+            response = await self._session.request("PUT", url_path)
+            return await AsyncWhisperTradesEndpoints.format_response(response)
+
+    class __variables(object):
+
+        def __init__(self, config, session):
+            self.endpt = r'bots/variables/'
+            self.config = config
+            self._session = session
+
+        async def get_bot_variables(self, variable_number:str='') -> json:
+            """
+            Query WhisperTrades.com for variable by variable_number.
+
+            :param variable_number: number of variable. Default = '' to return all variable information
+            :type variable_number: String
+
+            :return: json data from response recieved from WhisperTrades API
+            :type return: json
+            """
+            url_path = urljoin(self.config.SERVER, posixpath.join(self.endpt, variable_number))
+            response = await self._session.request("GET", url_path)
+            return await AsyncWhisperTradesEndpoints.format_response(response)
+
+        async def get_all_bot_variables(self) -> json:
+            """
+            Query WhisperTrades.com for ALL variables.
+
+            :return: json data from response recieved from WhisperTrades API
+            :type return: json
+            """
+            return await self.get_bot_variables('')
+
+        async def set_bot_variables(self, variable_number:str='', variable_name:str='', new_value:str='') -> json:
+            """
+            Set WhisperTrades.com variable by name to new given value.
+
+            REQUIRED
+            :param variable_number: number of variable.
+            :type variable_number: String
+            :param variable_name: name of variable.
+            :type variable_name: String
+            :param new_value: new 'free text type' value to associate with variable name.
+            :type new_value: String
+
+            :return: json data from response recieved from WhisperTrades API
+            :type return: json
+            """
+            if variable_number == '' or variable_name == '' or new_value == '':
+                raise ValueError(f"Insufficient information supplied to set bot variable! (REQUIRED) variable_number: {variable_number}, (REQUIRED) variable_name: {variable_name}, (REQUIRED) new_value: {new_value}")
+            url_path = urljoin(self.config.SERVER, posixpath.join(self.endpt, variable_number))
+            payload = json.dumps({"name": variable_name, "value": new_value})
+            response = await self._session.request("PUT", url_path, data=payload)
+            return await AsyncWhisperTradesEndpoints.format_response(response)
+
+    class __brokers(object):
+
+        def __init__(self, config, session):
+            self.endpt = r'broker_connections/'
+            self.config = config
+            self._session = session
+
+        async def get_broker_connections(self, number: str = '') -> json:
+            """
+            Get a single broker connection or a list of all broker connections.
+
+            :param number: Unique identifier to retrieve a single broker connection. If omitted, all broker connections will be returned.
+            :type number: String
+
+            :return: json data from response received from WhisperTrades API
+            :type return: json
+            """
+            url_path = urljoin(self.config.SERVER, posixpath.join(self.endpt, number))
+            response = await self._session.request("GET", url_path)
+            data = await AsyncWhisperTradesEndpoints.format_response(response)
+            # Remove any broker connections with 'broker': 'TD Ameritrade' as broker is no longer valid
+            if isinstance(data, list):
+                data = [d for d in data if d.get('broker', '').lower() != 'td ameritrade']
+            elif isinstance(data, dict) and data.get('broker', '').lower() == 'td ameritrade':
+                return None
+            return data
+
+        async def get_all_broker_connections(self) -> json:
+            """
+            Get a list of all broker connections.
+
+            :return: json data from response received from WhisperTrades API
+            :type return: json
+            """
+            return await self.get_broker_connections('')
+
+        async def rebalance_broker_collateral(self, number: str) -> json:
+            """
+            Rebalance your collateral position for a given broker connection.
+            This requires that the collateral be configured and enabled at Whispertrades.
+            If your current collateral balance is within the minimum and maximum target amounts, a transaction will not happen.
+
+            :param number: Unique identifier for the broker connection to rebalance
+            :type number: String
+
+            :return: json data from response received from WhisperTrades API
+            :type return: json
+            """
+            if not number:
+                raise ValueError("Broker connection number is required for collateral rebalance.")
+            url_path = urljoin(self.config.SERVER, posixpath.join(self.endpt, number, 'collateral', 'rebalance'))
+            response = await self._session.request("PUT", url_path)
+            return await AsyncWhisperTradesEndpoints.format_response(response)
@@ -7,8 +7,25 @@
 ########################################################################################################################
 ########################################################################################################################
 import json
+import threading
+import time
 import warnings
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from .variables import WhisperTradesVariableIndex
+from .models import slot_obj, order_obj
+from .positions import WhisperTradesPositionSync
+
+_MISSING = object()
+
+
+def _variable_numbers(variables):
+    """
+    Variable numbers of a bot's variables list (entries may be variable summaries or full variable json)
+    """
+    if not isinstance(variables, list):
+        return variables
+    return [var.get('number') if isinstance(var, dict) else var for var in variables]
 
 
 class WhisperTradesBots(object):
@@ -17,10 +34,12 @@ class WhisperTradesBots(object):
 
     Args:
         scheduler (object): Scheduler object for bot scheduling and endpoint access.
+        variable_index (object): Bot/variable index shared with WhisperTradesVariables. Default = None to create one
     """
-    def __init__(self, scheduler: object) -> None:
+    def __init__(self, scheduler: object, variable_index: object = None) -> None:
         self._scheduler: object = scheduler
         self._endpts = self._scheduler._endpts
+        self.variable_index = variable_index if variable_index is not None else WhisperTradesVariableIndex()
         self.bots_list = self.__bot_list(self._scheduler)
 
     def __call__(self, bot_number):
@@ -28,146 +47,529 @@ class WhisperTradesBots(object):
         Return the bot object for the provided bot number.
         Usage: WD.bots('BOT_NUMBER')
         """
-        for bot in self.bots_list.all:
-            if hasattr(bot, 'number') and bot.number == bot_number:
-                return bot
-        raise KeyError(f"Bot number '{bot_number}' not found.")
+        bot = self.bots_list.get(bot_number)
+        if bot is None:
+            raise KeyError(f"Bot number '{bot_number}' not found.")
+        return bot
        
     def get_all_bot_variables(self) -> json:
         """
-        Query WhisperTrades.com for all bot variables and associate data with related bot object
+        Query WhisperTrades.com for all bot variables, associate data with related bot object and rebuild the
+        bot/variable index
        
         :return: json data from response recieved from WhisperTrades API
         :type return: json
         """
         all_variables = self._endpts.variables.get_all_bot_variables()
-        for var in all_variables:
-            for bot in self.bots_list.all:
-                for i, bot_var in enumerate(bot.variables):
-                    if bot_var['number'] == var['number']:
-                        bot.variables[i] = var
+        bots = self.bots_list.all
+        self.variable_index.rebuild(all_variables, bots)
+        for bot in bots:
+            for i, bot_var in enumerate(bot.variables):
+                var = self.variable_index.variable(bot_var['number'])
+                if var is not None:
+                    bot.variables[i] = var
         return all_variables
     
-    def update_all_bots(self):
+    def update_all_bots(self, bots_json: list = None, positions_json: list = None) -> dict:
+        """
+        Incrementally update bots_list with data retrieved from WhisperTrades.com API.  Existing bot objects are
+        updated in place (only changed fields), new bots are added and bots no longer returned are removed.  The
+        bot side of the bot/variable index is rebuilt from the updated bots.
+
+        :param bots_json: already fetched response of get_all_bots(). Default = None to query the API
+        :type bots_json: List
+        :param positions_json: already fetched positions (all pages). Default = None to query the API
+        :type positions_json: List
+
+        :return: change set with bot numbers under 'added', 'removed', 'status_changed', 'settings_changed' and
+                 'positions_changed', and the changed field names per updated bot under 'changed_fields'
+        :type return: dict
         """
-        Update bots_list with data retrieved from WhisperTrades.com API
+        if bots_json is None:
+            bots_json = self._endpts.bots.get_all_bots()
+        changes = self.bots_list.sync_bots(bots_json)
+        changes['positions_changed'] = self.bots_list.update_positions_all_bots(positions_json)
+        self.variable_index.update_bots(self.bots_list.all)
+        return changes
+
+    def defer_update_all_bots(self):
+        """
+        Lazy loading: postpone update_all_bots until bots_list is first accessed
         """
-        self.bots_list.all = []
-        _ = [self.bots_list.add_bot_to_list(bot) for bot in self._endpts.bots.get_all_bots()]
-        self.bots_list.update_positions_all_bots()
+        self.bots_list._loader = self.update_all_bots
         return
 
+    def enable_many(self, bots=None, max_workers: int = 4, skip_current: bool = True) -> dict:
+        """
+        Enable several bots concurrently.  Bots that are already enabled are skipped.
+
+        :param bots: list of bot numbers, a single bot number, or a predicate called with each bot object
+                     (e.g. lambda bot: bot.symbol == 'SPX'). Default = None for every bot
+        :type bots: List, String or callable
+        :param max_workers: Number of requests in flight at once (all of them still pass through the shared throttle). Default = 4
+        :type max_workers: int
+        :param skip_current: Skip bots whose cached status is already enabled. False sends the request regardless
+                             (the cached status may be stale, e.g. for scheduled runs). Default = True
+        :type skip_current: bool
+
+        :return: bot number -> report dict with 'action', 'result' ('changed', 'skipped' or 'failed'), 'status',
+                 'queued_sec', 'elapsed_sec' and 'error'
+        :type return: dict
+        """
+        return self.__change_status_many('enable', bots, max_workers, skip_current)
+
+    def disable_many(self, bots=None, max_workers: int = 4, skip_current: bool = True) -> dict:
+        """
+        Disable several bots concurrently.  Bots that are already disabled (or disabled on close) are skipped.
+
+        :param bots: list of bot numbers, a single bot number, or a predicate called with each bot object
+                     (e.g. lambda bot: bot.symbol == 'SPX'). Default = None for every bot
+        :type bots: List, String or callable
+        :param max_workers: Number of requests in flight at once (all of them still pass through the shared throttle). Default = 4
+        :type max_workers: int
+        :param skip_current: Skip bots whose cached status is already disabled. False sends the request regardless. Default = True
+        :type skip_current: bool
+
+        :return: bot number -> report dict, as returned by enable_many()
+        :type return: dict
+        """
+        return self.__change_status_many('disable', bots, max_workers, skip_current)
+
+    def __change_status_many(self, action, bots, max_workers, skip_current):
+        if bots is None:
+            targets = self.bots_list.all
+        elif callable(bots):
+            targets = [bot for bot in self.bots_list.all if bots(bot)]
+        else:
+            if isinstance(bots, str):
+                # A single bot number, not a sequence of characters
+                bots = [bots]
+            targets = [self.bots_list.get(n) or n for n in bots]
+        done_keys = ('enabled',) if action == 'enable' else ('disabled', 'disabled on close')
+        report = {}
+        pending = []
+        for bot in targets:
+            if isinstance(bot, str):
+                report[bot] = _status_report(action, 'failed', None, error=f"Bot number '{bot}' not found.")
+            elif skip_current and self.bots_list._status_key(bot.status) in done_keys:
+                report[bot.number] = _status_report(action, 'skipped', bot.status)
+            else:
+                report[bot.number] = None
+                pending.append(bot)
+        if pending:
+            submitted_at = time.monotonic()
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(pending)))) as pool:
+                futures = [pool.submit(self.__change_status, action, bot, submitted_at) for bot in pending]
+                for bot, future in zip(pending, futures):
+                    report[bot.number] = future.result()
+        return report
+
+    def __change_status(self, action, bot, submitted_at):
+        started_at = time.monotonic()
+        try:
+            response = self._endpts.bots.put_bot_status(bot.number, action)
+            data = self._endpts.format_response(response)
+        except Exception as e:
+            return _status_report(action, 'failed', bot.status, started_at - submitted_at, time.monotonic() - started_at, str(e))
+        elapsed_sec = time.monotonic() - started_at
+        if not response.ok:
+            error = data.get('message', response.reason) if isinstance(data, dict) else response.reason
+            return _status_report(action, 'failed', bot.status, started_at - submitted_at, elapsed_sec, error)
+        if isinstance(data, dict) and data.get('number') == bot.number and 'status' in data:
+            bot._apply_changes(data)
+        elif action == 'enable':
+            bot.status = 'Enabled'
+        else:
+            # Bots with open positions are disabled on close by the server
+            has_open = any(str(pos.get('status') or '').upper() == 'OPEN' for pos in bot.positions)
+            bot.status = 'Disable on Close' if has_open else 'Disabled'
+        return _status_report(action, 'changed', bot.status, started_at - submitted_at, elapsed_sec)
+
+    def plan_entry_windows(self, exclude=(), enable_offset_min: float = -5, disable_offset_min: float = 5,
+                           disable_kind: str = 'disable', bucket_min: int = 1, bot_numbers: list = None):
+        """
+        Build the day's enable/disable plan from every bot's entry_condition earliest/latest_time_of_day (one
+        vectorised pass), grouped into time buckets.  See WhisperDriver.Obj.planner.entry_window_plan
+
+        :param exclude: bot numbers to leave out of the plan. Default = ()
+        :type exclude: iterable
+        :param enable_offset_min: minutes added to earliest_time_of_day (negative for before). Default = -5
+        :type enable_offset_min: float
+        :param disable_offset_min: minutes added to latest_time_of_day. Default = 5
+        :type disable_offset_min: float
+        :param disable_kind: 'disable' (API) or 'soft_disable' (Disabled on Close through via_selenium, which must be
+                             enabled before the jobs fire). Default = 'disable'
+        :type disable_kind: String
+        :param bucket_min: bucket width in minutes. Default = 1
+        :type bucket_min: int
+        :param bot_numbers: Only plan these bots. Default = None for all bots
+        :type bot_numbers: List
+
+        :return: one row per (time, kind) bucket with columns 'time', 'minute', 'kind' and 'bots'
+        :type return: pandas.DataFrame
+        """
+        from .planner import entry_window_plan
+        bots = self.bots_list.all if bot_numbers is None else [self(n) for n in bot_numbers]
+        return entry_window_plan(bots, exclude, enable_offset_min, disable_offset_min, disable_kind, bucket_min)
+
+    def schedule_entry_windows(self, plan=None, tz_str: str = 'America/New_York', calendar: object = None, **kwargs) -> list:
+        """
+        Register an entry-window plan with the scheduler: one job per bot and bucket, firing on trading days at the
+        bucket time.  Jobs of a bucket come due together and run as one batch (enable_many/disable_many or one
+        web-driver pass for soft disables).  Re-scheduling replaces the entry-window jobs of every bot in the plan
+        (in memory and in the job store), even when its bucket or disable kind changed.
+
+        :param plan: plan_entry_windows() result. Default = None to build one with kwargs
+        :type plan: pandas.DataFrame
+        :param tz_str: human readable TimeZone of the entry times. Default is 'America/New_York'
+        :type tz_str: String
+        :param calendar: WhisperTradesMarketCalendar deciding trading days. Default = None for the bundled NYSE calendar
+        :type calendar: object
+
+        :return: the scheduled jobs
+        :type return: List
+        """
+        from .market_calendar import trading_day_trigger
+        if plan is None:
+            plan = self.plan_entry_windows(**kwargs)
+        planned = {bot for bots in plan['bots'] for bot in bots}
+        for job in self._scheduler.jobs:
+            if job.id is not None and job.id.startswith('entry_window:') and job.target in planned:
+                self._scheduler.cancel(job)
+        if not self._scheduler.scheduler_is_on:
+            self._scheduler.start()
+        jobs = []
+        for time_str, kind, bots in zip(plan['time'], plan['kind'], plan['bots']):
+            trigger = trading_day_trigger(time_str, tz_str, calendar)
+            jobs.extend(self._scheduler.add_jobs(trigger, kind, bots, id_prefix='entry_window'))
+        return jobs
+
+    def positions_frame(self, bot_numbers: list = None, columns: tuple = None):
+        """
+        Columnar (pandas DataFrame) view of the positions held in bot.positions, with numeric profit/risk columns and
+        categorical bot/status/symbol columns.  Positions without a symbol take the symbol of their bot.
+
+        :param bot_numbers: Only include these bots. Default = None for all bots
+        :type bot_numbers: List
+        :param columns: Only build these columns of WhisperDriver.Obj.frames.POSITION_COLUMNS. Default = None for all
+        :type columns: tuple
+
+        :return: one row per position, columns as in WhisperDriver.Obj.frames.POSITION_COLUMNS
+        :type return: pandas.DataFrame
+        """
+        import numpy as np
+        import pandas as pd
+        from .frames import positions_frame
+        bots = self.bots_list.all if bot_numbers is None else [self(n) for n in bot_numbers]
+        # Positions are grouped by bot, so the bot column is built from the owning bots instead of read per position
+        categories = list(dict.fromkeys(bot.number for bot in bots))
+        code = {number: i for i, number in enumerate(categories)}
+        owners = pd.Categorical.from_codes(np.repeat([code[bot.number] for bot in bots],
+                                                     [len(bot.positions) for bot in bots]), categories=categories)
+        return positions_frame([pos for bot in bots for pos in bot.positions], {bot.number: bot.symbol for bot in bots},
+                               columns, owners)
+
+    def orders_frame(self, bot_numbers: list = None, orders: list = None):
+        """
+        Columnar (pandas DataFrame) view of bot orders.  Queries get_orders() for every bot unless orders is given.
+
+        :param bot_numbers: Only include these bots. Default = None for all bots
+        :type bot_numbers: List
+        :param orders: already fetched orders. Default = None to query the API
+        :type orders: List
+
+        :return: one row per order, columns as in WhisperDriver.Obj.frames.ORDER_COLUMNS
+        :type return: pandas.DataFrame
+        """
+        from .frames import orders_frame
+        if orders is None:
+            bots = self.bots_list.all if bot_numbers is None else [self(n) for n in bot_numbers]
+            orders = [order for bot in bots for order in bot.get_orders() or []]
+        return orders_frame(orders)
+
+    def pnl_by_bot(self, frame=None):
+        """
+        Realized, unrealized and total profit per bot, computed on positions_frame()
+
+        :param frame: already built positions_frame(). Default = None to build one with only the needed columns
+        :type frame: pandas.DataFrame
+        """
+        from .frames import PNL_COLUMNS, pnl_by_bot
+        return pnl_by_bot(self.positions_frame(columns=PNL_COLUMNS) if frame is None else frame)
+
+    def open_risk_by_symbol(self, frame=None):
+        """
+        Maximum risk of OPEN positions per symbol, computed on positions_frame()
+
+        :param frame: already built positions_frame(). Default = None to build one with only the needed columns
+        :type frame: pandas.DataFrame
+        """
+        from .frames import OPEN_RISK_COLUMNS, open_risk_by_symbol
+        return open_risk_by_symbol(self.positions_frame(columns=OPEN_RISK_COLUMNS) if frame is None else frame)
+
     class __bot_list(object):
+        """
+        Registry of bot objects indexed by bot number, with a maintained index per status.  Lookups, upserts,
+        removals and status queries are constant time; .all is an ordered (insertion order) view.
+        """
 
         def __init__(self, scheduler):
-            self.all = []
+            self._loader = None
+            self._loading = False
+            self._load_lock = threading.RLock()
+            self._by_number = {}
+            self._by_status = {}
             self._scheduler = scheduler
             self._endpts = self._scheduler._endpts
+            self.position_sync = WhisperTradesPositionSync(self._endpts)
         
         def __call__(self):
             """
             Return list of all bot numbers
             """
             return self.all
+
+        def __len__(self):
+            self._load_if_deferred()
+            return len(self._by_number)
+
+        def __contains__(self, bot_number):
+            self._load_if_deferred()
+            return bot_number in self._by_number
+
+        def _load_if_deferred(self):
+            """
+            Run the deferred loader once.  Other threads wait for the running load instead of reading an empty registry; a
+            failed load keeps the loader so the next access retries it.
+            """
+            if self._loader is None:
+                return
+            with self._load_lock:
+                loader = self._loader
+                if loader is None or self._loading:
+                    # Loaded meanwhile, or re-entered by the loader itself
+                    return
+                self._loading = True
+                try:
+                    loader()
+                except BaseException:
+                    self._loader = loader
+                    raise
+                finally:
+                    self._loading = False
+                self._loader = None
+            return
         
+        @property
         def all(self) -> list:
             """
-            Return list of all bot numbers
+            Return list of all bot objects.  If loading was deferred, the first access queries WhisperTrades.com
             """
-            return self.all
+            self._load_if_deferred()
+            return list(self._by_number.values())
+
+        @all.setter
+        def all(self, bots: list):
+            self._loader = None
+            self._by_number = {}
+            self._by_status = {}
+            for bot in bots:
+                self._index(bot)
+
+        def get(self, bot_number: str, default=None):
+            """
+            Return the bot object for bot_number, or default if not found
+            """
+            self._load_if_deferred()
+            return self._by_number.get(bot_number, default)
+
+        @staticmethod
+        def _status_key(status) -> str:
+            """
+            Normalize a bot status for the status index.  'Disable on Close' and 'Disabled on Close' share one key.
+            """
+            key = (status or '').strip().lower()
+            if key.startswith('disable') and key.endswith('on close'):
+                return 'disabled on close'
+            return key
+
+        def _index(self, bot):
+            self._by_number[bot.number] = bot
+            self._by_status.setdefault(self._status_key(bot.status), {})[bot.number] = bot
+            bot._bot_list = self
+            return
+
+        def _reindex_status(self, bot, old_status):
+            """
+            Move bot between status indexes.  Called by bot_obj when its status changes.
+            """
+            if self._by_number.get(bot.number) is not bot:
+                return
+            self._by_status.get(self._status_key(old_status), {}).pop(bot.number, None)
+            self._by_status.setdefault(self._status_key(bot.status), {})[bot.number] = bot
+            return
+
+        def _with_status(self, status) -> list:
+            self._load_if_deferred()
+            return list(self._by_status.get(self._status_key(status), {}).values())
         
         def is_enabled(self) -> list:
             """
             Return list of all bot numbers that have status = 'enabled'
             """
-            return [bot for bot in self.all if bot.status.lower() == 'enabled']
+            return self._with_status('enabled')
         
         def is_disabled(self) -> list:
             """
             Return list of all bot numbers that have status = 'disabled'
             """
-            return [bot for bot in self.all if bot.status.lower() == 'disabled']
+            return self._with_status('disabled')
         
         def is_disabled_on_close(self) -> list:
             """
             Return list of all bot numbers that have status = 'disabled on close'
             """
-            return [bot for bot in self.all if bot.status.lower() == 'disabled on close']
+            return self._with_status('disabled on close')
         
         def add_bot_to_list(self, bot_dict:dict={}):
             """
-            Add dictionary representation of a WT bot to bot_list.all
+            Add dictionary representation of a WT bot to bot_list.all.  The dictionary is used as is (not copied), so
+            pass a fresh payload such as an API response
 
-            Note: if bot_number exists in bot_list.all, it is removed and replaced with the new information
+            Note: if bot_number exists in bot_list.all, it is replaced with the new information (keeping its position)
             """
             if bot_dict=={}:
                 warnings.warn(f'bot_dict is empty!')
                 return
-            bot_json = json.loads(json.dumps(bot_dict))
-            self.remove_bot_from_list(bot_json['number'])
-            self.all.append(self.bot_obj(bot_json, self._scheduler))
+            old_bot = self._by_number.get(bot_dict['number'])
+            if old_bot is not None:
+                self._by_status.get(self._status_key(old_bot.status), {}).pop(old_bot.number, None)
+            self._index(self.bot_obj(bot_dict, self))
             return
         
+        def sync_bots(self, bots_json: list) -> dict:
+            """
+            Diff a full list of WT bot dictionaries against bot_list by bot number and apply only the differences.
+
+            :return: change set with bot numbers under 'added', 'removed', 'status_changed', 'settings_changed' and
+                     the changed field names per updated bot under 'changed_fields'
+            :type return: dict
+            """
+            self._loader = None
+            changes = {'added': [], 'removed': [], 'status_changed': [], 'settings_changed': [], 'changed_fields': {}}
+            seen = set()
+            for bot_dict in bots_json:
+                if not bot_dict:
+                    warnings.warn(f'bot_dict is empty!')
+                    continue
+                bot_number = bot_dict['number']
+                seen.add(bot_number)
+                bot = self._by_number.get(bot_number)
+                if bot is None:
+                    self._index(self.bot_obj(bot_dict, self))
+                    changes['added'].append(bot_number)
+                    continue
+                changed_fields = bot._apply_changes(bot_dict)
+                if not changed_fields:
+                    continue
+                changes['changed_fields'][bot_number] = changed_fields
+                if 'status' in changed_fields:
+                    changes['status_changed'].append(bot_number)
+                if any(field not in self.bot_obj.STATE_FIELDS for field in changed_fields):
+                    changes['settings_changed'].append(bot_number)
+            for bot_number in [n for n in self._by_number if n not in seen]:
+                self.remove_bot_from_list(bot_number)
+                changes['removed'].append(bot_number)
+            return changes
+
         def remove_bot_from_list(self, bot_number:str):
             """
             Removes bot from bots.all list by given bot number
             """
-            for i in range(len(self.all)):
-                if self.all[i].number == bot_number:
-                    del self.all[i]
-                    return
+            bot = self._by_number.pop(bot_number, None)
+            if bot is not None:
+                self._by_status.get(self._status_key(bot.status), {}).pop(bot_number, None)
+            self.position_sync.forget(bot_number)
             return
         
-        def update_positions_all_bots(self):
+        def update_positions_all_bots(self, all_positions: list = None, status: str = '', from_date: str = '', force: bool = True):
             """
-            Fetch all positions for all bots in one API call and update each bot's .positions attribute accordingly.
+            Sync positions for all bots through position_sync and update each bot's .positions attribute accordingly.
+            Without filters the refresh is incremental: after the first full download only positions entered since the
+            cache cursor plus the OPEN ones are fetched.  With filters position_sync decides between per-bot queries
+            and one bulk query based on how many bots are stale.
+
+            :param all_positions: already fetched positions for the filters. Default = None to query the API
+            :type all_positions: List
+            :param status: Only sync positions with this status (e.g. 'OPEN' for the hot path). Default = '' for all
+            :type status: String
+            :param from_date: Only sync positions entered on or after this date (YYYY-MM-DD). Default = '' for all
+            :type from_date: String
+            :param force: Refresh every bot regardless of position_sync.max_age_sec. Default = True
+            :type force: Bool
+
+            :return: numbers of the bots whose positions were refreshed
+            :type return: List
             """
 
             try:
-                all_positions = self._endpts.bots.get_bot_positions()
-                if isinstance(all_positions, dict) and 'data' in all_positions:
-                    all_positions = all_positions['data']
-                # Build a mapping from bot number to list of positions
-                bot_positions_map = {}
-                for pos in all_positions:
-                    bot_info = pos.get('bot') if isinstance(pos, dict) else None
-                    bot_number = bot_info.get('number') if bot_info else None
-                    if bot_number:
-                        bot_positions_map.setdefault(bot_number, []).append(pos)
-                # Assign positions to each bot in the list
-                for bot in self.all:
-                    bot.positions = bot_positions_map.get(bot.number, [])
+                bot_numbers = list(self._by_number)
+                if all_positions is None and not status and not from_date:
+                    refreshed = self.position_sync.refresh(bot_numbers, force)
+                elif all_positions is None:
+                    refreshed = self.position_sync.sync(bot_numbers, status, from_date, force)
+                else:
+                    if isinstance(all_positions, dict) and 'data' in all_positions:
+                        all_positions = all_positions['data']
+                    self.position_sync.ingest(all_positions, bot_numbers, status, from_date)
+                    refreshed = bot_numbers
+                refreshed = [n for n in refreshed if n in self._by_number]
+                for bot_number in refreshed:
+                    self._by_number[bot_number].positions = self.position_sync.positions_for_bot(bot_number)
+                return refreshed
             except Exception as e:
                 for bot in self.all:
                     bot.positions = []
                 print(f"Failed to update positions for all bots: {e}")
+                return []
 
 
-        class bot_obj(object):
-           
-            def __init__(self, bot_dict, scheduler):
-                self.number = ''
-                self.name = ''
-                self.broker_connection = {}
-                self.is_paper= False
-                self.status = ''
-                self.can_enable = True
-                self.can_disable = True
-                self.symbol = ''
-                self.type = ''
-                self.notes = ''
-                self.last_active_at = ''
-                self.disabled_at = ''
-                self.entry_condition = {}
-                self.exit_condition = {}
-                self.adjustments = []
-                self.notifications = []
-                self.variables = []
+        class bot_obj(slot_obj):
+            # Fields that change with bot activity rather than with its configuration
+            STATE_FIELDS = ('status', 'can_enable', 'can_disable', 'last_active_at', 'disabled_at')
+            FIELDS = ('number', 'name', 'broker_connection', 'is_paper', 'status', 'can_enable', 'can_disable',
+                      'symbol', 'type', 'notes', 'last_active_at', 'disabled_at', 'entry_condition', 'exit_condition',
+                      'adjustments', 'notifications', 'variables')
+            DEFAULTS = {'number': '', 'name': '', 'broker_connection': {}, 'is_paper': False, 'can_enable': True,
+                        'can_disable': True, 'symbol': '', 'type': '', 'notes': '', 'last_active_at': '',
+                        'disabled_at': '', 'entry_condition': {}, 'exit_condition': {}, 'adjustments': [],
+                        'notifications': [], 'variables': []}
+            __slots__ = tuple(f for f in FIELDS if f != 'status') + ('_status', 'positions', '_bot_list')
+
+            def __init__(self, bot_dict, bot_list):
+                self._status = ''
                 self.positions = []  # List of positions for this bot
-                self._scheduler = scheduler
-                self._endpts = self._scheduler._endpts
-                self.__bot_dict_to_attr(bot_dict)                
-            
+                self._bot_list = bot_list  # Owning bot list: notified of status changes, provides scheduler and endpoints
+                super().__init__(bot_dict)
+
+            @property
+            def _scheduler(self):
+                return self._bot_list._scheduler
+
+            @property
+            def _endpts(self):
+                return self._bot_list._endpts
+
+            @property
+            def status(self):
+                return self._status
+
+            @status.setter
+            def status(self, status):
+                old_status, self._status = self._status, status
+                if self._bot_list is not None and old_status != status:
+                    self._bot_list._reindex_status(self, old_status)
+
             def _meridian_time_to_military_time(self, time_str):
                 from WhisperDriver.utils.time import get_hour_minute_ampm_format
                 return datetime.strptime(time_str, get_hour_minute_ampm_format()).strftime('%H:%M')
@@ -186,7 +588,7 @@ class WhisperTradesBots(object):
             
             def enable_at_time(self, time_str, tz_str='America/New_York'):
                 """
-                Schedule bot status change.
+                Schedule bot status change.  Enables of several bots due at the same time run as one enable_many() call.
                 
                 :param time_str: string representation of military time (example: '22:30'). If 12-hr format, PM or AM must be included in string.
                 :type time_str: String
@@ -199,12 +601,11 @@ class WhisperTradesBots(object):
                     time_str = self._meridian_time_to_military_time(time_str)
                 if not self._scheduler.scheduler_is_on:
                     self._scheduler.start()
-                self._scheduler.add_task(time_str, tz_str, self.enable)
-                return
+                return self._scheduler.add_task(time_str, tz_str, self.enable, kind='enable', target=self.number)
 
             def disable_at_time(self, time_str, tz_str='America/New_York'):
                 """
-                Schedule bot status change.
+                Schedule bot status change.  Disables of several bots due at the same time run as one disable_many() call.
                 
                 :param time_str: string representation of military time (example: '22:30'). If 12-hr format, PM or AM must be included in string.
                 :type time_str: String
@@ -217,8 +618,25 @@ class WhisperTradesBots(object):
                     time_str = self._meridian_time_to_military_time(time_str)
                 if not self._scheduler.scheduler_is_on:
                     self._scheduler.start()
-                self._scheduler.add_task(time_str, tz_str, self.disable)
-                return
+                return self._scheduler.add_task(time_str, tz_str, self.disable, kind='disable', target=self.number)
+
+            def soft_disable_at_time(self, time_str, tz_str='America/New_York'):
+                """
+                Schedule bot status change to 'Disabled on Close' through the web interface (WD.via_selenium must be
+                enabled).  Soft disables due at the same time run as one pass of the web driver.
+
+                :param time_str: string representation of military time (example: '22:30'). If 12-hr format, PM or AM must be included in string.
+                :type time_str: String
+                :param tz_str: human readable TimeZone. Default is 'America/New_York'
+                :type tz_str: String
+                """
+                if not time_str or not isinstance(time_str, str):
+                    raise ValueError('Time input string is required!')
+                if 'pm' in time_str.lower() or 'am' in time_str.lower():
+                    time_str = self._meridian_time_to_military_time(time_str)
+                if not self._scheduler.scheduler_is_on:
+                    self._scheduler.start()
+                return self._scheduler.add_task(time_str, tz_str, kind='soft_disable', target=self.number)
 
             def get_positions(self, position_number: str = '', status: str = '', from_date: str = '', to_date: str = '', page: str = ''):
                 """
@@ -243,7 +661,11 @@ class WhisperTradesBots(object):
                 """
                 Get all orders for this bot using the API endpoint.
                 """
-                return self._endpts.bots.get_bot_orders(self.number)
+                orders = self._endpts.bots.get_bot_orders(self.number)
+                if isinstance(orders, list):
+                    return [order_obj(order) if isinstance(order, dict) else order for order in orders]
+                return orders
+
             def open_position(self):
                 """
                 Open a position for this bot using the API endpoint.
@@ -257,36 +679,35 @@ class WhisperTradesBots(object):
                 return self._endpts.bots.close_position(self.number)
            
             def __str__(self):
-                attrs = vars(self)
-                test = [f'{item[0]}: {str(item[1])}' for item in attrs.items()]
-                return "\n".join(test)
-            
-            def __repr__(self):
-                return self.__str__()
-            
-            def __bot_dict_to_attr(self, bot_dict):
-                for key in bot_dict: 
-                    setattr(self, key, bot_dict[key])
+                return "\n".join([super().__str__(), f'positions: {str(self.positions)}'])
+
+            def _apply_changes(self, bot_dict) -> list:
+                """
+                Set only the fields whose values differ from bot_dict and return their names
+                """
+                changed = []
+                for key, value in bot_dict.items():
+                    current = getattr(self, key, _MISSING)
+                    if key == 'variables':
+                        # get_all_bot_variables() replaces the entries with full variable json, so only a change in
+                        # the variables used counts (and the enriched entries are kept otherwise)
+                        unchanged = _variable_numbers(current) == _variable_numbers(value)
+                    else:
+                        unchanged = current == value
+                    if not unchanged:
+                        self._set_field(key, value)
+                        changed.append(key)
+                return changed
             
-            def _refresh_positions(self):
+            def _refresh_positions(self, status: str = ''):
                 """
-                Query WhisperTrades.com for all positions for this bot and update self.positions,
-                only including positions where the bot number matches this bot.
+                Query WhisperTrades.com for the positions of this bot (filtered by bot on the server) and update
+                self.positions.
                 """
                 try:
-                    positions_data = self._endpts.bots.get_bot_positions(bot_number=self.number)
-                    # Extract positions list from API response
-                    if isinstance(positions_data, dict) and 'data' in positions_data:
-                        all_positions = positions_data['data']
-                    else:
-                        all_positions = positions_data
-                    # Filter positions to only those with matching bot number
-                    filtered = []
-                    for pos in all_positions:
-                        bot_info = pos.get('bot') if isinstance(pos, dict) else None
-                        if bot_info and bot_info.get('number') == self.number:
-                            filtered.append(pos)
-                    self.positions = filtered
+                    position_sync = self._bot_list.position_sync
+                    position_sync.sync([self.number], status=status, force=True)
+                    self.positions = position_sync.positions_for_bot(self.number)
                 except Exception as e:
                     self.positions = []
                     print(f"Failed to fetch positions for bot {self.number}: {e}")
@@ -296,7 +717,7 @@ class WhisperTradesBots(object):
                 Query WhisperTrades.com for bot information and update object with new information, including positions
                 """
                 bot_dict = self._endpts.bots.get_bot(bot_number=self.number)
-                self.__bot_dict_to_attr(json.loads(json.dumps(bot_dict)))
+                self._set_fields(bot_dict)
                 self._refresh_positions()
                 return
            
@@ -333,4 +754,9 @@ class WhisperTradesBots(object):
 
 
 
-    
\ No newline at end of file
+    
+
+
+def _status_report(action, result, status, queued_sec=0.0, elapsed_sec=0.0, error=None) -> dict:
+    return {'action': action, 'result': result, 'status': status, 'queued_sec': queued_sec, 'elapsed_sec': elapsed_sec,
+            'error': error}
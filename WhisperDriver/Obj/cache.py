@@ -0,0 +1,147 @@
+########################################################################################################################
+########################################################################################################################
+###   Response Cache Object for WhisperTrades.com API                                                                ###
+###                                                                                                                  ###
+###   Authored by Paul Nobrega   Contact: Paul@PaulNobrega.net                                                       ###
+###   Python Version 3.10                                                                                            ###
+########################################################################################################################
+########################################################################################################################
+import time
+import threading
+from collections import OrderedDict
+
+
+class WhisperTradesResponseCache(object):
+    """
+    Thread-safe LRU cache of successful GET responses with per-endpoint TTLs.
+
+    Entries are keyed on method + URL + params.  An entry is served without contacting the server until its TTL
+    expires; an expired entry that carried an ETag or Last-Modified header is revalidated with a conditional request
+    (a 304 answer renews it without transferring the body).  Mutating requests invalidate every entry under the same
+    first path segment (e.g. any PUT below bots/ invalidates bots, positions, reports and variables).
+
+    Responses are stored as received, so every hit is parsed again into fresh objects.
+
+    Args:
+        max_entries (int): Maximum number of cached responses (least recently used are evicted). Default = 256
+        ttls (dict): API path prefix -> TTL in seconds.  The longest matching prefix wins. Default = DEFAULT_TTLS
+        default_ttl_sec (float): TTL for paths without a matching prefix. Default = 5
+    """
+    DEFAULT_TTLS = {
+        'bots/': 5.0,
+        'bots/positions': 5.0,
+        'bots/variables/': 10.0,
+        'bots/reports/': 30.0,
+        'broker_connections/': 60.0,
+    }
+
+    def __init__(self, max_entries: int = 256, ttls: dict = None, default_ttl_sec: float = 5.0) -> None:
+        self.max_entries: int = max_entries
+        self.ttls: dict = dict(self.DEFAULT_TTLS if ttls is None else ttls)
+        self.default_ttl_sec: float = default_ttl_sec
+        self.hits: int = 0
+        self.misses: int = 0
+        self.revalidations: int = 0
+        self.__lock = threading.Lock()
+        self.__entries = OrderedDict()
+        self.__generations = {}
+
+    def __len__(self):
+        return len(self.__entries)
+
+    @staticmethod
+    def key(method: str, url: str, params=None) -> tuple:
+        """
+        Cache key of a request
+        """
+        if isinstance(params, dict):
+            params = tuple(sorted((k, str(v)) for k, v in params.items()))
+        elif params is not None:
+            params = str(params)
+        return (method.upper(), url, params)
+
+    def ttl_for(self, path: str) -> float:
+        """
+        TTL in seconds for an API path (relative to the server root, e.g. 'bots/variables/ABC')
+        """
+        match = max((prefix for prefix in self.ttls if path.startswith(prefix)), key=len, default=None)
+        return self.ttls[match] if match is not None else self.default_ttl_sec
+
+    def lookup(self, key: tuple):
+        """
+        Return (response, validators): the cached response if still fresh (else None) and, for an expired entry,
+        the conditional request headers to revalidate it
+        """
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None, {}
+            self.__entries.move_to_end(key)
+            if time.monotonic() < entry['expires_at']:
+                self.hits += 1
+                return entry['response'], {}
+            self.misses += 1
+            return None, dict(entry['validators'])
+
+    def generation(self, path: str) -> int:
+        """
+        Invalidation counter of the first path segment of path.  Read it before sending a GET and pass it to store()
+        """
+        return self.__generations.get(_scope(path), 0)
+
+    def store(self, key: tuple, response, path: str, generation: int = None) -> None:
+        """
+        Cache a successful response for the TTL of path.  Responses to requests sent before an invalidation of the
+        same path segment (generation changed) are not cached
+        """
+        ttl = self.ttl_for(path)
+        if ttl <= 0 or (generation is not None and generation != self.generation(path)):
+            return
+        validators = {}
+        if response.headers.get('ETag'):
+            validators['If-None-Match'] = response.headers['ETag']
+        if response.headers.get('Last-Modified'):
+            validators['If-Modified-Since'] = response.headers['Last-Modified']
+        with self.__lock:
+            self.__entries[key] = {'response': response, 'expires_at': time.monotonic() + ttl, 'validators': validators,
+                                   'ttl': ttl, 'scope': _scope(path)}
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.max_entries:
+                self.__entries.popitem(last=False)
+        return
+
+    def revalidated(self, key: tuple):
+        """
+        Renew an entry after a 304 Not Modified answer and return its cached response (None if evicted meanwhile)
+        """
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                return None
+            entry['expires_at'] = time.monotonic() + entry['ttl']
+            self.revalidations += 1
+            return entry['response']
+
+    def invalidate(self, path: str) -> None:
+        """
+        Drop every entry under the first path segment of path
+        """
+        scope = _scope(path)
+        with self.__lock:
+            self.__generations[scope] = self.__generations.get(scope, 0) + 1
+            for key in [k for k, entry in self.__entries.items() if entry['scope'] == scope]:
+                del self.__entries[key]
+        return
+
+    def clear(self) -> None:
+        """
+        Drop all entries
+        """
+        with self.__lock:
+            self.__entries.clear()
+        return
+
+
+def _scope(path: str) -> str:
+    return path.lstrip('/').split('/', 1)[0]
@@ -7,11 +7,21 @@
 ########################################################################################################################
 ########################################################################################################################
 import requests
+from requests.adapters import HTTPAdapter
 from urllib.parse import urljoin
 import posixpath
 import json
 import warnings
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from .cache import WhisperTradesResponseCache
 
+try:
+    # Optional fast JSON backend
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
 
 
 class WhisperTradesEndpoints(object):
@@ -21,40 +31,224 @@ class WhisperTradesEndpoints(object):
     Args:
         token (str): API token for authentication.
         throttle (object): Throttle object for rate limiting.
+        pool_size (int): Maximum number of pooled connections kept open to the API server. Default is 10.
+        keep_alive (bool): Reuse connections between requests. Default is True.
+        max_retries (int): Times an idempotent GET is retried after a 429/503 rate-limit response. Default is 3.
     """
-    def __init__(self, token: str, throttle: object) -> None:
+    def __init__(self, token: str, throttle: object, pool_size: int = 10, keep_alive: bool = True, max_retries: int = 3) -> None:
         self.throttle: object = throttle
         self.config = self.__config(token)
-        self.bots = self.__bots(self.config, self.throttle)
-        self.reports = self.__reports(self.config, self.throttle)
-        self.variables = self.__variables(self.config, self.throttle)
-        self.brokers = self.__brokers(self.config, self.throttle)
+        self.session = self.__session(self.config, self.throttle, pool_size, keep_alive, max_retries)
+        self.bots = self.__bots(self.config, self.session)
+        self.reports = self.__reports(self.config, self.session)
+        self.variables = self.__variables(self.config, self.session)
+        self.brokers = self.__brokers(self.config, self.session)
+
+    def close(self) -> None:
+        """
+        Close all pooled connections held by the shared session
+        """
+        self.session.close()
+        return
+
+    def enable_cache(self, max_entries: int = 256, ttls: dict = None, default_ttl_sec: float = 5.0) -> object:
+        """
+        Opt in to caching GET responses (LRU with per-endpoint TTLs and ETag/Last-Modified revalidation).  Mutating
+        requests invalidate the affected entries automatically.
+
+        :param max_entries: maximum number of cached responses. Default = 256
+        :type max_entries: int
+        :param ttls: API path prefix -> TTL in seconds (e.g. {'bots/reports/': 30}). Default = None for the built-in TTLs
+        :type ttls: dict
+        :param default_ttl_sec: TTL for paths without a matching prefix. Default = 5
+        :type default_ttl_sec: float
+
+        :return: the response cache
+        :type return: WhisperTradesResponseCache
+        """
+        self.session.cache = WhisperTradesResponseCache(max_entries, ttls, default_ttl_sec)
+        return self.session.cache
+
+    def disable_cache(self) -> None:
+        """
+        Stop caching GET responses and drop all cached entries
+        """
+        self.session.cache = None
+        return
 
     @staticmethod
-    def format_response(response):
+    def format_response(response, unwrap: bool = True):
         """
-        Format API responses to JSON and apply rate limit throttle
+        Format API responses to JSON.  The raw response bytes are parsed once (with orjson when installed)
+        """
+        txt_to_json = json_loads(response.content)
+        return WhisperTradesEndpoints.format_json(txt_to_json, response.ok, response.status_code, response.reason, response.url, unwrap)
+
+    @staticmethod
+    def format_json(txt_to_json, ok: bool, status_code: int, reason: str, url: str, unwrap: bool = True):
         """
-        txt_to_json = json.loads(response.text)
-        if not response.ok:
+        Warn on unsuccessful responses and unwrap the 'data' envelope of a decoded API response (unless unwrap=False)
+        """
+        if not ok:
             msg = txt_to_json['message'] if 'message' in txt_to_json else ''
-            warnings.warn(f"Status code: {response.status_code} received with reason: {response.reason} at url: {response.url}\n{msg}")
-            if response.reason.lower() == 'unauthorized':
+            warnings.warn(f"Status code: {status_code} received with reason: {reason} at url: {url}\n{msg}")
+            if (reason or '').lower() == 'unauthorized':
                 raise Exception(f'Invalid API token!')
+        if not unwrap:
+            return txt_to_json
         return txt_to_json['data'] if 'data' in txt_to_json else txt_to_json
 
+    @staticmethod
+    def split_page(payload, page: int):
+        """
+        Split one page of a paginated API response into its items and the number of the next page.
+
+        Understands the Laravel pagination envelopes ('meta'/'links' or flat 'current_page'/'last_page'/'next_page_url').
+        A response without pagination information is treated as the only page.
+
+        :return: (list of items, next page number or None when this is the last page)
+        :type return: tuple
+        """
+        if isinstance(payload, list):
+            return payload, None
+        if not isinstance(payload, dict) or not isinstance(payload.get('data'), list):
+            return [], None
+        items = payload['data']
+        meta = payload['meta'] if isinstance(payload.get('meta'), dict) else payload
+        current_page, last_page = meta.get('current_page'), meta.get('last_page')
+        if current_page is not None and last_page is not None:
+            next_page = int(current_page) + 1 if int(current_page) < int(last_page) else None
+        else:
+            links = payload.get('links')
+            next_url = links.get('next') if isinstance(links, dict) else payload.get('next_page_url')
+            next_page = page + 1 if next_url else None
+        if not items:
+            next_page = None
+        return items, next_page
+
     class __config(object):
         def __init__(self, token):
             self.TOKEN = token
             self.SERVER = r'https://api.whispertrades.com/v1/'
             self.HEADERS = {'Accept': 'application/json', 'Content-Type': 'application/json', 'authorization': f'Bearer {self.TOKEN}'}
+
+    class __session(object):
+        """
+        Connection-pooled HTTP session shared by all endpoint groups.  All requests pass through the throttle, every
+        response is reported back to it, and GET requests rejected with 429/503 are retried once the throttle allows.
+
+        Concurrent identical GETs (same URL and params) are coalesced: while one is in flight, later callers wait for
+        it and receive the same response instead of sending (and throttling) a duplicate request.
+        """
+        RETRY_METHODS = ('GET',)
+
+        def __init__(self, config, throttle, pool_size=10, keep_alive=True, max_retries=3):
+            self.config = config
+            self.cache = None
+            self.coalesce = True
+            self.coalesced = 0
+            self.__in_flight = {}
+            self.__in_flight_lock = threading.Lock()
+            self._throttle = throttle
+            self.pool_size = pool_size
+            self.keep_alive = keep_alive
+            self.max_retries = max_retries
+            self._http = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            self._http.mount('https://', adapter)
+            self._http.mount('http://', adapter)
+            self._http.headers.update(self.config.HEADERS)
+            if not keep_alive:
+                self._http.headers['Connection'] = 'close'
+
+        def request(self, method: str, url: str, **kwargs):
+            """
+            Send a throttled request over the pooled session and return the raw response.  An identical GET already
+            in flight is joined instead of sent again.  With a response cache, fresh cached GET responses are returned
+            without a request and mutating requests invalidate the cache.
+            """
+            if method.upper() != 'GET':
+                with self.__in_flight_lock:
+                    # GETs started before this mutation may return stale data: later GETs must not join them
+                    self.__in_flight.clear()
+                return self.__cached_request(method, url, **kwargs)
+            if not self.coalesce:
+                return self.__cached_request(method, url, **kwargs)
+            key = WhisperTradesResponseCache.key(method, url, kwargs.get('params'))
+            with self.__in_flight_lock:
+                flight = self.__in_flight.get(key)
+                leader = flight is None
+                if leader:
+                    flight = self.__in_flight[key] = Future()
+                else:
+                    self.coalesced += 1
+            if not leader:
+                return flight.result()
+            try:
+                response = self.__cached_request(method, url, **kwargs)
+            except BaseException as e:
+                self.__land(key, flight)
+                flight.set_exception(e)
+                raise
+            self.__land(key, flight)
+            flight.set_result(response)
+            return response
+
+        def __land(self, key, flight):
+            with self.__in_flight_lock:
+                if self.__in_flight.get(key) is flight:
+                    del self.__in_flight[key]
+            return
+
+        def __cached_request(self, method, url, **kwargs):
+            cache = self.cache
+            if cache is None:
+                return self.__send(method, url, **kwargs)
+            path = url[len(self.config.SERVER):] if url.startswith(self.config.SERVER) else url
+            if method.upper() != 'GET':
+                try:
+                    return self.__send(method, url, **kwargs)
+                finally:
+                    cache.invalidate(path)
+            key = cache.key(method, url, kwargs.get('params'))
+            response, validators = cache.lookup(key)
+            if response is not None:
+                return response
+            generation = cache.generation(path)
+            headers = {**kwargs.get('headers', {}), **validators} if validators else kwargs.get('headers')
+            response = self.__send(method, url, **{**kwargs, 'headers': headers})
+            if response.status_code == 304 and validators:
+                cached = cache.revalidated(key)
+                if cached is not None:
+                    return cached
+                # Entry evicted meanwhile: fetch the body unconditionally
+                response = self.__send(method, url, **kwargs)
+            if response.ok:
+                cache.store(key, response, path, generation)
+            return response
+
+        def __send(self, method: str, url: str, **kwargs):
+            attempt = 0
+            while True:
+                response = self._throttle(lambda: self._http.request(method, url, **kwargs))
+                self._throttle.feedback(response.status_code, response.headers)
+                if response.status_code not in self._throttle.RATE_LIMIT_STATUS_CODES or method.upper() not in self.RETRY_METHODS or attempt >= self.max_retries:
+                    return response
+                attempt += 1
+
+        def close(self):
+            """
+            Close all pooled connections
+            """
+            self._http.close()
+            return
     
     class __bots(object):
     
-        def __init__(self, config, throttle):
+        def __init__(self, config, session):
             self.endpt = r'bots/'
             self.config = config
-            self._throttle = throttle
+            self._session = session
     
         def get_bot_orders(self, bot_number: str) -> json:
             """
@@ -70,7 +264,7 @@ class WhisperTradesEndpoints(object):
                 raise ValueError("Bot number is required to get orders.")
             url_path = urljoin(self.config.SERVER, posixpath.join(self.endpt, bot_number, 'orders'))
             payload = {}
-            response = self._throttle(lambda: requests.request("GET", url_path, headers=self.config.HEADERS, data=payload))
+            response = self._session.request("GET", url_path, data=payload)
             return WhisperTradesEndpoints.format_response(response)
 
         def get_bot_positions(self, bot_number: str = '', position_number: str = '', status: str = '', from_date: str = '', to_date: str = '', page: str = '') -> json:
@@ -101,9 +295,51 @@ class WhisperTradesEndpoints(object):
                     params['to_date'] = to_date
                 if page:
                     params['page'] = page
-            response = self._throttle(lambda: requests.request("GET", url_path, params=params, headers=self.config.HEADERS))
+            response = self._session.request("GET", url_path, params=params)
             return WhisperTradesEndpoints.format_response(response)
 
+        def iter_bot_positions(self, bot_number: str = '', status: str = '', from_date: str = '', to_date: str = '', prefetch: bool = False):
+            """
+            Stream bot positions across every page of results.  Pages are requested lazily as the generator is consumed.
+
+            :param bot_number: Bot number to filter positions (optional)
+            :param status: Filter by position status (OPEN or CLOSED, optional)
+            :param from_date: Minimum entry date (YYYY-MM-DD, optional)
+            :param to_date: Maximum entry date (YYYY-MM-DD, optional)
+            :param prefetch: Request the next page in the background while the current page is consumed. Default = False
+            :return: generator of position json
+            """
+            fetch_page = lambda page: self.__positions_page(bot_number, status, from_date, to_date, page)
+            if not prefetch:
+                page = 1
+                while page is not None:
+                    positions, page = fetch_page(page)
+                    yield from positions
+                return
+            pool = ThreadPoolExecutor(max_workers=1)
+            try:
+                future = pool.submit(fetch_page, 1)
+                while future is not None:
+                    positions, page = future.result()
+                    future = pool.submit(fetch_page, page) if page is not None else None
+                    yield from positions
+            finally:
+                pool.shutdown(wait=False, cancel_futures=True)
+
+        def __positions_page(self, bot_number, status, from_date, to_date, page):
+            url_path = urljoin(self.config.SERVER, 'bots/positions')
+            params = {'page': page}
+            if bot_number:
+                params['bot'] = bot_number
+            if status:
+                params['status'] = status
+            if from_date:
+                params['from_date'] = from_date
+            if to_date:
+                params['to_date'] = to_date
+            response = self._session.request("GET", url_path, params=params)
+            return WhisperTradesEndpoints.split_page(WhisperTradesEndpoints.format_response(response, unwrap=False), page)
+
         def close_bot_position(self, position_number: str) -> json:
             """
             Close a specific bot position by position number.
@@ -114,7 +350,7 @@ class WhisperTradesEndpoints(object):
             if not position_number:
                 raise ValueError("Position number is required to close a bot position.")
             url_path = urljoin(self.config.SERVER, posixpath.join('bots/positions', position_number, 'close'))
-            response = self._throttle(lambda: requests.request("PUT", url_path, headers=self.config.HEADERS))
+            response = self._session.request("PUT", url_path)
             return WhisperTradesEndpoints.format_response(response)
 
         def get_bot(self, bot_number: str='', status_filter: list=['Enabled', 'Disabled', 'Disable on Close'], include_details: bool=True) -> json:
@@ -134,7 +370,7 @@ class WhisperTradesEndpoints(object):
             url_path = urljoin(self.config.SERVER, posixpath.join(self.endpt, bot_number))
             payload={}
             params = {'include_details':include_details, 'statuses[]': status_filter}
-            response = self._throttle(lambda: requests.request("GET", url_path, params=params, headers=self.config.HEADERS, data=payload))
+            response = self._session.request("GET", url_path, params=params, data=payload)
             return WhisperTradesEndpoints.format_response(response)
         
         def get_all_bots(self) -> json:
@@ -156,10 +392,7 @@ class WhisperTradesEndpoints(object):
             :return: json data from response recieved from WhisperTrades API
             :type return: json
             """
-            url_path = urljoin(self.config.SERVER, posixpath.join(self.endpt, bot_number,'enable'))
-            payload={}
-            response = self._throttle(lambda: requests.request("PUT", url_path, headers=self.config.HEADERS, data=payload))
-            return WhisperTradesEndpoints.format_response(response)
+            return WhisperTradesEndpoints.format_response(self.put_bot_status(bot_number, 'enable'))
 
         def disable_bot(self, bot_number:str) -> json:
             """
@@ -171,10 +404,26 @@ class WhisperTradesEndpoints(object):
             :return: json data from response recieved from WhisperTrades API
             :type return: json
             """
-            url_path = urljoin(self.config.SERVER, posixpath.join(self.endpt, bot_number,'disable'))
+            return WhisperTradesEndpoints.format_response(self.put_bot_status(bot_number, 'disable'))
+
+        def put_bot_status(self, bot_number: str, action: str):
+            """
+            Send the enable/disable request of a bot and return the raw response, so callers can inspect the status
+            code (used by WhisperTradesBots.enable_many/disable_many)
+
+            :param bot_number: number of bot
+            :type bot_number: String
+            :param action: 'enable' or 'disable'
+            :type action: String
+
+            :return: raw response
+            :type return: requests.Response
+            """
+            if action not in ('enable', 'disable'):
+                raise ValueError(f"action must be 'enable' or 'disable', not '{action}'")
+            url_path = urljoin(self.config.SERVER, posixpath.join(self.endpt, bot_number, action))
             payload={}
-            response = self._throttle(lambda: requests.request("PUT", url_path, headers=self.config.HEADERS, data=payload))
-            return WhisperTradesEndpoints.format_response(response) 
+            return self._session.request("PUT", url_path, data=payload)
 
         def open_position(self, bot_number: str) -> json:
             """
@@ -188,7 +437,7 @@ class WhisperTradesEndpoints(object):
             """
             url_path = urljoin(self.config.SERVER, posixpath.join(self.endpt, bot_number, 'open_position'))
             payload = {}
-            response = self._throttle(lambda: requests.request("PUT", url_path, headers=self.config.HEADERS, data=payload))
+            response = self._session.request("PUT", url_path, data=payload)
             return WhisperTradesEndpoints.format_response(response)
 
         def close_position(self, bot_number: str) -> json:
@@ -203,15 +452,15 @@ class WhisperTradesEndpoints(object):
             """
             url_path = urljoin(self.config.SERVER, posixpath.join(self.endpt, bot_number, 'close_position'))
             payload = {}
-            response = self._throttle(lambda: requests.request("PUT", url_path, headers=self.config.HEADERS, data=payload))
+            response = self._session.request("PUT", url_path, data=payload)
             return WhisperTradesEndpoints.format_response(response)
 
     class __reports(object):
         
-        def __init__(self, config, throttle):
+        def __init__(self, config, session):
             self.endpt = r'bots/reports/'
             self.config = config
-            self._throttle = throttle
+            self._session = session
         
         def get_bot_report(self, report_number: str='') -> json:
             """
@@ -225,7 +474,7 @@ class WhisperTradesEndpoints(object):
             """
             url_path = urljoin(self.config.SERVER, posixpath.join(self.endpt, report_number))
             payload={}
-            response = self._throttle(lambda: requests.request("GET", url_path, headers=self.config.HEADERS, data=payload))
+            response = self._session.request("GET", url_path, data=payload)
             return WhisperTradesEndpoints.format_response(response)
         
         def get_all_bot_reports(self) -> json:
@@ -270,7 +519,7 @@ class WhisperTradesEndpoints(object):
                 if payload[key] == '':
                     del payload[key]
 
-            response = self._throttle(lambda: requests.request("PUT", url_path, headers=self.config.HEADERS, data=json.dumps(payload)))
+            response = self._session.request("PUT", url_path, data=json.dumps(payload))
             return WhisperTradesEndpoints.format_response(response)
         
         def run_bot_report(self, report_number:str=''):
@@ -289,15 +538,15 @@ class WhisperTradesEndpoints(object):
                 raise ValueError(f"Insufficient information supplied to run report! (REQUIRED) report_number: {report_number}")
             url_path = urljoin(self.config.SERVER, posixpath.join(self.endpt, report_number,'run'))
             payload={}
-            response = self._throttle(lambda: requests.request("PUT", url_path, headers=self.config.HEADERS, data=payload))
+            response = self._session.request("PUT", url_path, data=payload)
             return WhisperTradesEndpoints.format_response(response)
     
     class __variables(object):
         
-        def __init__(self, config, throttle):
+        def __init__(self, config, session):
             self.endpt = r'bots/variables/'
             self.config = config
-            self._throttle = throttle
+            self._session = session
         
         def get_bot_variables(self, variable_number:str='') -> json:
             """
@@ -311,7 +560,7 @@ class WhisperTradesEndpoints(object):
             """
             url_path = urljoin(self.config.SERVER, posixpath.join(self.endpt, variable_number))
             payload={}
-            response = self._throttle(lambda: requests.request("GET", url_path, headers=self.config.HEADERS, data=payload))
+            response = self._session.request("GET", url_path, data=payload)
             return WhisperTradesEndpoints.format_response(response)
         
         def get_all_bot_variables(self) -> json:
@@ -342,15 +591,15 @@ class WhisperTradesEndpoints(object):
                 raise ValueError(f"Insufficient information supplied to set bot variable! (REQUIRED) variable_number: {variable_number}, (REQUIRED) variable_name: {variable_name}, (REQUIRED) new_value: {new_value}")
             url_path = urljoin(self.config.SERVER, posixpath.join(self.endpt, variable_number))
             payload = json.dumps({"name": variable_name, "value": new_value})
-            response = self._throttle(lambda: requests.request("PUT", url_path, headers=self.config.HEADERS, data=payload))
+            response = self._session.request("PUT", url_path, data=payload)
             return WhisperTradesEndpoints.format_response(response)
     
     class __brokers(object):
         
-        def __init__(self, config, throttle):
+        def __init__(self, config, session):
             self.endpt = r'broker_connections/'
             self.config = config
-            self._throttle = throttle
+            self._session = session
         
         def get_broker_connections(self, number: str = '') -> json:
             """
@@ -364,7 +613,7 @@ class WhisperTradesEndpoints(object):
             """
             url_path = urljoin(self.config.SERVER, posixpath.join(self.endpt, number))
             payload = {}
-            response = self._throttle(lambda: requests.request("GET", url_path, headers=self.config.HEADERS, data=payload))
+            response = self._session.request("GET", url_path, data=payload)
             data = WhisperTradesEndpoints.format_response(response)
             # Remove any broker connections with 'broker': 'TD Ameritrade' as broker is no longer valid
             if isinstance(data, list):
@@ -398,5 +647,5 @@ class WhisperTradesEndpoints(object):
                 raise ValueError("Broker connection number is required for collateral rebalance.")
             url_path = urljoin(self.config.SERVER, posixpath.join(self.endpt, number, 'collateral', 'rebalance'))
             payload = {}
-            response = self._throttle(lambda: requests.request("PUT", url_path, headers=self.config.HEADERS, data=payload))
+            response = self._session.request("PUT", url_path, data=payload)
             return WhisperTradesEndpoints.format_response(response)
\ No newline at end of file
@@ -0,0 +1,247 @@
+########################################################################################################################
+########################################################################################################################
+###   Columnar Position/Order Frames for WhisperTrades.com API                                                       ###
+###                                                                                                                  ###
+###   Authored by Paul Nobrega   Contact: Paul@PaulNobrega.net                                                       ###
+###   Python Version 3.10                                                                                            ###
+########################################################################################################################
+########################################################################################################################
+from operator import attrgetter, itemgetter
+import numpy as np
+import pandas as pd
+from .positions import ENTRY_DATE_KEYS
+
+# column name -> (candidate payload keys, column kind).  A tuple key reads a nested field (e.g. ('bot', 'number'))
+POSITION_COLUMNS = {
+    'number': (('number',), 'str'),
+    'bot': ((('bot', 'number'),), 'category'),
+    'bot_name': ((('bot', 'name'),), 'category'),
+    'status': (('status',), 'category'),
+    'symbol': (('symbol',), 'category'),
+    'type': (('type',), 'category'),
+    'quantity': (('quantity',), 'float'),
+    'entered_at': (('entered_at',) + tuple(k for k in ENTRY_DATE_KEYS if k != 'entered_at'), 'datetime'),
+    'exited_at': (('exited_at', 'closed_at'), 'datetime'),
+    'entry_price': (('entry_price',), 'float'),
+    'exit_price': (('exit_price',), 'float'),
+    'profit': (('profit', 'pnl'), 'float'),
+    'max_risk': (('max_risk',), 'float'),
+}
+
+ORDER_COLUMNS = {
+    'number': (('number',), 'str'),
+    'bot': ((('bot', 'number'),), 'category'),
+    'position': ((('position', 'number'),), 'str'),
+    'status': (('status',), 'category'),
+    'type': (('type',), 'category'),
+    'action': (('action',), 'category'),
+    'quantity': (('quantity',), 'float'),
+    'price': (('price', 'limit_price'), 'float'),
+    'fill_price': (('fill_price',), 'float'),
+    'created_at': (('created_at',), 'datetime'),
+    'filled_at': (('filled_at',), 'datetime'),
+}
+
+# Columns read by pnl_by_bot() and open_risk_by_symbol() (bot is needed to fill missing symbols)
+PNL_COLUMNS = ('bot', 'status', 'profit')
+OPEN_RISK_COLUMNS = ('bot', 'status', 'symbol', 'profit', 'max_risk')
+# Rows read per block by _read_fields() (small enough for the block's objects to stay in cache across fields)
+READ_BLOCK = 1024
+
+
+def to_frame(records: list, columns: dict, known: dict = None) -> pd.DataFrame:
+    """
+    Build a typed DataFrame from position/order json or model objects.  Each field is read in one pass over records
+    (a C-level attrgetter pass for model objects), later candidate keys are only read for rows still missing a value,
+    and each column is converted in one vectorised step (numeric, datetime or categorical).
+
+    :param records: list of dict-like records (json dicts or slot_obj models)
+    :type records: List
+    :param columns: column map such as POSITION_COLUMNS or ORDER_COLUMNS
+    :type columns: dict
+    :param known: column name -> values of that column already known to the caller (not read from records), a
+                  pandas Categorical is used as is for a categorical column. Default = None
+    :type known: dict
+    """
+    rows = list(records)
+    known = known or {}
+    raw = _read_fields(rows, list(dict.fromkeys(_parent(keys[0]) for column, (keys, _) in columns.items()
+                                                if column not in known)))
+    data = {}
+    for column, (keys, kind) in columns.items():
+        if column in known:
+            values = known[column]
+            if kind == 'category' and isinstance(values, pd.Categorical):
+                data[column] = values
+                continue
+            values = _object_array(values)
+        else:
+            values = _values(raw, rows, keys[0])
+            for i, key in enumerate(keys[1:]):
+                missing = np.flatnonzero(pd.isna(values) | (values == ''))
+                if not len(missing):
+                    break
+                if i == 0:
+                    # values may be the raw array of keys[0]
+                    values = values.copy()
+                values[missing] = _values(raw, rows, key, missing)
+        if kind == 'float':
+            data[column] = _float_column(values)
+        elif kind == 'datetime':
+            data[column] = pd.to_datetime(pd.Series(values, dtype=object), errors='coerce', utc=True, format='ISO8601')
+        elif kind == 'category':
+            data[column] = pd.Categorical(values)
+        else:
+            data[column] = values
+    return pd.DataFrame(data, index=pd.RangeIndex(len(rows)))
+
+
+def positions_frame(positions: list, bot_symbols: dict = None, columns: tuple = None, bot_numbers: list = None) -> pd.DataFrame:
+    """
+    Columnar view of positions.  Positions without a symbol take the symbol of their bot from bot_symbols.
+
+    :param positions: list of position json or position objects
+    :type positions: List
+    :param bot_symbols: bot number -> symbol traded by the bot. Default = None
+    :type bot_symbols: dict
+    :param columns: only build these POSITION_COLUMNS (e.g. PNL_COLUMNS). Default = None for all
+    :type columns: tuple
+    :param bot_numbers: bot number of each position when already known (e.g. positions grouped by bot), so the nested
+                        bot field is not read.  List or pandas Categorical. Default = None
+    :type bot_numbers: List
+    """
+    spec = POSITION_COLUMNS if columns is None else {column: POSITION_COLUMNS[column] for column in columns}
+    frame = to_frame(positions, spec, None if bot_numbers is None else {'bot': bot_numbers})
+    if bot_symbols and 'symbol' in frame and 'bot' in frame and frame['symbol'].isna().any():
+        symbols = frame['symbol'].astype(object).fillna(frame['bot'].astype(object).map(bot_symbols))
+        frame['symbol'] = symbols.astype('category')
+    if 'status' in frame:
+        # Upper-case the (few) categories instead of every row
+        status = frame['status']
+        upper = status.cat.categories.astype(object).str.upper()
+        if upper.is_unique:
+            frame['status'] = status.cat.rename_categories(upper)
+        else:
+            frame['status'] = status.astype(object).str.upper().astype('category')
+    return frame
+
+
+def orders_frame(orders: list) -> pd.DataFrame:
+    """
+    Columnar view of orders
+
+    :param orders: list of order json or order objects
+    :type orders: List
+    """
+    return to_frame(orders, ORDER_COLUMNS)
+
+
+def pnl_by_bot(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    Realized (CLOSED), unrealized (OPEN) and total profit per bot, with position counts
+
+    :param frame: positions_frame()
+    :type frame: DataFrame
+    """
+    profit = frame['profit'].fillna(0.0).to_numpy()
+    is_open = (frame['status'] == 'OPEN').to_numpy()
+    rollup = pd.DataFrame({
+        'bot': frame['bot'],
+        'realized': np.where(is_open, 0.0, profit),
+        'unrealized': np.where(is_open, profit, 0.0),
+        'total': profit,
+        'positions': 1,
+        'open_positions': is_open.astype('int64'),
+    })
+    return rollup.groupby('bot', observed=True).sum().sort_values('total', ascending=False)
+
+
+def open_risk_by_symbol(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    Maximum risk and profit of OPEN positions per symbol, with position counts
+
+    :param frame: positions_frame()
+    :type frame: DataFrame
+    """
+    open_positions = frame.loc[frame['status'] == 'OPEN', ['symbol', 'max_risk', 'profit']]
+    rollup = open_positions.groupby('symbol', observed=True).agg(
+        max_risk=('max_risk', 'sum'), unrealized=('profit', 'sum'), open_positions=('max_risk', 'size'))
+    return rollup.sort_values('max_risk', ascending=False)
+
+
+def _parent(key) -> str:
+    return key[0] if isinstance(key, tuple) else key
+
+
+def _read_fields(rows: list, fields: list) -> dict:
+    """
+    Read fields of every row: field -> object array.  Model fields are read with C-level attrgetter passes over
+    blocks of READ_BLOCK rows, so each object is fetched from memory once for all fields (no per-row Python code or
+    temporary objects, so no garbage collection is triggered).
+    """
+    model = type(rows[0]) if rows else None
+    declared = [field for field in fields if field in getattr(model, '_FIELD_SET', ())]
+    if declared and all(type(row) is model for row in rows):
+        columns = {field: [] for field in declared}
+        readers = [(columns[field].extend, attrgetter(field)) for field in declared]
+        try:
+            for start in range(0, len(rows), READ_BLOCK):
+                block = rows[start:start + READ_BLOCK]
+                for extend, getter in readers:
+                    extend(map(getter, block))
+        except AttributeError:
+            # A declared field without a default is unset on some object
+            pass
+        else:
+            return {field: _object_array(values) for field, values in columns.items()}
+    return {field: _object_array([row.get(field) for row in rows]) for field in fields}
+
+
+def _values(raw: dict, rows: list, key, index=None) -> np.ndarray:
+    """
+    Object array of key (a tuple key reads a nested field) for all rows, or for the rows at index
+    """
+    parent = _parent(key)
+    if parent in raw:
+        values = raw[parent] if index is None else raw[parent][index]
+        if not isinstance(key, tuple):
+            return values
+    else:
+        values = _extra_values(raw, rows, parent, range(len(rows)) if index is None else index)
+    if isinstance(key, tuple):
+        try:
+            values = list(map(itemgetter(key[1]), values))
+        except (KeyError, TypeError):
+            values = [value.get(key[1]) if isinstance(value, dict) else None for value in values]
+    return _object_array(values)
+
+
+def _extra_values(raw: dict, rows: list, parent: str, index) -> list:
+    """
+    Values of a field that was not read up front (e.g. a fallback key) for the rows at index
+    """
+    if rows and parent not in getattr(rows[0], '_FIELD_SET', (parent,)):
+        # Payload keys outside the declared fields live in each model's overflow dict
+        if '_extra' not in raw:
+            try:
+                raw['_extra'] = _object_array(list(map(attrgetter('_extra'), rows)))
+            except AttributeError:
+                # Not all rows are models
+                raw['_extra'] = None
+        if raw['_extra'] is not None:
+            return [extra.get(parent) if extra else None for extra in raw['_extra'][index]]
+    return [rows[i].get(parent) for i in index]
+
+
+def _float_column(values: np.ndarray) -> np.ndarray:
+    try:
+        # Numbers and None (NaN) convert directly
+        return values.astype('float64')
+    except (TypeError, ValueError):
+        return pd.to_numeric(pd.Series(values, dtype=object), errors='coerce').to_numpy(dtype='float64')
+
+
+def _object_array(values) -> np.ndarray:
+    if isinstance(values, np.ndarray):
+        return values.astype(object)
+    return np.fromiter(values, dtype=object, count=len(values))
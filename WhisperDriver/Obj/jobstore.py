@@ -0,0 +1,99 @@
+########################################################################################################################
+########################################################################################################################
+###   Job Store Object for WhisperTrades.com API                                                                     ###
+###                                                                                                                  ###
+###   Authored by Paul Nobrega   Contact: Paul@PaulNobrega.net                                                       ###
+###   Python Version 3.10                                                                                            ###
+########################################################################################################################
+########################################################################################################################
+import json
+import sqlite3
+import threading
+
+
+class WhisperTradesJobStore(object):
+    """
+    On-disk (SQLite) store of scheduled jobs, so a restarted process can resume its plan with
+    WhisperTradesScheduler.restore() without rebuilding it from the API.
+
+    Only jobs that can be rebuilt without code are stored: jobs with a kind and a target (run by the scheduler's batch
+    handler of that kind) and a trigger providing to_dict().  Each row keeps the job's next run time, which is
+    updated every time the job fires.
+
+    Args:
+        path (str): SQLite database file.  Created if missing.
+    """
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.__lock = threading.Lock()
+        self.__db = sqlite3.connect(path, check_same_thread=False)
+        with self.__lock, self.__db:
+            self.__db.execute('PRAGMA journal_mode=WAL')
+            self.__db.execute('CREATE TABLE IF NOT EXISTS jobs (id TEXT PRIMARY KEY, kind TEXT NOT NULL, target TEXT NOT NULL, '
+                              'trigger TEXT NOT NULL, next_run REAL, timeout_sec REAL, misfire_policy TEXT, '
+                              'misfire_grace_sec REAL)')
+
+    def __len__(self):
+        with self.__lock:
+            return self.__db.execute('SELECT COUNT(*) FROM jobs').fetchone()[0]
+
+    def close(self) -> None:
+        """
+        Close the database connection
+        """
+        with self.__lock:
+            self.__db.close()
+        return
+
+    def load(self) -> list:
+        """
+        Return every stored job as a dict (target and trigger decoded from json), ordered by next run
+        """
+        with self.__lock:
+            rows = self.__db.execute('SELECT id, kind, target, trigger, next_run, timeout_sec, misfire_policy, '
+                                     'misfire_grace_sec FROM jobs ORDER BY next_run').fetchall()
+        return [{'id': row[0], 'kind': row[1], 'target': json.loads(row[2]), 'trigger': json.loads(row[3]),
+                 'next_run': row[4], 'timeout_sec': row[5], 'misfire_policy': row[6], 'misfire_grace_sec': row[7]}
+                for row in rows]
+
+    def save(self, jobs: list) -> None:
+        """
+        Insert or replace jobs (job objects with id, kind, target, trigger.to_dict() and next_run)
+        """
+        rows = [(job.id, job.kind, json.dumps(job.target), json.dumps(job.trigger.to_dict(), sort_keys=True),
+                 job.next_run, job.timeout_sec, job.misfire_policy, job.misfire_grace_sec) for job in jobs]
+        with self.__lock, self.__db:
+            self.__db.executemany('INSERT OR REPLACE INTO jobs VALUES (?, ?, ?, ?, ?, ?, ?, ?)', rows)
+        return
+
+    def update_next_runs(self, next_runs: dict) -> None:
+        """
+        Record new next run times.  Jobs mapped to None are finished and deleted.
+
+        :param next_runs: job id -> unix time of the next run, or None
+        :type next_runs: dict
+        """
+        finished = [(job_id,) for job_id, next_run in next_runs.items() if next_run is None]
+        updated = [(next_run, job_id) for job_id, next_run in next_runs.items() if next_run is not None]
+        with self.__lock, self.__db:
+            if finished:
+                self.__db.executemany('DELETE FROM jobs WHERE id = ?', finished)
+            if updated:
+                self.__db.executemany('UPDATE jobs SET next_run = ? WHERE id = ?', updated)
+        return
+
+    def delete(self, job_ids: list) -> None:
+        """
+        Delete jobs by id
+        """
+        with self.__lock, self.__db:
+            self.__db.executemany('DELETE FROM jobs WHERE id = ?', [(job_id,) for job_id in job_ids])
+        return
+
+    def clear(self) -> None:
+        """
+        Delete every stored job
+        """
+        with self.__lock, self.__db:
+            self.__db.execute('DELETE FROM jobs')
+        return
@@ -0,0 +1,220 @@
+########################################################################################################################
+########################################################################################################################
+###   Market Calendar Object for WhisperTrades.com API                                                               ###
+###                                                                                                                  ###
+###   Authored by Paul Nobrega   Contact: Paul@PaulNobrega.net                                                       ###
+###   Python Version 3.10                                                                                            ###
+########################################################################################################################
+########################################################################################################################
+import bisect
+import threading
+import warnings
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+from .scheduler import TRIGGER_TYPES, parse_time_str
+
+# NYSE full-day closures (published exchange calendar, including special closures)
+NYSE_HOLIDAYS = frozenset(date.fromisoformat(d) for d in (
+    '2024-01-01', '2024-01-15', '2024-02-19', '2024-03-29', '2024-05-27', '2024-06-19', '2024-07-04', '2024-09-02',
+    '2024-11-28', '2024-12-25',
+    '2025-01-01', '2025-01-09', '2025-01-20', '2025-02-17', '2025-04-18', '2025-05-26', '2025-06-19', '2025-07-04',
+    '2025-09-01', '2025-11-27', '2025-12-25',
+    '2026-01-01', '2026-01-19', '2026-02-16', '2026-04-03', '2026-05-25', '2026-06-19', '2026-07-03', '2026-09-07',
+    '2026-11-26', '2026-12-25',
+    '2027-01-01', '2027-01-18', '2027-02-15', '2027-03-26', '2027-05-31', '2027-06-18', '2027-07-05', '2027-09-06',
+    '2027-11-25', '2027-12-24',
+    '2028-01-17', '2028-02-21', '2028-04-14', '2028-05-29', '2028-06-19', '2028-07-04', '2028-09-04', '2028-11-23',
+    '2028-12-25',
+))
+
+# NYSE early closes (1:00 PM Eastern)
+NYSE_EARLY_CLOSES = frozenset(date.fromisoformat(d) for d in (
+    '2024-07-03', '2024-11-29', '2024-12-24',
+    '2025-07-03', '2025-11-28', '2025-12-24',
+    '2026-11-27', '2026-12-24',
+    '2027-11-26',
+    '2028-07-03', '2028-11-24',
+))
+
+# Years covered by the bundled tables
+NYSE_YEARS = range(2024, 2029)
+
+
+class WhisperTradesMarketCalendar(object):
+    """
+    Offline trading calendar (NYSE by default) with session open/close timestamps precomputed per year.
+
+    The first lookup in a year builds sorted arrays of that year's session open and close unix times; afterwards
+    every question (is a day a trading day, when is the next open/close, when does a session trigger fire next) is a
+    set lookup or a binary search.  Years outside the bundled tables are treated as weekdays-only with a warning.
+
+    Args:
+        holidays (iterable): Dates the market is closed. Default = NYSE_HOLIDAYS
+        early_closes (iterable): Dates the market closes at early_close_time. Default = NYSE_EARLY_CLOSES
+        years (range): Years covered by holidays/early_closes. Default = NYSE_YEARS
+        tz_str (str): Exchange timezone. Default = 'America/New_York'
+        open_time (str): Session open. Default = '09:30'
+        close_time (str): Regular session close. Default = '16:00'
+        early_close_time (str): Close on early-close days. Default = '13:00'
+    """
+    def __init__(self, holidays=NYSE_HOLIDAYS, early_closes=NYSE_EARLY_CLOSES, years: range = NYSE_YEARS,
+                 tz_str: str = 'America/New_York', open_time: str = '09:30', close_time: str = '16:00',
+                 early_close_time: str = '13:00') -> None:
+        self.holidays: frozenset = frozenset(holidays)
+        self.early_closes: frozenset = frozenset(early_closes)
+        self.years: range = years
+        self.tz = ZoneInfo(tz_str)
+        self.open_time: tuple = parse_time_str(open_time)
+        self.close_time: tuple = parse_time_str(close_time)
+        self.early_close_time: tuple = parse_time_str(early_close_time)
+        self.__lock = threading.Lock()
+        self.__sessions = {}
+
+    def is_trading_day(self, day: date) -> bool:
+        """
+        Whether the market has a session on day
+        """
+        return day.weekday() < 5 and day not in self.holidays
+
+    def is_early_close(self, day: date) -> bool:
+        """
+        Whether the market closes early on day
+        """
+        return day in self.early_closes and self.is_trading_day(day)
+
+    def session(self, day: date):
+        """
+        Return (open, close) of day's session as timezone-aware datetimes, or None if the market is closed
+        """
+        if not self.is_trading_day(day):
+            return None
+        opens, closes, days = self.sessions(day.year)
+        i = bisect.bisect_left(days, day.toordinal())
+        return datetime.fromtimestamp(opens[i], self.tz), datetime.fromtimestamp(closes[i], self.tz)
+
+    def sessions(self, year: int) -> tuple:
+        """
+        Precomputed sessions of year: (open unix times, close unix times, day ordinals), all sorted
+        """
+        sessions = self.__sessions.get(year)
+        if sessions is None:
+            with self.__lock:
+                sessions = self.__sessions.get(year)
+                if sessions is None:
+                    sessions = self.__sessions[year] = self.__build(year)
+        return sessions
+
+    def __build(self, year):
+        if year not in self.years:
+            warnings.warn(f'No holiday table for {year}: treating every weekday as a trading day')
+        opens, closes, days = [], [], []
+        day = date(year, 1, 1)
+        while day.year == year:
+            if self.is_trading_day(day):
+                close = self.early_close_time if day in self.early_closes else self.close_time
+                opens.append(datetime(day.year, day.month, day.day, *self.open_time, tzinfo=self.tz).timestamp())
+                closes.append(datetime(day.year, day.month, day.day, *close, tzinfo=self.tz).timestamp())
+                days.append(day.toordinal())
+            day += timedelta(days=1)
+        return opens, closes, days
+
+    def next_event(self, anchor: str, after: float, offset_sec: float = 0.0) -> float:
+        """
+        Unix time of the first session open/close (shifted by offset_sec) strictly after `after`
+
+        :param anchor: 'open' or 'close'
+        :type anchor: String
+        :param after: unix time
+        :type after: float
+        :param offset_sec: seconds added to each open/close (negative for before). Default = 0
+        :type offset_sec: float
+        """
+        if anchor not in ('open', 'close'):
+            raise ValueError(f"anchor must be 'open' or 'close', not '{anchor}'")
+        year = datetime.fromtimestamp(after - offset_sec, self.tz).year
+        for year in (year, year + 1):
+            opens, closes, _ = self.sessions(year)
+            times = opens if anchor == 'open' else closes
+            i = bisect.bisect_right(times, after - offset_sec)
+            if i < len(times):
+                return times[i] + offset_sec
+        return None
+
+
+# Calendar used by triggers that do not get one explicitly (and by triggers restored from a job store)
+NYSE = WhisperTradesMarketCalendar()
+
+
+class session_trigger(object):
+    """
+    Trigger firing on every trading day at the session open or close shifted by offset_min minutes (negative for
+    before), e.g. session_trigger('close', -10) fires 10 minutes before the close, at 12:50 on early-close days.
+
+    :param anchor: 'open' or 'close'
+    :type anchor: String
+    :param offset_min: minutes added to the open/close. Default = 0
+    :type offset_min: float
+    :param calendar: WhisperTradesMarketCalendar. Default = None for the bundled NYSE calendar
+    :type calendar: object
+    """
+    def __init__(self, anchor: str = 'open', offset_min: float = 0, calendar: object = None) -> None:
+        if anchor not in ('open', 'close'):
+            raise ValueError(f"anchor must be 'open' or 'close', not '{anchor}'")
+        self.anchor: str = anchor
+        self.offset_min: float = offset_min
+        self.calendar = calendar if calendar is not None else NYSE
+
+    def next_fire(self, after: float) -> float:
+        return self.calendar.next_event(self.anchor, after, self.offset_min * 60)
+
+    def __repr__(self):
+        return f'{abs(self.offset_min):g} min {"before" if self.offset_min < 0 else "after"} {self.anchor}'
+
+    def to_dict(self) -> dict:
+        return {'type': 'session', 'anchor': self.anchor, 'offset_min': self.offset_min}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'session_trigger':
+        return cls(data['anchor'], data['offset_min'])
+
+
+class trading_day_trigger(object):
+    """
+    Trigger firing at a wall-clock time on trading days only.  Times outside a day's session (e.g. 3:50 PM on an
+    early-close day) still fire; use session_trigger to follow early closes.
+
+    :param time_str: string representation of military time (example: '22:30'). If 12-hr format, PM or AM must be included in string.
+    :type time_str: String
+    :param tz_str: human readable TimeZone. Default is 'America/New_York'
+    :type tz_str: String
+    :param calendar: WhisperTradesMarketCalendar. Default = None for the bundled NYSE calendar
+    :type calendar: object
+    """
+    def __init__(self, time_str: str, tz_str: str = 'America/New_York', calendar: object = None) -> None:
+        self.hour, self.minute = parse_time_str(time_str)
+        self.tz = ZoneInfo(tz_str)
+        self.calendar = calendar if calendar is not None else NYSE
+
+    def next_fire(self, after: float) -> float:
+        day = datetime.fromtimestamp(after, self.tz).date()
+        for _ in range(366):
+            if self.calendar.is_trading_day(day):
+                fire_at = datetime(day.year, day.month, day.day, self.hour, self.minute, tzinfo=self.tz).timestamp()
+                if fire_at > after:
+                    return fire_at
+            day += timedelta(days=1)
+        return None
+
+    def __repr__(self):
+        return f'trading days at {self.hour:02d}:{self.minute:02d} {self.tz.key}'
+
+    def to_dict(self) -> dict:
+        return {'type': 'trading_day', 'time': f'{self.hour:02d}:{self.minute:02d}', 'tz': self.tz.key}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'trading_day_trigger':
+        return cls(data['time'], data['tz'])
+
+
+TRIGGER_TYPES['session'] = session_trigger
+TRIGGER_TYPES['trading_day'] = trading_day_trigger
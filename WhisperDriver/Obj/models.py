@@ -0,0 +1,147 @@
+########################################################################################################################
+########################################################################################################################
+###   Compact Model Objects for WhisperTrades.com API                                                                ###
+###                                                                                                                  ###
+###   Authored by Paul Nobrega   Contact: Paul@PaulNobrega.net                                                       ###
+###   Python Version 3.10                                                                                            ###
+########################################################################################################################
+########################################################################################################################
+from operator import attrgetter
+
+
+class slot_obj(object):
+    """
+    Base for compact, __slots__-backed API models.
+
+    Declared FIELDS are stored in slots (no per-object __dict__).  Payload keys outside the declared fields are kept
+    in an overflow dict that is only created when the first unknown key arrives; they stay readable as attributes.
+    Attributes that are neither declared nor part of a payload cannot be assigned.
+    Models also support read-only dict-style access (obj['key'], obj.get('key'), 'key' in obj, dict(obj)) so code
+    written against raw API dictionaries keeps working.
+
+    Subclasses declare:
+        FIELDS: payload field names in display order
+        DEFAULTS: slot name -> default applied when the field is missing from the payload (lists/dicts are copied)
+        __slots__: storage for FIELDS (or their backing slots) and any internal attributes
+    """
+    __slots__ = ('_extra',)
+    FIELDS = ()
+    DEFAULTS = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._FIELD_SET = frozenset(cls.FIELDS)
+        cls._FIELD_GETTER = attrgetter(*cls.FIELDS, '_extra') if cls.FIELDS else None
+
+    def __init__(self, data: dict = None) -> None:
+        self._extra = None
+        data = data or {}
+        for name, default in self.DEFAULTS.items():
+            if name not in data:
+                setattr(self, name, type(default)() if isinstance(default, (dict, list)) else default)
+        self._set_fields(data)
+
+    def _set_fields(self, data: dict) -> None:
+        for key, value in data.items():
+            try:
+                setattr(self, key, value)
+            except AttributeError:
+                self._set_extra(key, value)
+        return
+
+    def _set_field(self, key, value) -> None:
+        try:
+            setattr(self, key, value)
+        except AttributeError:
+            self._set_extra(key, value)
+        return
+
+    def _set_extra(self, key, value) -> None:
+        if self._extra is None:
+            self._extra = {}
+        self._extra[key] = value
+        return
+
+    def __getattr__(self, name):
+        # Only reached when normal lookup fails: look in the overflow of unknown payload keys
+        if not name.startswith('_'):
+            extra = self._extra
+            if extra is not None and name in extra:
+                return extra[name]
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+    def __getitem__(self, key):
+        if key in self._FIELD_SET:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key)
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def get(self, key, default=None):
+        """
+        Return the value of payload field key, or default if not present
+        """
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self) -> list:
+        """
+        Return the names of all payload fields present on the object (declared fields first)
+        """
+        keys = [key for key in self.FIELDS if key in self]
+        if self._extra is not None:
+            keys.extend(self._extra)
+        return keys
+
+    def to_dict(self) -> dict:
+        """
+        Return a plain dictionary of all payload fields
+        """
+        try:
+            # Fast path when every declared field is set (always the case for fields with DEFAULTS)
+            *values, extra = self._FIELD_GETTER(self)
+            data = dict(zip(self.FIELDS, values))
+        except (AttributeError, TypeError):
+            data = {key: self[key] for key in self.FIELDS if key in self}
+            extra = self._extra
+        if extra:
+            data.update(extra)
+        return data
+
+    def __str__(self):
+        return "\n".join(f'{key}: {str(value)}' for key, value in self.to_dict().items())
+
+    def __repr__(self):
+        return self.__str__()
+
+
+class position_obj(slot_obj):
+    """
+    Compact model of a WhisperTrades.com bot position.  Declared fields missing from the payload read as None
+    """
+    FIELDS = ('number', 'bot', 'status', 'is_paper', 'symbol', 'type', 'quantity', 'entered_at', 'exited_at',
+              'entry_price', 'exit_price', 'profit', 'max_risk', 'legs', 'orders')
+    __slots__ = FIELDS
+    DEFAULTS = {**dict.fromkeys(FIELDS), 'number': '', 'bot': {}, 'status': ''}
+
+
+class order_obj(slot_obj):
+    """
+    Compact model of a WhisperTrades.com bot order.  Declared fields missing from the payload read as None
+    """
+    FIELDS = ('number', 'bot', 'position', 'status', 'type', 'action', 'quantity', 'price', 'limit_price',
+              'fill_price', 'legs', 'created_at', 'filled_at')
+    __slots__ = FIELDS
+    DEFAULTS = {**dict.fromkeys(FIELDS), 'number': '', 'status': ''}
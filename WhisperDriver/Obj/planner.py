@@ -0,0 +1,79 @@
+########################################################################################################################
+########################################################################################################################
+###   Entry-Window Planner for WhisperTrades.com API                                                                 ###
+###                                                                                                                  ###
+###   Authored by Paul Nobrega   Contact: Paul@PaulNobrega.net                                                       ###
+###   Python Version 3.10                                                                                            ###
+########################################################################################################################
+########################################################################################################################
+import numpy as np
+import pandas as pd
+from WhisperDriver.utils.time import get_hour_minute_ampm_format
+
+MINUTES_PER_DAY = 24 * 60
+
+
+def entry_window_plan(bots: list, exclude=(), enable_offset_min: float = -5, disable_offset_min: float = 5,
+                      disable_kind: str = 'disable', bucket_min: int = 1) -> pd.DataFrame:
+    """
+    Build the day's enable/disable plan from each bot's entry window (entry_condition earliest_time_of_day and
+    latest_time_of_day) in one vectorised pass.  Bots are enabled enable_offset_min minutes relative to their earliest
+    entry time and disabled disable_offset_min minutes relative to their latest entry time; times are bucketed to
+    bucket_min minutes (enables rounded down, disables rounded up, so every bucket still covers the whole window) and
+    bots sharing a bucket are grouped into one row.
+
+    :param bots: bot objects or bot json
+    :type bots: List
+    :param exclude: bot numbers to leave out of the plan. Default = ()
+    :type exclude: iterable
+    :param enable_offset_min: minutes added to earliest_time_of_day (negative for before). Default = -5
+    :type enable_offset_min: float
+    :param disable_offset_min: minutes added to latest_time_of_day. Default = 5
+    :type disable_offset_min: float
+    :param disable_kind: job kind of the disable: 'disable' or 'soft_disable' (needs WD.via_selenium enabled). Default = 'disable'
+    :type disable_kind: String
+    :param bucket_min: bucket width in minutes. Default = 1
+    :type bucket_min: int
+
+    :return: one row per (time, kind) bucket with columns 'time' ('HH:MM'), 'minute' (minute of day), 'kind' and
+             'bots' (list of bot numbers), ordered by time.  attrs['skipped'] maps left-out bot numbers to the reason
+    :type return: pandas.DataFrame
+    """
+    if disable_kind not in ('soft_disable', 'disable'):
+        raise ValueError(f"disable_kind must be 'soft_disable' or 'disable', not '{disable_kind}'")
+    numbers, earliest, latest = [], [], []
+    for bot in bots:
+        entry_condition = bot.get('entry_condition') or {}
+        numbers.append(bot.get('number'))
+        earliest.append(entry_condition.get('earliest_time_of_day'))
+        latest.append(entry_condition.get('latest_time_of_day'))
+    numbers = pd.Series(numbers, dtype=object)
+    start = _minute_of_day(earliest) + enable_offset_min
+    end = _minute_of_day(latest) + disable_offset_min
+    excluded = numbers.isin(set(exclude)).to_numpy()
+    missing = np.isnan(start) | np.isnan(end)
+    keep = ~excluded & ~missing
+    skipped = dict.fromkeys(numbers[missing & ~excluded], 'no earliest/latest entry time')
+    skipped.update(dict.fromkeys(numbers[excluded], 'excluded'))
+
+    bucket = max(1, int(bucket_min))
+    enable_at = np.clip(np.floor(start[keep] / bucket) * bucket, 0, MINUTES_PER_DAY - 1).astype('int64')
+    disable_at = np.clip(np.ceil(end[keep] / bucket) * bucket, 0, MINUTES_PER_DAY - 1).astype('int64')
+    kept = numbers[keep].to_numpy()
+    jobs = pd.DataFrame({
+        'minute': np.concatenate([enable_at, disable_at]),
+        'kind': np.repeat(['enable', disable_kind], len(kept)),
+        'bot': np.concatenate([kept, kept]),
+    })
+    plan = jobs.groupby(['minute', 'kind'], sort=True)['bot'].agg(list).rename('bots').reset_index()
+    plan.insert(0, 'time', [f'{m // 60:02d}:{m % 60:02d}' for m in plan['minute']])
+    plan.attrs['skipped'] = skipped
+    return plan
+
+
+def _minute_of_day(values: list) -> np.ndarray:
+    """
+    Minutes since midnight of '09:35 AM' style times (NaN where missing or unparsable)
+    """
+    parsed = pd.to_datetime(pd.Series(values, dtype=object), format=get_hour_minute_ampm_format(), errors='coerce')
+    return (parsed.dt.hour * 60 + parsed.dt.minute).to_numpy(dtype='float64')
@@ -0,0 +1,264 @@
+########################################################################################################################
+########################################################################################################################
+###   Position Sync Object for WhisperTrades.com API                                                                 ###
+###                                                                                                                  ###
+###   Authored by Paul Nobrega   Contact: Paul@PaulNobrega.net                                                       ###
+###   Python Version 3.10                                                                                            ###
+########################################################################################################################
+########################################################################################################################
+import time
+from .models import position_obj
+
+# Position fields that may carry the entry timestamp, in order of preference
+ENTRY_DATE_KEYS = ('entry_date', 'entered_at', 'opened_at', 'created_at')
+
+
+class WhisperTradesPositionSync(object):
+    """
+    Position-sync engine keeping a grouped index of position objects by bot number.
+
+    Each sync only queries bots whose positions are stale for the requested filters.  A few stale bots are refreshed
+    with per-bot queries (filtered by bot on the server); once bulk_threshold bots or half of the account are stale a
+    single bulk query is streamed instead and grouped locally.  status/from_date filters are passed to the server so
+    the hot path (status='OPEN') only transfers open positions; positions outside the filter are left untouched in
+    the index.
+
+    The index doubles as a local position cache keyed by position number.  refresh() keeps it current incrementally:
+    after one full download it only fetches positions entered since the cursor (the latest entry date in the cache)
+    plus the currently OPEN ones, and looks up cached OPEN positions that have closed since individually.
+
+    Attributes:
+        bulk_threshold (int): Number of stale bots from which one bulk query replaces per-bot queries. Default = 5
+        max_age_sec (float): Seconds a bot's positions stay fresh for the same filters. Default = 0 (always refresh)
+        last_strategy (str): Strategy used by the last sync: 'bulk', 'per_bot', 'incremental' or None if nothing was stale
+        cursor (str): High-water mark of entry dates (YYYY-MM-DD) fully present in the cache. None before a full load
+    """
+    def __init__(self, endpts: object, bulk_threshold: int = 5, max_age_sec: float = 0) -> None:
+        self._endpts = endpts
+        self.bulk_threshold: int = bulk_threshold
+        self.max_age_sec: float = max_age_sec
+        self.last_strategy: str = None
+        self.cursor: str = None
+        self._by_bot: dict = {}
+        self._by_number: dict = {}
+        self._owner: dict = {}
+        self._synced_at: dict = {}
+
+    def __len__(self):
+        return len(self._by_number)
+
+    def get(self, position_number: str, default=None):
+        """
+        Return the cached position object for position_number, or default if not cached
+        """
+        return self._by_number.get(position_number, default)
+
+    def positions_for_bot(self, bot_number: str) -> list:
+        """
+        Return the indexed position objects of bot_number
+        """
+        return list(self._by_bot.get(bot_number, {}).values())
+
+    def stale_bots(self, bot_numbers: list, status: str = '', from_date: str = '') -> list:
+        """
+        Return the bot numbers whose positions for the given filters are older than max_age_sec
+        """
+        now = time.monotonic()
+        key = (status.upper(), from_date)
+        return [n for n in bot_numbers if now - self._synced_at.get((n,) + key, float('-inf')) > self.max_age_sec]
+
+    def refresh(self, bot_numbers: list, force: bool = True) -> set:
+        """
+        Incrementally refresh the position cache of the whole account.  The first refresh (or one after reset())
+        downloads every position; later ones fetch positions entered since the cursor plus the OPEN ones.
+
+        :param bot_numbers: bot numbers of the account
+        :type bot_numbers: List
+        :param force: Refresh even if the account was synced less than max_age_sec ago. Default = True
+        :type force: Bool
+
+        :return: bot numbers whose positions changed
+        :type return: Set
+        """
+        bot_numbers = list(bot_numbers)
+        if not force and not self.stale_bots(bot_numbers):
+            self.last_strategy = None
+            return set()
+        if self.cursor is None:
+            self.last_strategy = 'bulk'
+            self.ingest(self._endpts.bots.iter_bot_positions(prefetch=True), bot_numbers)
+            return set(bot_numbers)
+        self.last_strategy = 'incremental'
+        was_open = {n for n, p in self._by_number.items() if _matches(p, 'OPEN', '')}
+        seen = set()
+        changed = set()
+        latest = self.cursor
+        for status, from_date in (('', self.cursor), ('OPEN', '')):
+            for pos in self._endpts.bots.iter_bot_positions(status=status, from_date=from_date, prefetch=True):
+                pos = position_obj(pos)
+                seen.add(pos.get('number'))
+                latest = max(latest, entry_date(pos))
+                changed.add(self._merge(pos))
+        # Cached OPEN positions entered before the cursor that are no longer OPEN: fetch their final state one by one
+        for position_number in was_open - seen:
+            pos = self._endpts.bots.get_bot_positions(position_number=position_number)
+            if isinstance(pos, dict) and pos.get('number') == position_number:
+                changed.add(self._merge(position_obj(pos)))
+            else:
+                changed.add(self._drop(position_number))
+        synced_at = time.monotonic()
+        for owner in bot_numbers:
+            self._synced_at[(owner, '', '')] = synced_at
+        self.cursor = latest
+        changed.discard(None)
+        return changed
+
+    def reset(self) -> None:
+        """
+        Clear the cache and cursor so the next refresh downloads every position again
+        """
+        self.cursor = None
+        self._by_bot = {}
+        self._by_number = {}
+        self._owner = {}
+        self._synced_at = {}
+        return
+
+    def sync(self, bot_numbers: list, status: str = '', from_date: str = '', force: bool = False) -> list:
+        """
+        Refresh the positions of the stale bots among bot_numbers from WhisperTrades.com
+
+        :param bot_numbers: bot numbers of the account (or the subset to refresh)
+        :type bot_numbers: List
+        :param status: Only sync positions with this status (OPEN or CLOSED). Default = '' for all
+        :type status: String
+        :param from_date: Only sync positions entered on or after this date (YYYY-MM-DD). Default = '' for all
+        :type from_date: String
+        :param force: Refresh every bot in bot_numbers regardless of staleness. Default = False
+        :type force: Bool
+
+        :return: bot numbers that were refreshed
+        :type return: List
+        """
+        bot_numbers = list(bot_numbers)
+        stale = bot_numbers if force else self.stale_bots(bot_numbers, status, from_date)
+        if not stale:
+            self.last_strategy = None
+            return []
+        if len(stale) >= self.bulk_threshold or len(stale) * 2 >= len(bot_numbers) > 1:
+            self.last_strategy = 'bulk'
+            positions = self._endpts.bots.iter_bot_positions(status=status, from_date=from_date, prefetch=True)
+            # The bulk query covers the whole account, so every bot in bot_numbers is refreshed
+            self.ingest(positions, bot_numbers, status, from_date)
+            return bot_numbers
+        self.last_strategy = 'per_bot'
+        for bot_number in stale:
+            positions = self._endpts.bots.iter_bot_positions(bot_number=bot_number, status=status, from_date=from_date)
+            self.ingest(positions, [bot_number], status, from_date, bot_number=bot_number)
+        return stale
+
+    def ingest(self, positions, bot_numbers: list, status: str = '', from_date: str = '', bot_number: str = None) -> None:
+        """
+        Merge already fetched positions into the index.  Indexed positions of bot_numbers that match the filters but
+        are missing from positions are dropped; positions outside the filters are kept.
+
+        :param positions: iterable of position json/objects returned for the filters
+        :param bot_numbers: bots fully covered by positions
+        :param bot_number: owner of every position (per-bot query).  Default = None to read it from each position
+        """
+        grouped = {}
+        latest = ''
+        for pos in positions:
+            if not isinstance(pos, position_obj):
+                pos = position_obj(pos)
+            owner = bot_number if bot_number is not None else _bot_number_of(pos)
+            if owner:
+                grouped.setdefault(owner, {})[pos.get('number') or id(pos)] = pos
+                latest = max(latest, entry_date(pos))
+        synced_at = time.monotonic()
+        key = (status.upper(), from_date)
+        for owner in bot_numbers:
+            for n, p in list(self._by_bot.get(owner, {}).items()):
+                if _matches(p, status, from_date):
+                    self._drop(n)
+            for p in grouped.pop(owner, {}).values():
+                self._upsert(p, owner)
+            self._by_bot.setdefault(owner, {})
+            self._synced_at[(owner,) + key] = synced_at
+        # Positions of bots outside bot_numbers are still fresh data: upsert them without dropping anything
+        for owner, found in grouped.items():
+            for p in found.values():
+                self._upsert(p, owner)
+        # An unfiltered account-wide load holds every position entered up to its latest entry date
+        if latest and bot_number is None and not status and (not from_date or (self.cursor is not None and from_date <= self.cursor)):
+            self.cursor = max(self.cursor or '', latest)
+        return
+
+    def _upsert(self, pos, owner: str) -> None:
+        position_number = pos.get('number') or id(pos)
+        old_owner = self._owner.get(position_number)
+        if old_owner is not None and old_owner != owner:
+            self._by_bot.get(old_owner, {}).pop(position_number, None)
+        self._by_number[position_number] = pos
+        self._owner[position_number] = owner
+        self._by_bot.setdefault(owner, {})[position_number] = pos
+        return
+
+    def _merge(self, pos):
+        """
+        Upsert pos unless the cached copy is identical.  Returns the owning bot number if the cache changed
+        """
+        owner = _bot_number_of(pos)
+        if not owner:
+            return None
+        old = self._by_number.get(pos.get('number'))
+        if old is not None and self._owner.get(pos.get('number')) == owner and old.to_dict() == pos.to_dict():
+            return None
+        self._upsert(pos, owner)
+        return owner
+
+    def _drop(self, position_number):
+        """
+        Remove a position from the cache.  Returns the bot number that owned it
+        """
+        self._by_number.pop(position_number, None)
+        owner = self._owner.pop(position_number, None)
+        self._by_bot.get(owner, {}).pop(position_number, None)
+        return owner
+
+    def forget(self, bot_number: str) -> None:
+        """
+        Drop the indexed positions and sync times of bot_number (e.g. after the bot was removed)
+        """
+        for position_number in self._by_bot.pop(bot_number, {}):
+            self._by_number.pop(position_number, None)
+            self._owner.pop(position_number, None)
+        for key in [k for k in self._synced_at if k[0] == bot_number]:
+            del self._synced_at[key]
+        return
+
+
+def entry_date(pos) -> str:
+    """
+    Return the entry date (YYYY-MM-DD) of a position, or '' if the position carries no entry timestamp
+    """
+    for key in ENTRY_DATE_KEYS:
+        value = pos.get(key)
+        if value:
+            return str(value)[:10]
+    return ''
+
+
+def _bot_number_of(pos):
+    bot_info = pos.get('bot')
+    if isinstance(bot_info, dict):
+        return bot_info.get('number')
+    return bot_info
+
+
+def _matches(pos, status: str, from_date: str) -> bool:
+    if status and str(pos.get('status') or '').upper() != status.upper():
+        return False
+    if from_date and entry_date(pos) < from_date:
+        return False
+    return True
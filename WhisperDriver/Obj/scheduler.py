@@ -6,87 +6,603 @@
 ###   Python Version 3.10                                                                                            ###
 ########################################################################################################################
 ########################################################################################################################
-import schedule
-from datetime import datetime
-from WhisperDriver.utils.time import get_hour_minute_ampm_format
+import heapq
+import itertools
+import threading
 import time
-from threading import Thread
+import warnings
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+from WhisperDriver.utils.time import get_hour_minute_ampm_format
+
+# Longest single sleep of the scheduler thread.  Waits are re-checked against the wall clock after this many seconds
+# so a system clock change (or a suspended machine) cannot delay a job by more than this.
+MAX_WAIT_SEC = 60.0
+
+# A run starting more than this many seconds after its scheduled time counts as misfired
+MISFIRE_TOLERANCE_SEC = 1.0
+
 
 class WhisperTradesScheduler(object):
     """
     Scheduler for WhisperTrades.com API bot actions.
 
+    Each instance keeps its own timer heap of jobs ordered by next fire time and one thread that sleeps on a
+    condition variable exactly until the earliest job is due (or a job is added), so jobs fire with sub-second
+    accuracy and adding/firing a job costs O(log n) regardless of how many jobs are scheduled.  Jobs of other
+    scheduler instances in the same process are never affected.
+
+    A job is driven by a trigger: any object with next_fire(after) returning the next unix time strictly after
+    `after`, or None when it will not fire again.  add_task() uses a daily_trigger.
+
+    Due jobs are dispatched to a bounded thread pool, so jobs sharing a fire time run concurrently instead of
+    queueing behind each other on the scheduler thread.  A run still busy timeout_sec after it started is reported
+    as timed out and stops counting against the job's max_instances (Python threads cannot be killed, so the call
+    itself keeps its worker until it returns).  Every run is recorded in history with its scheduled and actual start
+    time (lateness_sec).
+
+    Jobs may carry a kind (e.g. 'enable') and a target (e.g. a bot number).  Due jobs of a kind with a registered
+    batch handler (see register_batch()) that share a fire time are merged into one run calling the handler once
+    with all their targets, so one bulk operation and one report replace a run per bot.
+
+    With a job_store, kind/target jobs are also written to disk and restore() reloads them after a restart.  A run
+    of a stored job found late when it comes due (e.g. restored after downtime) follows the job's misfire policy:
+        'run_late': run it if it is at most misfire_grace_sec late, otherwise skip it
+        'skip': skip it as soon as it is more than MISFIRE_TOLERANCE_SEC late
+        'coalesce': run it once however late (all missed occurrences collapse into that one run)
+    Skipped runs are recorded in history with status 'missed'.  Jobs kept in memory only (e.g. add_task()) run late
+    ('coalesce', e.g. after the machine was suspended) unless given a misfire_policy of their own.
+
     Args:
         endpts (object): Endpoints object for API access.
+        max_workers (int): Maximum number of jobs running at once. Default = 8
+        job_timeout_sec (float): Default timeout of a job run. Default = None for no timeout
+        history_size (int): Number of run records kept in history. Default = 1000
+        job_store (object): WhisperTradesJobStore persisting kind/target jobs. Default = None to keep jobs in memory only
+        misfire_policy (str): Default misfire policy of stored jobs: 'run_late', 'skip' or 'coalesce'. Default = 'run_late'
+        misfire_grace_sec (float): Default lateness allowed by the 'run_late' policy. Default = 60
     """
-    def __init__(self, endpts: object) -> None:
+    MISFIRE_POLICIES = ('run_late', 'skip', 'coalesce')
+
+    def __init__(self, endpts: object, max_workers: int = 8, job_timeout_sec: float = None, history_size: int = 1000,
+                 job_store: object = None, misfire_policy: str = 'run_late', misfire_grace_sec: float = 60.0) -> None:
+        if misfire_policy not in self.MISFIRE_POLICIES:
+            raise ValueError(f'misfire_policy must be one of {self.MISFIRE_POLICIES}')
         self._endpts: object = endpts
         self.scheduler_is_on: bool = False
+        self.max_workers: int = max_workers
+        self.job_timeout_sec: float = job_timeout_sec
+        self.history: deque = deque(maxlen=history_size)
+        self.job_store: object = job_store
+        self.misfire_policy: str = misfire_policy
+        self.misfire_grace_sec: float = misfire_grace_sec
         self.__scheduler = None
-   
+        self.__executor = None
+        self.__heap = []
+        self.__deadlines = []
+        self.__batch_handlers = {}
+        self.__jobs_by_id = {}
+        self.__seq = itertools.count()
+        self.__cond = threading.Condition()
+
     def __del__(self):
         self.stop()
         return
 
+    def __len__(self):
+        with self.__cond:
+            return sum(1 for entry in self.__heap if not entry[2].cancelled)
+
+    @property
+    def jobs(self) -> list:
+        """
+        Scheduled jobs ordered by next fire time
+        """
+        with self.__cond:
+            return [entry[2] for entry in sorted(self.__heap) if not entry[2].cancelled]
+
+    def lateness(self) -> dict:
+        """
+        Summary of start lateness (actual minus scheduled start, in seconds) over the runs in history
+        """
+        lateness = sorted(run['lateness_sec'] for run in list(self.history) if run['lateness_sec'] is not None)
+        if not lateness:
+            return {'runs': 0, 'mean_sec': None, 'p95_sec': None, 'max_sec': None}
+        return {'runs': len(lateness), 'mean_sec': sum(lateness) / len(lateness),
+                'p95_sec': lateness[min(len(lateness) - 1, int(0.95 * len(lateness)))], 'max_sec': lateness[-1]}
+
     def __schedule_loop(self):
+        while True:
+            with self.__cond:
+                due = self.__wait_for_due_jobs()
+                if due is None:
+                    return
+                batches = {}
+                next_runs = {}
+                now = time.time()
+                for fire_at, job in due:
+                    if self.__misfired(job, now - fire_at):
+                        self.history.append(_run_record(job, fire_at, 'missed'))
+                    elif job.kind in self.__batch_handlers:
+                        batches.setdefault((fire_at, job.kind), []).append(job)
+                    else:
+                        self.__dispatch(job, fire_at)
+                    next_run = job.trigger.next_fire(max(fire_at, now))
+                    if next_run is None:
+                        job.next_run = None
+                        self.__jobs_by_id.pop(job.id, None)
+                    else:
+                        self.__push(job, next_run)
+                    if job.persistent:
+                        next_runs[job.id] = next_run
+                for (fire_at, kind), jobs in batches.items():
+                    self.__dispatch(self.__batch(kind, jobs), fire_at)
+                if next_runs and self.job_store is not None:
+                    self.job_store.update_next_runs(next_runs)
+
+    def __misfired(self, job, lateness_sec):
+        policy = job.misfire_policy or (self.misfire_policy if job.persistent else 'coalesce')
+        if policy == 'coalesce':
+            return False
+        if policy == 'skip':
+            return lateness_sec > MISFIRE_TOLERANCE_SEC
+        grace_sec = job.misfire_grace_sec if job.misfire_grace_sec is not None else self.misfire_grace_sec
+        return lateness_sec > max(grace_sec, MISFIRE_TOLERANCE_SEC)
+
+    def __batch(self, kind, jobs):
+        """
+        One-off job running the batch handler of kind once for the (deduplicated) targets of jobs
+        """
+        targets = list(dict.fromkeys(job.target for job in jobs))
+        timeouts = [job.timeout_sec for job in jobs if job.timeout_sec is not None]
+        return job_obj(None, partial(self.__batch_handlers[kind], targets), max(timeouts) if timeouts else None,
+                       kind=kind, target=targets)
+
+    def __wait_for_due_jobs(self):
+        """
+        Block until at least one job is due and pop every due job (expiring timed out runs on the way).  Returns
+        None once the scheduler is stopped.  Must be called holding the condition.
+        """
         while self.scheduler_is_on:
-            schedule.run_pending()
-            time.sleep(1)
+            while self.__heap and self.__heap[0][2].cancelled:
+                heapq.heappop(self.__heap)
+            now = time.time()
+            while self.__deadlines and self.__deadlines[0][0] <= now:
+                self.__expire(heapq.heappop(self.__deadlines)[2])
+            wake_at = min(self.__heap[0][0] if self.__heap else float('inf'),
+                          self.__deadlines[0][0] if self.__deadlines else float('inf'))
+            if wake_at == float('inf'):
+                self.__cond.wait()
+                continue
+            if wake_at > now:
+                self.__cond.wait(min(wake_at - now, MAX_WAIT_SEC))
+                continue
+            due = []
+            while self.__heap and self.__heap[0][0] <= now:
+                fire_at, _, job = heapq.heappop(self.__heap)
+                if not job.cancelled:
+                    due.append((fire_at, job))
+            if due:
+                return due
+        return None
+
+    def __dispatch(self, job, fire_at):
+        """
+        Submit one run of job to the executor unless max_instances runs of it are still busy.  Holds the condition.
+        """
+        run = _run_record(job, fire_at, 'pending')
+        if job.running >= job.max_instances:
+            run['status'] = 'skipped'
+            self.history.append(run)
+            warnings.warn(f'Scheduled job {job} skipped: {job.running} run(s) still busy')
+            return
+        job.running += 1
+        self.__executor.submit(self.__run_job, job, run)
+        return
+
+    def __run_job(self, job, run):
+        started_at = time.time()
+        timeout_sec = job.timeout_sec if job.timeout_sec is not None else self.job_timeout_sec
+        with self.__cond:
+            run['started_at'] = started_at
+            run['lateness_sec'] = started_at - run['scheduled_at']
+            run['status'] = 'running'
+            if timeout_sec is not None:
+                heapq.heappush(self.__deadlines, (started_at + timeout_sec, next(self.__seq), run))
+                self.__cond.notify()
+        try:
+            result, status, error = job.fxn(), 'ok', None
+        except Exception as e:
+            result, status, error = e, 'error', e
+            warnings.warn(f'Scheduled job {job} failed: {e!r}')
+        finished_at = time.time()
+        with self.__cond:
+            run['finished_at'] = finished_at
+            run['duration_sec'] = finished_at - started_at
+            run['error'] = error
+            job.last_result = result
+            job.last_run_at = run['scheduled_at']
+            run['result'] = result
+            if run['status'] == 'running':
+                run['status'] = status
+                job.running -= 1
+                self.history.append(run)
+        return
+
+    def __expire(self, run):
+        """
+        Mark a run still busy at its deadline as timed out and release its max_instances slot.  Holds the condition.
+        """
+        if run['status'] != 'running':
+            return
+        run['status'] = 'timeout'
+        run['job'].running -= 1
+        self.history.append(run)
+        warnings.warn(f"Scheduled job {run['job']} timed out after {time.time() - run['started_at']:.1f} s")
+        return
+
+    def __push(self, job, fire_at):
+        job.next_run = fire_at
+        heapq.heappush(self.__heap, (fire_at, next(self.__seq), job))
+        self.__cond.notify()
         return
-    
+
     def start(self):
         """
         Start Scheduler loop in unique thread.  Thread automatically started at instantiation
         """
-        if self.scheduler_is_on == False:
+        with self.__cond:
+            if self.scheduler_is_on:
+                return
             self.scheduler_is_on = True
-            self.__scheduler = None
-            self.__scheduler = Thread(target=self.__schedule_loop)
+            self.__executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='WhisperTradesJob')
+            self.__scheduler = threading.Thread(target=self.__schedule_loop, name='WhisperTradesScheduler')
             self.__scheduler.start()
-        return 
-    
+        return
+
     def stop(self):
         """
-        Stop Scheduler loop thread.
+        Stop Scheduler loop thread and drop the jobs of this scheduler (jobs saved in job_store are kept for restore()).
         """
-        if self.scheduler_is_on == True:
-            schedule.clear()
+        with self.__cond:
+            if not self.scheduler_is_on:
+                return
             self.scheduler_is_on = False
-            time.sleep(1)
+            for entry in self.__heap:
+                entry[2].cancelled = True
+            self.__heap = []
+            self.__deadlines = []
+            self.__jobs_by_id = {}
+            self.__cond.notify_all()
+            thread, executor = self.__scheduler, self.__executor
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+        if executor is not None:
+            # Runs already started finish in the background; queued runs are dropped
+            executor.shutdown(wait=False, cancel_futures=True)
         return
-    
+
+    def register_batch(self, kind: str, fxn) -> None:
+        """
+        Register the batch handler of a job kind.  Due jobs of that kind sharing a fire time run as one call
+        fxn(targets) whose return value (e.g. a per-bot report) is recorded in history as the run's result.
+
+        :param kind: job kind, e.g. 'enable', 'disable' or 'soft_disable'
+        :type kind: String
+        :param fxn: function taking the list of targets
+        :type fxn: python function
+        """
+        with self.__cond:
+            self.__batch_handlers[kind] = fxn
+        return
+
+    def restore(self) -> int:
+        """
+        Reload the jobs saved in job_store (e.g. after a restart).  Runs that came due while the process was down are
+        handled by each job's misfire policy as soon as the scheduler is started.  Jobs whose kind has no registered
+        batch handler are left in the store and not scheduled.  Jobs whose trigger is exhausted (no next run) are
+        deleted from the store.
+
+        :return: number of jobs restored
+        :type return: int
+        """
+        if self.job_store is None:
+            return 0
+        restored = 0
+        exhausted = []
+        with self.__cond:
+            for row in self.job_store.load():
+                if row['next_run'] is None:
+                    warnings.warn(f"Stored job {row['id']} has no next run: trigger exhausted, dropping job")
+                    exhausted.append(row['id'])
+                    continue
+                if row['kind'] not in self.__batch_handlers:
+                    warnings.warn(f"Stored job {row['id']} not restored: no batch handler registered for kind '{row['kind']}'")
+                    continue
+                job = job_obj(trigger_from_dict(row['trigger']), None, row['timeout_sec'], kind=row['kind'],
+                              target=row['target'], job_id=row['id'], misfire_policy=row['misfire_policy'],
+                              misfire_grace_sec=row['misfire_grace_sec'])
+                job.persistent = True
+                self.__replace(job)
+                self.__push(job, row['next_run'])
+                restored += 1
+            if exhausted:
+                self.job_store.delete(exhausted)
+        return restored
+
+    def __replace(self, job):
+        """
+        Index job by id, cancelling a scheduled job with the same id.  Holds the condition.
+        """
+        if job.id is None:
+            return
+        old = self.__jobs_by_id.get(job.id)
+        if old is not None and old is not job:
+            old.cancelled = True
+            old.next_run = None
+        self.__jobs_by_id[job.id] = job
+        return
+
+    def add_job(self, trigger: object, fxn=None, timeout_sec: float = None, max_instances: int = 1, kind: str = None,
+                target=None, job_id: str = None, misfire_policy: str = None, misfire_grace_sec: float = None) -> object:
+        """
+        Add a job driven by a trigger.
+
+        :param trigger: object with next_fire(after) -> unix time of the next run after `after`, or None when done
+        :type trigger: object
+        :param fxn: function to execute
+        :type fxn: python function
+        :param timeout_sec: seconds after which a run is reported as timed out. Default = None for job_timeout_sec
+        :type timeout_sec: float
+        :param max_instances: runs of this job allowed to be busy at once (further runs are skipped). Default = 1
+        :type max_instances: int
+        :param kind: job kind for batching (see register_batch()). Default = None to always run fxn on its own
+        :type kind: String
+        :param target: target passed to the batch handler of kind (e.g. a bot number). Default = None
+        :type target: object
+        :param job_id: id replacing any scheduled (and stored) job with the same id. Default = None to derive it from
+                       kind, target and trigger for kind/target jobs
+        :type job_id: String
+        :param misfire_policy: 'run_late', 'skip' or 'coalesce'. Default = None for the scheduler's misfire_policy
+                               if the job is stored in job_store, else 'coalesce' (late runs still run)
+        :type misfire_policy: String
+        :param misfire_grace_sec: lateness allowed by 'run_late'. Default = None for the scheduler's misfire_grace_sec
+        :type misfire_grace_sec: float
+
+        :return: the scheduled job (pass it to cancel() to remove it)
+        :type return: job_obj
+        """
+        if not callable(fxn) and (kind is None or target is None or kind not in self.__batch_handlers):
+            raise ValueError('fxn must be callable!')
+        if misfire_policy is not None and misfire_policy not in self.MISFIRE_POLICIES:
+            raise ValueError(f'misfire_policy must be one of {self.MISFIRE_POLICIES}')
+        if job_id is None and kind is not None and target is not None:
+            job_id = f'{kind}:{target}@{trigger!r}'
+        job = job_obj(trigger, fxn, timeout_sec, max_instances, kind, target, job_id, misfire_policy, misfire_grace_sec)
+        fire_at = trigger.next_fire(time.time())
+        if fire_at is None:
+            return job
+        with self.__cond:
+            self.__replace(job)
+            self.__push(job, fire_at)
+            if self.job_store is not None and kind is not None and job_id is not None and hasattr(trigger, 'to_dict'):
+                job.persistent = True
+                self.job_store.save([job])
+        return job
+
+    def add_jobs(self, trigger: object, kind: str, targets: list, timeout_sec: float = None, misfire_policy: str = None,
+                 misfire_grace_sec: float = None, id_prefix: str = None) -> list:
+        """
+        Add one kind/target job per target, all driven by trigger, in a single step (one lock, one job store write).
+        The jobs come due together and run as one batch of kind.
+
+        :param trigger: object with next_fire(after) -> unix time of the next run after `after`, or None when done
+        :type trigger: object
+        :param kind: job kind with a registered batch handler (see register_batch())
+        :type kind: String
+        :param targets: targets passed to the batch handler (e.g. bot numbers)
+        :type targets: List
+        :param id_prefix: identify the jobs by id_prefix, kind and target only, so adding them again with another
+                          trigger replaces the scheduled (and stored) jobs. Default = None to include the trigger in the id
+        :type id_prefix: String
+
+        :return: the scheduled jobs
+        :type return: List
+        """
+        if kind not in self.__batch_handlers:
+            raise ValueError(f"No batch handler registered for kind '{kind}'")
+        if misfire_policy is not None and misfire_policy not in self.MISFIRE_POLICIES:
+            raise ValueError(f'misfire_policy must be one of {self.MISFIRE_POLICIES}')
+        job_id = '{0}:{1}:{2}' if id_prefix is not None else '{1}:{2}@{3!r}'
+        jobs = [job_obj(trigger, None, timeout_sec, 1, kind, target, job_id.format(id_prefix, kind, target, trigger),
+                        misfire_policy, misfire_grace_sec) for target in targets]
+        fire_at = trigger.next_fire(time.time())
+        if fire_at is None or not jobs:
+            return jobs
+        with self.__cond:
+            for job in jobs:
+                self.__replace(job)
+                self.__push(job, fire_at)
+            if self.job_store is not None and hasattr(trigger, 'to_dict'):
+                for job in jobs:
+                    job.persistent = True
+                self.job_store.save(jobs)
+        return jobs
+
+    def cancel(self, job: object) -> None:
+        """
+        Remove a job returned by add_task() or add_job()
+        """
+        with self.__cond:
+            job.cancelled = True
+            job.next_run = None
+            if self.__jobs_by_id.get(job.id) is job:
+                del self.__jobs_by_id[job.id]
+            if job.persistent and self.job_store is not None:
+                self.job_store.delete([job.id])
+            self.__cond.notify()
+        return
+
     def stop_scheduler_at_time(self, time_str: str=None, tz_str: str='America/New_York'):
         """
         Stop Scheduler thread at predefined time.
-        
+
         :param time_str: string representation of military time (example: '22:30'). If 12-hr format, PM or AM must be included in string.
         :type time_str: String
         :param tz_str: human readable TimeZone. Default is 'America/New_York'
         :type tz_str: String
         """
-        if not time_str or not isinstance(time_str, str):
-            raise ValueError('Time input string is required!')
-        if 'pm' in time_str.lower() or 'am' in time_str.lower():
-            time_str = datetime.strptime(time_str, get_hour_minute_ampm_format()).strftime('%H:%M')
+        trigger = daily_trigger(time_str, tz_str)
         self.start()
-        schedule.every().day.at(time_str, tz_str).do(self.stop)
-        return
+        return self.add_job(trigger, self.stop)
 
-    def add_task(self, time_str: str=None, tz_str: str='America/New_York', fxn=None):
+    def add_task(self, time_str: str=None, tz_str: str='America/New_York', fxn=None, timeout_sec: float = None,
+                 kind: str = None, target=None):
         """
-        Add Task to scheduler.
-        
+        Add Task to scheduler.  The task runs every day at time_str.
+
         :param time_str: string representation of military time (example: '22:30'). If 12-hr format, PM or AM must be included in string.
         :type time_str: String
         :param tz_str: human readable TimeZone. Default is 'America/New_York'
         :type tz_str: String
         :param fxn: function to execute
         :type tz_str: python function
+        :param timeout_sec: seconds after which a run is reported as timed out. Default = None for job_timeout_sec
+        :type timeout_sec: float
+        :param kind: job kind for batching (see register_batch()). Default = None
+        :type kind: String
+        :param target: target passed to the batch handler of kind (e.g. a bot number). Default = None
+        :type target: object
+
+        :return: the scheduled job (pass it to cancel() to remove it)
+        :type return: job_obj
         """
-        if not time_str or not isinstance(time_str, str):
-            raise ValueError('Time input string is required!')
-        if 'pm' in time_str.lower() or 'am' in time_str.lower():
-            time_str = datetime.strptime(time_str, get_hour_minute_ampm_format()).strftime('%H:%M')
-        schedule.every().day.at(time_str, tz_str).do(fxn)
-        return
+        return self.add_job(daily_trigger(time_str, tz_str), fxn, timeout_sec, kind=kind, target=target)
+
+
+    def add_session_task(self, anchor: str = 'open', offset_min: float = 0, fxn=None, timeout_sec: float = None,
+                         kind: str = None, target=None, calendar: object = None):
+        """
+        Add Task running on every trading day relative to the session open or close (holidays are skipped and early
+        closes followed), e.g. add_session_task('close', -10, fxn) runs 10 minutes before the close.
+
+        :param anchor: 'open' or 'close'
+        :type anchor: String
+        :param offset_min: minutes added to the open/close (negative for before). Default = 0
+        :type offset_min: float
+        :param fxn: function to execute
+        :type fxn: python function
+        :param timeout_sec: seconds after which a run is reported as timed out. Default = None for job_timeout_sec
+        :type timeout_sec: float
+        :param kind: job kind for batching (see register_batch()). Default = None
+        :type kind: String
+        :param target: target passed to the batch handler of kind (e.g. a bot number). Default = None
+        :type target: object
+        :param calendar: WhisperTradesMarketCalendar. Default = None for the bundled NYSE calendar
+        :type calendar: object
+
+        :return: the scheduled job (pass it to cancel() to remove it)
+        :type return: job_obj
+        """
+        from .market_calendar import session_trigger
+        return self.add_job(session_trigger(anchor, offset_min, calendar), fxn, timeout_sec, kind=kind, target=target)
 
+
+class job_obj(object):
+    """
+    Scheduled job.  next_run is the unix time of the next run (None once finished or cancelled) and running the
+    number of its runs currently busy.
+    """
+    __slots__ = ('id', 'trigger', 'fxn', 'timeout_sec', 'max_instances', 'kind', 'target', 'misfire_policy',
+                 'misfire_grace_sec', 'persistent', 'running', 'next_run', 'last_run_at', 'last_result', 'cancelled')
+
+    def __init__(self, trigger, fxn, timeout_sec=None, max_instances=1, kind=None, target=None, job_id=None,
+                 misfire_policy=None, misfire_grace_sec=None):
+        self.id: str = job_id
+        self.trigger = trigger
+        self.fxn = fxn
+        self.kind: str = kind
+        self.target = target
+        self.misfire_policy: str = misfire_policy
+        self.misfire_grace_sec: float = misfire_grace_sec
+        self.persistent: bool = False
+        self.timeout_sec: float = timeout_sec
+        self.max_instances: int = max_instances
+        self.running: int = 0
+        self.next_run: float = None
+        self.last_run_at: float = None
+        self.last_result = None
+        self.cancelled: bool = False
+
+    def __repr__(self):
+        if self.kind is not None:
+            return f'<job {self.kind} {self.target} {self.trigger}>' if self.trigger is not None else f'<batch {self.kind} x{len(self.target)}>'
+        name = getattr(self.fxn, '__qualname__', None) or getattr(getattr(self.fxn, 'func', None), '__qualname__', repr(self.fxn))
+        return f'<job {name} {self.trigger}>'
+
+
+class daily_trigger(object):
+    """
+    Trigger firing every day at a wall-clock time in a timezone (daylight saving changes are followed).
+
+    :param time_str: string representation of military time (example: '22:30'). If 12-hr format, PM or AM must be included in string.
+    :type time_str: String
+    :param tz_str: human readable TimeZone. Default is 'America/New_York'
+    :type tz_str: String
+    """
+    def __init__(self, time_str: str, tz_str: str = 'America/New_York') -> None:
+        self.hour, self.minute = parse_time_str(time_str)
+        self.tz = ZoneInfo(tz_str)
+
+    def next_fire(self, after: float) -> float:
+        day = datetime.fromtimestamp(after, self.tz).date()
+        while True:
+            fire_at = datetime(day.year, day.month, day.day, self.hour, self.minute, tzinfo=self.tz).timestamp()
+            if fire_at > after:
+                return fire_at
+            day += timedelta(days=1)
+
+    def __repr__(self):
+        return f'daily at {self.hour:02d}:{self.minute:02d} {self.tz.key}'
+
+    def to_dict(self) -> dict:
+        return {'type': 'daily', 'time': f'{self.hour:02d}:{self.minute:02d}', 'tz': self.tz.key}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'daily_trigger':
+        return cls(data['time'], data['tz'])
+
+
+# Trigger 'type' (as written by to_dict()) -> trigger class, used to rebuild stored jobs
+TRIGGER_TYPES = {'daily': daily_trigger}
+
+
+def trigger_from_dict(data: dict) -> object:
+    """
+    Rebuild a trigger from its to_dict() representation
+    """
+    if data.get('type') not in TRIGGER_TYPES:
+        raise ValueError(f"Unknown trigger type '{data.get('type')}'")
+    return TRIGGER_TYPES[data['type']].from_dict(data)
+
+
+def _run_record(job, fire_at, status) -> dict:
+    return {'job': job, 'kind': job.kind, 'target': job.target, 'scheduled_at': fire_at, 'started_at': None,
+            'finished_at': None, 'lateness_sec': None, 'duration_sec': None, 'status': status, 'result': None,
+            'error': None}
+
+
+def parse_time_str(time_str: str) -> tuple:
+    """
+    Parse '22:30' or '10:30 PM' into (hour, minute)
+    """
+    if not time_str or not isinstance(time_str, str):
+        raise ValueError('Time input string is required!')
+    if 'pm' in time_str.lower() or 'am' in time_str.lower():
+        parsed = datetime.strptime(time_str.strip(), get_hour_minute_ampm_format())
+    else:
+        parsed = datetime.strptime(time_str.strip(), '%H:%M')
+    return parsed.hour, parsed.minute
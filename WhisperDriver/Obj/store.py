@@ -0,0 +1,170 @@
+########################################################################################################################
+########################################################################################################################
+###   Snapshot Store Object for WhisperTrades.com API                                                                ###
+###                                                                                                                  ###
+###   Authored by Paul Nobrega   Contact: Paul@PaulNobrega.net                                                       ###
+###   Python Version 3.10                                                                                            ###
+########################################################################################################################
+########################################################################################################################
+import json
+import time
+import sqlite3
+import threading
+
+# Keeps the rowid (and therefore the stored order) of records that already exist
+_UPSERT = ('INSERT INTO records VALUES (?, ?, ?, ?, ?) ON CONFLICT (kind, number) DO UPDATE SET grp = excluded.grp, '
+           'payload = excluded.payload, updated_at = excluded.updated_at')
+
+
+class WhisperTradesSnapshotStore(object):
+    """
+    On-disk (SQLite) snapshot of account data: bots, variables, reports and positions.
+
+    Records are stored as json per (kind, number) with the time each kind was last refreshed from the API, so a
+    process can warm-start from disk while the snapshot is younger than a freshness TTL.  Writes are incremental:
+    only records whose json changed are rewritten.  Positions are grouped by bot so one bot's positions can be
+    replaced without touching the others.
+
+    Args:
+        path (str): SQLite database file.  Created if missing.
+    """
+    KINDS = ('bots', 'positions', 'reports', 'variables')
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.__lock = threading.Lock()
+        self.__db = sqlite3.connect(path, check_same_thread=False)
+        with self.__lock, self.__db:
+            self.__db.execute('PRAGMA journal_mode=WAL')
+            self.__db.execute('CREATE TABLE IF NOT EXISTS records (kind TEXT NOT NULL, number TEXT NOT NULL, grp TEXT, '
+                              'payload TEXT NOT NULL, updated_at REAL NOT NULL, PRIMARY KEY (kind, number))')
+            self.__db.execute('CREATE INDEX IF NOT EXISTS records_grp ON records (kind, grp)')
+            self.__db.execute('CREATE TABLE IF NOT EXISTS synced (kind TEXT PRIMARY KEY, synced_at REAL NOT NULL)')
+
+    def close(self) -> None:
+        """
+        Close the database connection
+        """
+        with self.__lock:
+            self.__db.close()
+        return
+
+    def synced_at(self, kind: str) -> float | None:
+        """
+        Unix time kind was last refreshed from the API, or None if never stored
+        """
+        with self.__lock:
+            row = self.__db.execute('SELECT synced_at FROM synced WHERE kind = ?', (kind,)).fetchone()
+        return row[0] if row else None
+
+    def is_fresh(self, kind: str, ttl_sec: float) -> bool:
+        """
+        Whether kind was refreshed from the API less than ttl_sec seconds ago
+        """
+        synced_at = self.synced_at(kind)
+        return synced_at is not None and time.time() - synced_at <= ttl_sec
+
+    def load(self, kind: str, ttl_sec: float = None) -> list | None:
+        """
+        Return the stored json records of kind, or None if kind was never stored or is older than ttl_sec
+
+        :param kind: one of KINDS
+        :type kind: String
+        :param ttl_sec: maximum age of the snapshot in seconds. Default = None for any age
+        :type ttl_sec: float
+        """
+        synced_at = self.synced_at(kind)
+        if synced_at is None or (ttl_sec is not None and time.time() - synced_at > ttl_sec):
+            return None
+        with self.__lock:
+            rows = self.__db.execute('SELECT payload FROM records WHERE kind = ? ORDER BY rowid', (kind,)).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def sync(self, kind: str, records: list) -> int:
+        """
+        Make the stored records of kind equal to records, rewriting only added or changed ones
+
+        :return: number of records written or deleted
+        :type return: int
+        """
+        payloads = {_number(record): _dumps(record) for record in records}
+        with self.__lock:
+            stored = dict(self.__db.execute('SELECT number, payload FROM records WHERE kind = ?', (kind,)))
+            removed = [n for n in stored if n not in payloads]
+            changed = [(n, p) for n, p in payloads.items() if stored.get(n) != p]
+            self.__write(kind, changed, removed)
+        return len(removed) + len(changed)
+
+    def upsert(self, kind: str, records: list, removed: list = ()) -> None:
+        """
+        Write records of kind and delete the record numbers in removed, leaving all other records untouched
+        """
+        with self.__lock:
+            self.__write(kind, [(_number(record), _dumps(record)) for record in records], list(removed))
+        return
+
+    def replace_group(self, kind: str, groups: dict) -> None:
+        """
+        Replace the records of each group (e.g. the positions of a bot)
+
+        :param groups: group key (e.g. bot number) -> list of records
+        :type groups: dict
+        """
+        now = time.time()
+        with self.__lock, self.__db:
+            for group, records in groups.items():
+                self.__db.execute('DELETE FROM records WHERE kind = ? AND grp = ?', (kind, group))
+                self.__db.executemany(_UPSERT, [(kind, _number(r), group, _dumps(r), now) for r in records])
+            self.__mark_synced(kind, now)
+        return
+
+    def mark_synced(self, kind: str) -> None:
+        """
+        Record that kind was refreshed from the API now (without writing records)
+        """
+        with self.__lock, self.__db:
+            self.__mark_synced(kind, time.time())
+        return
+
+    def clear(self, kind: str = None) -> None:
+        """
+        Delete the snapshot of kind, or of every kind if None
+        """
+        with self.__lock, self.__db:
+            if kind is None:
+                self.__db.execute('DELETE FROM records')
+                self.__db.execute('DELETE FROM synced')
+            else:
+                self.__db.execute('DELETE FROM records WHERE kind = ?', (kind,))
+                self.__db.execute('DELETE FROM synced WHERE kind = ?', (kind,))
+        return
+
+    def __write(self, kind, changed, removed):
+        now = time.time()
+        with self.__db:
+            if removed:
+                self.__db.executemany('DELETE FROM records WHERE kind = ? AND number = ?', [(kind, n) for n in removed])
+            if changed:
+                self.__db.executemany(_UPSERT, [(kind, n, None, p, now) for n, p in changed])
+            self.__mark_synced(kind, now)
+        return
+
+    def __mark_synced(self, kind, now):
+        self.__db.execute('INSERT OR REPLACE INTO synced VALUES (?, ?)', (kind, now))
+        return
+
+
+def _number(record) -> str:
+    return str(record.get('number'))
+
+
+def _dumps(record) -> str:
+    if hasattr(record, 'to_dict'):
+        record = record.to_dict()
+    return json.dumps(record, sort_keys=True, default=_to_json)
+
+
+def _to_json(value):
+    if hasattr(value, 'to_dict'):
+        return value.to_dict()
+    return str(value)
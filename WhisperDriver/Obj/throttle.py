@@ -7,50 +7,218 @@
 ########################################################################################################################
 ########################################################################################################################
 import time
+import asyncio
+import threading
+from email.utils import parsedate_to_datetime
 
 class WhisperTradesThrottle(object):
     """
-    API rate limiter for WhisperTrades.com.
+    Thread-safe token-bucket rate limiter for WhisperTrades.com.
+
+    One token is refilled every delay_sec seconds up to burst tokens.  A request only waits when the bucket is empty,
+    so an idle process sends its first request immediately and callers on different threads share one budget.
+
+    The throttle adapts to server feedback: a 429/503 response or an exhausted rate-limit header pauses all callers
+    until the server's Retry-After (or rate-limit reset) has passed and doubles the refill interval.  Each successful
+    response shrinks the interval back toward delay_sec.  Server-imposed pauses are honoured even when disabled.
 
     Attributes:
-        delay_sec (int): Delay in seconds between requests.
+        delay_sec (int): Seconds to refill one request token (sustained rate is 1 request per delay_sec).
+        burst (int): Maximum number of requests that may be sent back-to-back after an idle period.
+        backoff (float): Current multiplier applied to delay_sec after rate-limit responses (1.0 = no backoff).
+        max_backoff (float): Upper bound for backoff.
         is_on (bool): Whether throttling is enabled.
     """
-    def __init__(self) -> None:
-        self.delay_sec: int = 2
+    RATE_LIMIT_STATUS_CODES = (429, 503)
+
+    def __init__(self, delay_sec: float = 2, burst: int = 1, max_backoff: float = 32.0) -> None:
+        self.delay_sec: float = delay_sec
+        self.burst: int = burst
+        self.backoff: float = 1.0
+        self.max_backoff: float = max_backoff
+        self.recovery: float = 0.8
         self.is_on: bool = True
-   
+        self.__lock = threading.Lock()
+        self.__tokens: float = float(burst)
+        self.__last_refill: float = time.monotonic()
+        self.__pause_until: float = 0.0
+
     def __call__(self, fxn):
         return self.__run(fxn)
 
     def __run(self, fxn):
-        if self.is_on:
-            time.sleep(self.delay_sec)
+        self.acquire()
         return fxn()
-    
+
+    @property
+    def interval_sec(self) -> float:
+        """
+        Current seconds per request token, including any backoff learned from the server
+        """
+        return self.delay_sec * self.backoff
+
+    def __refill(self, now: float) -> None:
+        if now < self.__last_refill:
+            return
+        interval = self.interval_sec
+        if interval > 0:
+            self.__tokens = min(float(self.burst), self.__tokens + (now - self.__last_refill) / interval)
+        else:
+            self.__tokens = float(self.burst)
+        self.__last_refill = now
+        return
+
+    def reserve(self) -> float:
+        """
+        Take one request token and return the number of seconds the caller must wait before sending.
+        Waiting callers are queued in arrival order, so concurrent callers never stack their delays.
+
+        :return: seconds to wait (0 if a token was available)
+        :type return: float
+        """
+        with self.__lock:
+            now = time.monotonic()
+            pause_sec = max(0.0, self.__pause_until - now)
+            if not self.is_on:
+                return pause_sec
+            self.__refill(now)
+            self.__tokens -= 1
+            if self.__tokens >= 0:
+                return pause_sec
+            return max(pause_sec, self.__last_refill - self.__tokens * self.interval_sec - now)
+
+    def pause_remaining(self) -> float:
+        """
+        Seconds left on a server-imposed pause (0 if none)
+        """
+        return max(0.0, self.__pause_until - time.monotonic())
+
+    def acquire(self) -> None:
+        """
+        Block until a request token is available.  Callers that wake during a newly imposed server pause keep waiting.
+        """
+        wait_sec = self.reserve()
+        while wait_sec > 0:
+            time.sleep(wait_sec)
+            wait_sec = self.pause_remaining()
+        return
+
+    async def acquire_async(self) -> None:
+        """
+        Await a request token without blocking the event loop.  Shares the same budget as acquire().
+        """
+        wait_sec = self.reserve()
+        while wait_sec > 0:
+            await asyncio.sleep(wait_sec)
+            wait_sec = self.pause_remaining()
+        return
+
+    def feedback(self, status_code: int, headers: dict = None) -> None:
+        """
+        Adapt the request rate to a response received from the WhisperTrades API.
+
+        429/503 responses back off and pause until Retry-After.  An exhausted X-RateLimit-Remaining pauses until
+        X-RateLimit-Reset (or Retry-After).  Any other response speeds the throttle back up toward delay_sec.
+
+        :param status_code: HTTP status code of the response
+        :type status_code: int
+        :param headers: response headers
+        :type headers: dict
+        """
+        headers = headers or {}
+        retry_after = _parse_retry_after(headers.get('Retry-After'))
+        remaining = headers.get('X-RateLimit-Remaining')
+        with self.__lock:
+            now = time.monotonic()
+            if status_code in self.RATE_LIMIT_STATUS_CODES:
+                self.__refill(now)
+                self.backoff = min(self.max_backoff, self.backoff * 2)
+                self.__pause(now, retry_after if retry_after is not None else self.interval_sec)
+            elif remaining is not None and str(remaining).strip() == '0':
+                reset_sec = _parse_rate_limit_reset(headers.get('X-RateLimit-Reset'))
+                pause_sec = retry_after if retry_after is not None else reset_sec
+                self.__refill(now)
+                self.__pause(now, pause_sec if pause_sec is not None else self.interval_sec)
+            elif status_code < 400 and self.backoff > 1.0:
+                self.__refill(now)
+                self.backoff = max(1.0, self.backoff * self.recovery)
+        return
+
+    def __pause(self, now: float, pause_sec: float) -> None:
+        self.__pause_until = max(self.__pause_until, now + pause_sec)
+        self.__tokens = min(self.__tokens, 0.0) + 1.0
+        self.__last_refill = max(self.__last_refill, self.__pause_until)
+        return
+
     def enable(self):
         """
         Toggle throttle to enabled
         """
         if self.is_on == False:
-            self.is_on = True
-        return 
-    
+            with self.__lock:
+                self.__refill(time.monotonic())
+                self.is_on = True
+        return
+
     def disable(self):
         """
         Toggle throttle to disabled
         """
         if self.is_on == True:
             self.is_on = False
-        return 
-    
+        return
+
     def set_delay_sec(self, sec_delay: int=2):
         """
-        Set seconds to delay before each API request
+        Set seconds to refill one request token (minimum spacing between requests once the burst is used up)
 
-        :sec_delay: seconds to delay before each API request.  Default is 2 seconds to match WhisperTrades API rate limit
+        :sec_delay: seconds per request token.  Default is 2 seconds to match WhisperTrades API rate limit
         :type sec_delay: int
         """
-        self.delay_sec = sec_delay
+        with self.__lock:
+            self.__refill(time.monotonic())
+            self.delay_sec = sec_delay
         return
 
+    def set_burst(self, burst: int=1):
+        """
+        Set the maximum number of requests that may be sent back-to-back after an idle period
+
+        :burst: bucket capacity in requests.  Default is 1 (strict spacing of delay_sec between requests)
+        :type burst: int
+        """
+        if burst < 1:
+            raise ValueError('Burst must be at least 1!')
+        with self.__lock:
+            self.__refill(time.monotonic())
+            self.burst = burst
+            self.__tokens = min(self.__tokens, float(burst))
+        return
+
+
+def _parse_retry_after(value) -> float | None:
+    """
+    Parse a Retry-After header given either as delta-seconds or as an HTTP-date.  Returns seconds, or None if absent.
+    """
+    if value is None or value == '':
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+def _parse_rate_limit_reset(value) -> float | None:
+    """
+    Parse an X-RateLimit-Reset header (unix epoch seconds) into seconds from now.  Returns None if absent.
+    """
+    if value is None or value == '':
+        return None
+    try:
+        return max(0.0, float(value) - time.time())
+    except (TypeError, ValueError):
+        return None
@@ -7,7 +7,9 @@
 ########################################################################################################################
 ########################################################################################################################
 import json
+import threading
 import warnings
+from .models import slot_obj
 
 class WhisperTradesVariables(object):
     """
@@ -15,99 +17,149 @@ class WhisperTradesVariables(object):
 
     Args:
         endpts (object): Endpoints object for API calls.
+        populate (bool): Query all variables at instantiation. Default = True
+        variable_index (object): Bot/variable index shared with WhisperTradesBots. Default = None to create one
     """
-    def __init__(self, endpts: object) -> None:
+    def __init__(self, endpts: object, populate: bool = True, variable_index: object = None) -> None:
         self._endpts: object = endpts
         self.unassociated_variable_numbers: list = []
+        self.variable_index = variable_index if variable_index is not None else WhisperTradesVariableIndex()
         self.variables_list = self.__variable_list(self._endpts)
-        self.update_all_variables()
+        if populate:
+            self.update_all_variables()
     
     def __call__(self, variable_number: str):
         """
         Return the variable object for the provided variable number.
         Usage: WD.variables('VARIABLE_NUMBER')
         """
-        for vari in self.variables_list.all:
-            if hasattr(vari, 'number') and vari.number == variable_number:
-                return vari
-        raise KeyError(f"Variable number '{variable_number}' not found.")
+        vari = self.variables_list.get(variable_number)
+        if vari is None:
+            raise KeyError(f"Variable number '{variable_number}' not found.")
+        return vari
 
-    def update_all_variables(self):
+    def bots_for_variable(self, variable_number: str) -> list:
         """
-        Update variables_list with data retrieved from WhisperTrades.com API
+        Return the numbers of all bots that use the given variable (as of the last bot or variable refresh)
         """
+        return self.variable_index.bots_for_variable(variable_number)
+
+    def variables_for_bot(self, bot_number: str) -> list:
+        """
+        Return the variable objects used by the given bot (as of the last bot or variable refresh)
+        """
+        return [vari for vari in map(self.variables_list.get, self.variable_index.variables_for_bot(bot_number)) if vari is not None]
+
+    def update_all_variables(self, variables_json: list = None):
+        """
+        Update variables_list (and the variables of the bot/variable index) with data retrieved from WhisperTrades.com API
+
+        :param variables_json: already fetched response of get_all_bot_variables(). Default = None to query the API
+        :type variables_json: List
+        """
+        if variables_json is None:
+            variables_json = self._endpts.variables.get_all_bot_variables()
         self.variables_list.all = []
-        _ = [self.variables_list.add_variable_to_list(vari) for vari in self._endpts.variables.get_all_bot_variables()]
+        _ = [self.variables_list.add_variable_to_list(vari) for vari in variables_json]
         self.unassociated_variable_numbers = [vari.number for vari in self.variables_list.all if vari.bot is None]
+        self.variable_index.update_variables(variables_json)
+        return
+
+    def defer_update_all_variables(self):
+        """
+        Lazy loading: postpone update_all_variables until variables_list is first accessed
+        """
+        self.variables_list._loader = self.update_all_variables
         return
     
 
     class __variable_list(object):
             def __init__(self, endpts):
-                self.all = []
+                self._loader = None
+                self._loading = False
+                self._load_lock = threading.RLock()
+                self._by_number = {}
                 self._endpts = endpts
+
+            def _load_if_deferred(self):
+                """
+                Run the deferred loader once.  Other threads wait for the running load instead of reading an empty registry; a
+                failed load keeps the loader so the next access retries it.
+                """
+                if self._loader is None:
+                    return
+                with self._load_lock:
+                    loader = self._loader
+                    if loader is None or self._loading:
+                        # Loaded meanwhile, or re-entered by the loader itself
+                        return
+                    self._loading = True
+                    try:
+                        loader()
+                    except BaseException:
+                        self._loader = loader
+                        raise
+                    finally:
+                        self._loading = False
+                    self._loader = None
+                return
             
+            @property
             def all(self) -> list:
                 """
-                Return list of all bot numbers
+                Return list of all variable objects.  If loading was deferred, the first access queries WhisperTrades.com
+                """
+                self._load_if_deferred()
+                return list(self._by_number.values())
+
+            @all.setter
+            def all(self, variables: list):
+                self._loader = None
+                self._by_number = {vari.number: vari for vari in variables}
+
+            def get(self, variable_number: str, default=None):
+                """
+                Return the variable object for variable_number, or default if not found
                 """
-                return self.all
+                self._load_if_deferred()
+                return self._by_number.get(variable_number, default)
             
             def add_variable_to_list(self, variable_dict:dict={}):
                 """
-                Add dictionary representation of a WT variable to variable_list.all
+                Add dictionary representation of a WT variable to variable_list.all.  The dictionary is used as is (not
+                copied), so pass a fresh payload such as an API response
 
-                Note: if variable_number exists in variables_list.all, it is removed and replaced with the new information
+                Note: if variable_number exists in variables_list.all, it is replaced with the new information (keeping its position)
                 """
                 if variable_dict=={}:
                     warnings.warn(f'variable_dict is empty!')
                     return
-                vari_json = json.loads(json.dumps(variable_dict))
-                self.remove_variable_from_list(vari_json['number'])
-                self.all.append(self.vari_obj(vari_json, self._endpts))
+                self._by_number[variable_dict['number']] = self.vari_obj(variable_dict, self._endpts)
                 return
             
             def remove_variable_from_list(self, variable_number:str):
                 """
                 Removes variable from variables_list.all list by given variable number
                 """
-                for i in range(len(self.all)):
-                    if self.all[i].number == variable_number:
-                        del self.all[i]
-                        return
+                self._by_number.pop(variable_number, None)
                 return
 
-            class vari_obj(object):
-                
+            class vari_obj(slot_obj):
+                FIELDS = ('number', 'name', 'bot', 'value', 'free_text_value', 'last_updated_at', 'conditions')
+                DEFAULTS = {'number': '', 'name': '', 'bot': '', 'value': '', 'free_text_value': '',
+                            'last_updated_at': '', 'conditions': []}
+                __slots__ = FIELDS + ('_endpts',)
+
                 def __init__(self, vari_dict, endpts):
-                    self.number = ''
-                    self.name = ''
-                    self.bot = ''
-                    self.value= ''
-                    self.free_text_value = ''
-                    self.last_updated_at = ''
-                    self.conditions = []
                     self._endpts = endpts
-                    self.__vari_dict_to_attr(vari_dict)
-            
-                def __str__(self):
-                    attrs = vars(self)
-                    test = [f'{item[0]}: {str(item[1])}' for item in attrs.items()]
-                    return "\n".join(test)
-                
-                def __repr__(self):
-                    return self.__str__()
-                
-                def __vari_dict_to_attr(self, vari_dict):
-                    for key in vari_dict: 
-                        setattr(self, key, vari_dict[key])
+                    super().__init__(vari_dict)
                 
                 def update(self):
                     """
                     Query WhisperTrades.com for bot information and update object with new information 
                     """
                     vari_dict = self._endpts.variables.get_bot_variables(variable_number = self.number)
-                    self.__vari_dict_to_attr(json.loads(json.dumps(vari_dict)))
+                    self._set_fields(vari_dict)
                     return
                 
                 def set(self, new_value:str='') -> json:
@@ -122,9 +174,77 @@ class WhisperTradesVariables(object):
                     :type return: json
                     """
                     vari_dict = self._endpts.variables.set_bot_variables(variable_number=self.number, variable_name=self.name, new_value=new_value)
-                    self.__vari_dict_to_attr(json.loads(json.dumps(vari_dict)))
+                    self._set_fields(vari_dict)
                     return vari_dict
 
 
 
-        
\ No newline at end of file
+class WhisperTradesVariableIndex(object):
+    """
+    Two-way index between bots and the variables they use.  Rebuilt in one linear pass per refresh and shared by
+    WhisperTradesBots (which refreshes the bot side) and WhisperTradesVariables (which refreshes the variables).
+
+    Attributes:
+        variables (dict): variable number -> latest variable json
+    """
+    def __init__(self) -> None:
+        self.variables: dict = {}
+        self._bots_by_variable: dict = {}
+        self._variables_by_bot: dict = {}
+
+    def rebuild(self, all_variables: list, bots: list) -> None:
+        """
+        Rebuild the index from all variables and the bot objects (whose .variables list variable numbers)
+
+        :param all_variables: json list of all variables from WhisperTrades API
+        :type all_variables: List
+        :param bots: bot objects
+        :type bots: List
+        """
+        self.update_variables(all_variables)
+        self.update_bots(bots)
+        return
+
+    def update_variables(self, all_variables: list) -> None:
+        """
+        Replace the indexed variables
+
+        :param all_variables: json list of all variables from WhisperTrades API
+        :type all_variables: List
+        """
+        self.variables = {var['number']: var for var in all_variables}
+        return
+
+    def update_bots(self, bots: list) -> None:
+        """
+        Rebuild the bot/variable mapping from the bot objects (whose .variables list variable numbers)
+
+        :param bots: bot objects
+        :type bots: List
+        """
+        self._bots_by_variable = {}
+        self._variables_by_bot = {}
+        for bot in bots:
+            var_numbers = [bot_var['number'] for bot_var in bot.variables]
+            self._variables_by_bot[bot.number] = var_numbers
+            for var_number in var_numbers:
+                self._bots_by_variable.setdefault(var_number, []).append(bot.number)
+        return
+
+    def variable(self, variable_number: str):
+        """
+        Return the latest json of the variable, or None if unknown
+        """
+        return self.variables.get(variable_number)
+
+    def bots_for_variable(self, variable_number: str) -> list:
+        """
+        Return the numbers of all bots that use the variable
+        """
+        return list(self._bots_by_variable.get(variable_number, []))
+
+    def variables_for_bot(self, bot_number: str) -> list:
+        """
+        Return the numbers of all variables used by the bot
+        """
+        return list(self._variables_by_bot.get(bot_number, []))
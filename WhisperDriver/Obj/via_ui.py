@@ -1347,16 +1347,21 @@ class SeleniumDriver:
         return self.__get_url_and_wait(url)
 
     @_require_enabled
-    def enabled_to_soft_disabled_by_list(self, bot_num_lst: list[str]) -> None:
+    def enabled_to_soft_disabled_by_list(self, bot_num_lst: list[str]) -> list[str]:
         """
         Bot status change: 'Enabled' to 'Disabled on Close'
         :param bot_num_lst: List of WhisperTrades bot Numbers
         :type url: list
+        :return: bot numbers that were disabled on close
+        :rtype: list
         """
+        changed = []
         for b in bot_num_lst:
-            if not self.disable_on_close_by_bot_num(b):
+            if self.disable_on_close_by_bot_num(b):
+                changed.append(b)
+            else:
                 warnings.warn(f'UNABLE TO "DISABLE ON CLOSE" BOT_NUM {b}')
-        return
+        return changed
 
     @_require_enabled
     def enabled_to_forced_disabled_by_list(self, bot_num_lst: list[str]) -> None:
@@ -18,6 +18,9 @@
 
 from . import Obj
 import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from typing import List, Optional
 
 class ApiWrapper:
@@ -30,30 +33,61 @@ class ApiWrapper:
         scheduler: Scheduler for timed tasks.
         bots: Bot management interface.
         variables: Variable management interface.
+        variable_index: Two-way bot/variable index shared by bots and variables.
+        store: On-disk snapshot store of bots, positions, reports and variables (None if no snapshot_path).
         via_selenium: Selenium-based UI automation interface.
         bot_number_list: List of all bot numbers.
         report_number_list: List of all report numbers.
         variable_number_list: List of all variable numbers.
     """
-    def __init__(self, token: str):
+    def __init__(self, token: str, pool_size: int = 10, lazy: bool = False, snapshot_path: Optional[str] = None,
+                 snapshot_ttl_sec: float = 300, job_store_path: Optional[str] = None):
         """
         Initialize the API wrapper with a WhisperTrades API token.
 
         Args:
             token (str): WhisperTrades.com API token.
+            pool_size (int): Number of keep-alive connections pooled for API requests. Default is 10.
+            lazy (bool): Skip populating at instantiation. Bots, variables and number lists are queried on first
+                access and then cached. Default is False.
+            snapshot_path (Optional[str]): SQLite file to warm-start from and write refreshed data back to. Default
+                is None (no snapshot).
+            snapshot_ttl_sec (float): Maximum age in seconds of snapshot data used instead of querying the API.
+                Default is 300.
+            job_store_path (Optional[str]): SQLite file persisting scheduled bot actions.  Jobs saved by a previous
+                process are restored (and the scheduler started) at instantiation. Default is None (in memory only).
         """
         self.throttle = Obj.WhisperTradesThrottle()
         self.throttle.disable()
-        self.endpts = Obj.WhisperTradesEndpoints(token, self.throttle)
+        self.endpts = Obj.WhisperTradesEndpoints(token, self.throttle, pool_size=pool_size)
         self.scheduler = Obj.WhisperTradesScheduler(self.endpts)
-        self.bots = Obj.WhisperTradesBots(self.scheduler)
-        self.variables = Obj.WhisperTradesVariables(self.endpts)
+        self.variable_index = Obj.WhisperTradesVariableIndex()
+        self.bots = Obj.WhisperTradesBots(self.scheduler, variable_index=self.variable_index)
+        self.variables = Obj.WhisperTradesVariables(self.endpts, populate=False, variable_index=self.variable_index)
         self.via_selenium = Obj.SeleniumDriver(self.endpts)
-        self.bot_number_list: List[str] = []
-        self.report_number_list: List[str] = []
-        self.variable_number_list: List[str] = []
-        self.__populate()
+        # Scheduled enables/disables due at the same time run as one bulk operation (and soft disables as one pass of
+        # the web driver).  Cached statuses may be stale by the time a job fires, so no bot is skipped on them.
+        self.scheduler.register_batch('enable', partial(self.bots.enable_many, skip_current=False))
+        self.scheduler.register_batch('disable', partial(self.bots.disable_many, skip_current=False))
+        self.scheduler.register_batch('soft_disable', self.soft_disable_many)
+        self.store = Obj.WhisperTradesSnapshotStore(snapshot_path) if snapshot_path else None
+        self.snapshot_ttl_sec = snapshot_ttl_sec
+        self._bot_number_list: Optional[List[str]] = None
+        self._report_number_list: Optional[List[str]] = None
+        self._variable_number_list: Optional[List[str]] = None
+        if lazy and self.store is not None:
+            self.bots.bots_list._loader = self.__load_bots
+            self.variables.variables_list._loader = self.__load_variables
+        elif lazy:
+            self.bots.defer_update_all_bots()
+            self.variables.defer_update_all_variables()
+        else:
+            self.__populate()
         self.throttle.enable()
+        if job_store_path:
+            self.scheduler.job_store = Obj.WhisperTradesJobStore(job_store_path)
+            if self.scheduler.restore():
+                self.scheduler.start()
 
     def __del__(self):
         """
@@ -63,37 +97,165 @@ class ApiWrapper:
             time.sleep(1)
         return
 
+    @property
+    def bot_number_list(self) -> List[str]:
+        if self._bot_number_list is None:
+            self._bot_number_list = [i.number for i in self.bots.bots_list.all]
+        return self._bot_number_list
+
+    @bot_number_list.setter
+    def bot_number_list(self, numbers: List[str]) -> None:
+        self._bot_number_list = numbers
+
+    @property
+    def report_number_list(self) -> List[str]:
+        if self._report_number_list is None:
+            reports_json = self.__snapshot('reports')
+            if reports_json is None:
+                self.update_all_reports_list()
+            else:
+                self._report_number_list = [i['number'] for i in reports_json]
+        return self._report_number_list
+
+    @report_number_list.setter
+    def report_number_list(self, numbers: List[str]) -> None:
+        self._report_number_list = numbers
+
+    @property
+    def variable_number_list(self) -> List[str]:
+        if self._variable_number_list is None:
+            self._variable_number_list = [i.number for i in self.variables.variables_list.all]
+        return self._variable_number_list
+
+    @variable_number_list.setter
+    def variable_number_list(self, numbers: List[str]) -> None:
+        self._variable_number_list = numbers
+
     def __populate(self) -> None:
         """
-        Populate all bot, report, and variable lists from the API.
+        Populate all bot, report, and variable lists from the snapshot store (if fresh) or the API.  The independent
+        queries (bots, positions, reports, variables) are issued concurrently, so population costs roughly one round
+        trip.  A fully fresh snapshot costs no API requests.
         """
-        self.update_all_bots_list()
-        self.update_all_reports_list()
-        self.update_all_variables_list()
+        bots_json, positions_json = self.__snapshot('bots'), self.__snapshot('positions')
+        if bots_json is None or positions_json is None:
+            bots_json = positions_json = None
+        reports_json, variables_json = self.__snapshot('reports'), self.__snapshot('variables')
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            if bots_json is None:
+                bots = pool.submit(self.endpts.bots.get_all_bots)
+                positions = pool.submit(lambda: list(self.endpts.bots.iter_bot_positions()))
+            if reports_json is None:
+                reports = pool.submit(self.endpts.reports.get_all_bot_reports)
+            if variables_json is None:
+                variables = pool.submit(self.endpts.variables.get_all_bot_variables)
+        if bots_json is None:
+            # A failed positions query is retried (and handled) by update_positions_all_bots
+            self.update_all_bots_list(bots.result(), positions.result() if positions.exception() is None else None)
+        else:
+            self.bots.update_all_bots(bots_json, positions_json)
+        if reports_json is None:
+            self.update_all_reports_list(reports.result())
+        else:
+            self.report_number_list = [i['number'] for i in reports_json]
+        if variables_json is None:
+            self.update_all_variables_list(variables.result())
+        else:
+            self.variables.update_all_variables(variables_json)
         return
 
-    def update_all_bots_list(self) -> None:
+    def __snapshot(self, kind: str) -> Optional[list]:
+        """
+        Records of kind from the snapshot store if it holds data younger than snapshot_ttl_sec, otherwise None.
+        """
+        if self.store is None:
+            return None
+        return self.store.load(kind, self.snapshot_ttl_sec)
+
+    def __load_bots(self) -> None:
+        bots_json, positions_json = self.__snapshot('bots'), self.__snapshot('positions')
+        if bots_json is None or positions_json is None:
+            self.update_all_bots_list()
+        else:
+            self.bots.update_all_bots(bots_json, positions_json)
+        return
+
+    def __load_variables(self) -> None:
+        variables_json = self.__snapshot('variables')
+        if variables_json is None:
+            self.update_all_variables_list()
+        else:
+            self.variables.update_all_variables(variables_json)
+        return
+
+    def update_all_bots_list(self, bots_json: Optional[list] = None, positions_json: Optional[list] = None) -> None:
         """
         Update the list of bot numbers via the WhisperTrades API.
+
+        Args:
+            bots_json (Optional[list]): Already fetched response of get_all_bots(). Default queries the API.
+            positions_json (Optional[list]): Already fetched positions (all pages). Default queries the API.
         """
-        self.bots.update_all_bots()
+        changes = self.bots.update_all_bots(bots_json, positions_json)
         self.bot_number_list = [i.number for i in self.bots.bots_list.all]
+        if self.store is not None:
+            # Incremental write-back: only changed bots and the positions of bots whose positions changed.  New bots
+            # (e.g. the first load of a process) are diffed against the snapshot instead of rewriting it.
+            bots_list = self.bots.bots_list
+            if changes['added']:
+                self.store.sync('bots', bots_list.all)
+            else:
+                self.store.upsert('bots', [bots_list.get(n) for n in changes['changed_fields']], removed=changes['removed'])
+            groups = {n: bots_list.position_sync.positions_for_bot(n) for n in changes['positions_changed']}
+            groups.update({n: [] for n in changes['removed']})
+            self.store.replace_group('positions', groups)
         return
 
-    def update_all_reports_list(self) -> None:
+    def update_all_reports_list(self, reports_json: Optional[list] = None) -> None:
         """
         Update the list of report numbers via the WhisperTrades API.
+
+        Args:
+            reports_json (Optional[list]): Already fetched response of get_all_bot_reports(). Default queries the API.
         """
-        self.report_number_list = [i['number'] for i in self.endpts.reports.get_all_bot_reports()]
+        if reports_json is None:
+            reports_json = self.endpts.reports.get_all_bot_reports()
+        self.report_number_list = [i['number'] for i in reports_json]
+        if self.store is not None:
+            self.store.sync('reports', reports_json)
         return
 
-    def update_all_variables_list(self) -> None:
+    def update_all_variables_list(self, variables_json: Optional[list] = None) -> None:
         """
-        Update the list of variable numbers via the WhisperTrades API.
+        Update the variable objects and the list of variable numbers via the WhisperTrades API.
+
+        Args:
+            variables_json (Optional[list]): Already fetched response of get_all_bot_variables(). Default queries the API.
         """
-        self.variable_number_list = [i['number'] for i in self.endpts.variables.get_all_bot_variables()]
+        self.variables.update_all_variables(variables_json)
+        self.variable_number_list = [i.number for i in self.variables.variables_list.all]
+        if self.store is not None:
+            self.store.sync('variables', self.variables.variables_list.all)
         return
 
+    def soft_disable_many(self, bot_numbers: List[str]) -> dict:
+        """
+        Disable bots on close through the web driver (one pass) and record the new status on the bot objects.
+        Batch handler of scheduled 'soft_disable' jobs.
+
+        Args:
+            bot_numbers (List[str]): WhisperTrades bot numbers.
+
+        Returns:
+            dict: bot number -> True if the bot was disabled on close, False otherwise.
+        """
+        changed = set(self.via_selenium.enabled_to_soft_disabled_by_list(bot_numbers))
+        for number in changed:
+            bot = self.bots.bots_list.get(number)
+            if bot is not None:
+                bot.status = 'Disable on Close'
+        return {number: number in changed for number in bot_numbers}
+
     def start_scheduler(self) -> None:
         """
         Start the scheduler loop in a unique thread. Thread automatically started at instantiation.
@@ -146,3 +308,99 @@ class ApiWrapper:
         self.scheduler.stop_scheduler_at_time(time_str, tz_str)
         return
 
+
+class AsyncApiWrapper:
+    """
+    Asyncio interface for interacting with the WhisperTrades.com API.
+
+    Construct with `WD = await AsyncApiWrapper.create(token)` to populate the number lists.  Independent refreshes
+    run concurrently over one pooled session and one throttle (which may be shared with a synchronous ApiWrapper).
+
+    Only the bot, report and variable number lists are kept: there are no bot or variable objects (WD.bots,
+    WD.variables), scheduler or web driver.  Query details through endpts, or use ApiWrapper for the object model.
+
+    Attributes:
+        throttle: API rate limiter.
+        endpts: Async endpoint handler for all API endpoints.
+        bot_number_list: List of all bot numbers.
+        report_number_list: List of all report numbers.
+        variable_number_list: List of all variable numbers.
+    """
+    def __init__(self, token: str, throttle: Optional[object] = None, pool_size: int = 10):
+        """
+        Initialize the async API wrapper without contacting the API.
+
+        Args:
+            token (str): WhisperTrades.com API token.
+            throttle (Optional[object]): Existing throttle to share. Default creates a new one.
+            pool_size (int): Number of keep-alive connections pooled for API requests. Default is 10.
+        """
+        self.throttle = throttle if throttle is not None else Obj.WhisperTradesThrottle()
+        self.endpts = Obj.AsyncWhisperTradesEndpoints(token, self.throttle, pool_size=pool_size)
+        self.bot_number_list: List[str] = []
+        self.report_number_list: List[str] = []
+        self.variable_number_list: List[str] = []
+
+    @classmethod
+    async def create(cls, token: str, throttle: Optional[object] = None, pool_size: int = 10) -> 'AsyncApiWrapper':
+        """
+        Create the async API wrapper and populate all bot, report, and variable lists concurrently.  A throttle
+        created here is disabled while populating; a shared throttle keeps pacing (other users may rely on it).
+
+        Args:
+            token (str): WhisperTrades.com API token.
+            throttle (Optional[object]): Existing throttle to share. Default creates a new one.
+            pool_size (int): Number of keep-alive connections pooled for API requests. Default is 10.
+        """
+        self = cls(token, throttle, pool_size)
+        if throttle is not None:
+            await self.populate()
+            return self
+        self.throttle.disable()
+        try:
+            await self.populate()
+        finally:
+            self.throttle.enable()
+        return self
+
+    async def __aenter__(self) -> 'AsyncApiWrapper':
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.close()
+        return
+
+    async def close(self) -> None:
+        """
+        Close the pooled connections of the async session.
+        """
+        await self.endpts.close()
+        return
+
+    async def populate(self) -> None:
+        """
+        Populate all bot, report, and variable lists from the API concurrently.
+        """
+        await asyncio.gather(self.update_all_bots_list(), self.update_all_reports_list(), self.update_all_variables_list())
+        return
+
+    async def update_all_bots_list(self) -> None:
+        """
+        Update the list of bot numbers via the WhisperTrades API.
+        """
+        self.bot_number_list = [i['number'] for i in await self.endpts.bots.get_all_bots()]
+        return
+
+    async def update_all_reports_list(self) -> None:
+        """
+        Update the list of report numbers via the WhisperTrades API.
+        """
+        self.report_number_list = [i['number'] for i in await self.endpts.reports.get_all_bot_reports()]
+        return
+
+    async def update_all_variables_list(self) -> None:
+        """
+        Update the list of variable numbers via the WhisperTrades API.
+        """
+        self.variable_number_list = [i['number'] for i in await self.endpts.variables.get_all_bot_variables()]
+        return
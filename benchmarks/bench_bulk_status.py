@@ -0,0 +1,44 @@
+# Benchmark: enabling a list of bots one by one (bot.enable()) vs. WD.bots.enable_many() with a bounded worker pool,
+# against a local stub server.  Both pass every PUT through the same throttle
+# Usage: python benchmarks/bench_bulk_status.py [n_bots] [latency_ms] [throttle_ms] [max_workers]
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from WhisperDriver.wrapper import ApiWrapper
+from stub_server import StubServer, endpoints_pointed_at, synthetic_account, synthetic_bot
+
+
+def run_main(n_bots=50, latency_ms=200, throttle_ms=50, max_workers=8):
+    routes = synthetic_account(n_bots)
+    routes['bots/'] = [synthetic_bot(i, status='Disabled') for i in range(n_bots)]
+    with StubServer(routes, latency_sec=latency_ms / 1e3) as stub, endpoints_pointed_at(stub.url):
+        WD = ApiWrapper('benchmark-token')
+        WD.throttle.set_delay_sec(throttle_ms / 1e3)
+        numbers = [bot.number for bot in WD.bots.bots_list.all]
+
+        t0 = time.perf_counter()
+        for n in numbers:
+            WD.bots(n).enable()
+        serial = time.perf_counter() - t0
+
+        for bot in WD.bots.bots_list.all:
+            bot.status = 'Disabled'
+        t0 = time.perf_counter()
+        report = WD.bots.enable_many(numbers, max_workers=max_workers)
+        pooled = time.perf_counter() - t0
+        changed = sum(r['result'] == 'changed' for r in report.values())
+        slowest = max(r['queued_sec'] + r['elapsed_sec'] for r in report.values())
+
+        t0 = time.perf_counter()
+        skipped = WD.bots.enable_many(numbers, max_workers=max_workers)
+        noop = time.perf_counter() - t0
+        print(f"serial bot.enable()    {serial:8.2f} s  ({n_bots} bots, {latency_ms} ms latency, {throttle_ms} ms throttle)")
+        print(f"enable_many({max_workers} workers) {pooled:8.2f} s  ({changed} changed, slowest bot done after {slowest:.2f} s)")
+        print(f"enable_many again      {noop * 1e3:8.2f} ms ({sum(r['result'] == 'skipped' for r in skipped.values())} skipped)")
+        WD.endpts.close()
+
+
+if __name__ == '__main__':
+    run_main(*(int(a) for a in sys.argv[1:5]))
@@ -0,0 +1,37 @@
+# Benchmark: ApiWrapper cold-start time, eager vs. lazy construction vs. warm start from a snapshot store, against a
+# local stub server
+# Usage: python benchmarks/bench_cold_start.py [n_bots] [latency_ms]
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from WhisperDriver.wrapper import ApiWrapper
+from stub_server import StubServer, endpoints_pointed_at, synthetic_account
+
+
+def run_main(n_bots=500, latency_ms=50):
+    routes = synthetic_account(n_bots)
+    routes['bots/variables/VAR0001'] = dict(routes['bots/variables/'][1], value='flipped')
+    snapshot_path = os.path.join(tempfile.mkdtemp(), 'snapshot.db')
+    with StubServer(routes, latency_sec=latency_ms / 1e3) as stub, endpoints_pointed_at(stub.url):
+        # Write the snapshot the warm start reads (as a previous run of the process would have)
+        ApiWrapper('benchmark-token', snapshot_path=snapshot_path).store.close()
+        for mode in ('eager', 'lazy', 'snapshot'):
+            start_requests = stub.request_count
+            t0 = time.perf_counter()
+            WD = ApiWrapper('benchmark-token', lazy=mode == 'lazy', snapshot_path=snapshot_path if mode == 'snapshot' else None)
+            constructed = time.perf_counter() - t0
+            construct_requests = stub.request_count - start_requests
+            # Typical cron job: flip one variable and exit
+            WD.throttle.disable()
+            WD.variables('VAR0001').set('flipped')
+            total = time.perf_counter() - t0
+            print(f"{mode:<8} construct={constructed * 1e3:8.2f} ms ({construct_requests} requests)  "
+                  f"construct+set variable={total * 1e3:8.2f} ms ({stub.request_count - start_requests} requests)")
+            WD.endpts.close()
+
+
+if __name__ == '__main__':
+    run_main(*(int(a) for a in sys.argv[1:3]))
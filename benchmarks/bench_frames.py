@@ -0,0 +1,68 @@
+# Benchmark: P&L per bot and open risk per symbol over 100k positions
+#   legacy: Python loops over position dictionaries
+#   current: columnar frame build (WhisperTradesBots.positions_frame) plus vectorised pandas aggregations, timed end to
+#            end (rollups building their own frame) and with a reused full frame
+# Usage: python benchmarks/bench_frames.py [n_positions] [n_bots] [repeats]
+import os
+import sys
+import time
+import types
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from WhisperDriver.Obj.bots import WhisperTradesBots
+from WhisperDriver.Obj.frames import positions_frame
+from stub_server import synthetic_bot
+
+SYMBOLS = ('SPX', 'QQQ', 'IWM', 'RUT', 'XSP')
+
+
+def synthetic_positions(n_positions, bot_numbers):
+    return [{'number': f'POS{i:07d}', 'bot': {'number': bot_numbers[i % len(bot_numbers)], 'name': f'Bot {i % len(bot_numbers)}'},
+             'status': 'OPEN' if i % 7 == 0 else 'CLOSED', 'symbol': SYMBOLS[i % len(SYMBOLS)],
+             'entered_at': f'2024-{1 + i % 12:02d}-{1 + i % 28:02d}T14:30:00.000000Z', 'quantity': 1 + i % 5,
+             'profit': round((i % 200 - 90) * 1.25, 2), 'max_risk': float(500 + i % 1000)} for i in range(n_positions)]
+
+
+def legacy_rollups(bots):
+    pnl, risk = {}, {}
+    for bot in bots:
+        for pos in bot.positions:
+            row = pnl.setdefault(pos['bot']['number'], {'realized': 0.0, 'unrealized': 0.0, 'total': 0.0})
+            profit = float(pos.get('profit') or 0.0)
+            row['unrealized' if pos['status'] == 'OPEN' else 'realized'] += profit
+            row['total'] += profit
+            if pos['status'] == 'OPEN':
+                risk[pos['symbol']] = risk.get(pos['symbol'], 0.0) + float(pos.get('max_risk') or 0.0)
+    return pnl, risk
+
+
+def best_of(fxn, repeats):
+    best = None
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        result = fxn()
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def run_main(n_positions=100000, n_bots=200, repeats=3):
+    bots = WhisperTradesBots(types.SimpleNamespace(_endpts=None))
+    bots.bots_list.sync_bots([synthetic_bot(i) for i in range(n_bots)])
+    numbers = [bot.number for bot in bots.bots_list.all]
+    bots.bots_list.update_positions_all_bots(synthetic_positions(n_positions, numbers))
+    positions_frame([])  # import pandas outside the timed sections
+    legacy, _ = best_of(lambda: legacy_rollups(bots.bots_list.all), repeats)
+    end_to_end, _ = best_of(lambda: (bots.pnl_by_bot(), bots.open_risk_by_symbol()), repeats)
+    built, frame = best_of(bots.positions_frame, repeats)
+    aggregated, _ = best_of(lambda: (bots.pnl_by_bot(frame), bots.open_risk_by_symbol(frame)), repeats)
+    print(f"{n_positions} positions over {n_bots} bots (best of {repeats})")
+    print(f"legacy  dict-loop rollups:                 {legacy * 1e3:8.2f} ms")
+    print(f"current rollups, frame=None (build+rollup): {end_to_end * 1e3:8.2f} ms  ({legacy / end_to_end:.2f}x vs legacy)")
+    print(f"current full frame build + rollups:         {(built + aggregated) * 1e3:8.2f} ms  ({legacy / (built + aggregated):.2f}x vs legacy, "
+          f"build {built * 1e3:.2f} ms, {frame.memory_usage(deep=True).sum() / 2**20:.1f} MiB)")
+    print(f"current rollups on a built frame:           {aggregated * 1e3:8.2f} ms")
+
+
+if __name__ == '__main__':
+    run_main(*(int(a) for a in sys.argv[1:4]))
@@ -0,0 +1,51 @@
+# Microbenchmark: cost to ingest 1k bots from raw response bytes into bot objects
+#   legacy: json.loads(response.text) + json.loads(json.dumps(bot)) defensive copy per bot
+#   current: one parse of the response bytes (orjson when installed) handed to bot_obj without copies
+# Usage: python benchmarks/bench_ingest.py [n_bots] [repeats]
+import os
+import sys
+import json
+import time
+import types
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from WhisperDriver.Obj.bots import WhisperTradesBots
+from WhisperDriver.Obj.endpoints import json_loads
+from stub_server import synthetic_bot
+
+
+def legacy_ingest(body: bytes, bots: WhisperTradesBots):
+    bots_json = json.loads(body.decode('utf-8'))['data']
+    bots.bots_list.all = []
+    for bot_dict in bots_json:
+        bots.bots_list.add_bot_to_list(json.loads(json.dumps(bot_dict)))
+
+
+def current_ingest(body: bytes, bots: WhisperTradesBots):
+    bots_json = json_loads(body)['data']
+    bots.bots_list.all = []
+    bots.bots_list.sync_bots(bots_json)
+
+
+def best_of(fxn, repeats):
+    best = float('inf')
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fxn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def run_main(n_bots=1000, repeats=20):
+    body = json.dumps({'data': [synthetic_bot(i) for i in range(n_bots)]}).encode()
+    bots = WhisperTradesBots(types.SimpleNamespace(_endpts=None))
+    legacy = best_of(lambda: legacy_ingest(body, bots), repeats)
+    current = best_of(lambda: current_ingest(body, bots), repeats)
+    per_1k = 1000 / n_bots
+    print(f"JSON backend: {json_loads.__module__}")
+    print(f"legacy  ingest: {legacy * per_1k * 1e3:8.2f} ms per 1k bots")
+    print(f"current ingest: {current * per_1k * 1e3:8.2f} ms per 1k bots  ({legacy / current:.2f}x faster)")
+
+
+if __name__ == '__main__':
+    run_main(*(int(a) for a in sys.argv[1:3]))
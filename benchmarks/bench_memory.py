@@ -0,0 +1,67 @@
+# Benchmark: resident memory of bot objects, legacy __dict__ objects vs. __slots__ models
+#   legacy: replica of the previous bot_obj (one __dict__ per bot, every default field allocated)
+#   current: bot_obj backed by __slots__, unknown payload keys in a lazily created overflow dict
+# Usage: python benchmarks/bench_memory.py [n_bots]
+import os
+import sys
+import json
+import types
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from WhisperDriver.Obj.bots import WhisperTradesBots
+from stub_server import synthetic_bot
+
+
+class legacy_bot_obj(object):
+
+    def __init__(self, bot_dict, scheduler):
+        self._status = ''
+        self.number = ''
+        self.name = ''
+        self.broker_connection = {}
+        self.is_paper = False
+        self.can_enable = True
+        self.can_disable = True
+        self.symbol = ''
+        self.type = ''
+        self.notes = ''
+        self.last_active_at = ''
+        self.disabled_at = ''
+        self.entry_condition = {}
+        self.exit_condition = {}
+        self.adjustments = []
+        self.notifications = []
+        self.variables = []
+        self.positions = []
+        self._bot_list = None
+        self._scheduler = scheduler
+        self._endpts = scheduler._endpts
+        for key in bot_dict:
+            setattr(self, key, bot_dict[key])
+
+
+def measure(build, payloads):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objs = build(payloads)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / len(objs), objs
+
+
+def run_main(n_bots=5000):
+    body = json.dumps([synthetic_bot(i) for i in range(n_bots)])
+    scheduler = types.SimpleNamespace(_endpts=None)
+    bots = WhisperTradesBots(scheduler)
+    # Each run gets its own parse of the payload so both sides pay for the same dictionaries
+    legacy, _ = measure(lambda p: [legacy_bot_obj(b, scheduler) for b in p], json.loads(body))
+    bot_list = bots.bots_list
+    current, _ = measure(lambda p: [bot_list.bot_obj(b, bot_list) for b in p], json.loads(body))
+    print(f"legacy  bot_obj: {legacy:8.0f} bytes per bot ({legacy * n_bots / 2**20:6.2f} MiB for {n_bots} bots)")
+    print(f"current bot_obj: {current:8.0f} bytes per bot ({current * n_bots / 2**20:6.2f} MiB for {n_bots} bots)"
+          f"  ({1 - current / legacy:.0%} less)")
+
+
+if __name__ == '__main__':
+    run_main(*(int(a) for a in sys.argv[1:2]))
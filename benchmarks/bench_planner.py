@@ -0,0 +1,69 @@
+# Benchmark: building and scheduling the day's entry-window plan for 1k bots, per-bot loop as in example.py
+# (strptime + enable_at_time/disable_at_time per bot) vs. WD.bots.plan_entry_windows()/schedule_entry_windows()
+# Usage: python benchmarks/bench_planner.py [n_bots] [repeats]
+import os
+import sys
+import time
+import datetime
+from datetime import timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from WhisperDriver.wrapper import ApiWrapper
+from stub_server import StubServer, endpoints_pointed_at, synthetic_account
+
+
+def loop_plan(bots, exclude):
+    """
+    Per-bot planning as done in example.py (without scheduling)
+    """
+    today = datetime.datetime.now().date()
+    plan = []
+    for bot in bots:
+        if bot.number in exclude:
+            continue
+        earliest = bot.entry_condition.get('earliest_time_of_day')
+        latest = bot.entry_condition.get('latest_time_of_day')
+        if not earliest or not latest:
+            continue
+        earliest_dt = datetime.datetime.strptime(f"{today} {earliest}", "%Y-%m-%d %I:%M %p")
+        latest_dt = datetime.datetime.strptime(f"{today} {latest}", "%Y-%m-%d %I:%M %p")
+        plan.append((bot, (earliest_dt - timedelta(minutes=5)).strftime("%I:%M %p"),
+                     (latest_dt + timedelta(minutes=5)).strftime("%I:%M %p")))
+    return plan
+
+
+def best_of(fxn, repeats):
+    timings = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        result = fxn()
+        timings.append(time.perf_counter() - t0)
+    return min(timings), result
+
+
+def run_main(n_bots=1000, repeats=5):
+    routes = synthetic_account(n_bots)
+    with StubServer(routes) as stub, endpoints_pointed_at(stub.url):
+        WD = ApiWrapper('benchmark-token')
+        bots = WD.bots.bots_list.all
+        exclude = {bots[0].number, bots[1].number}
+
+        loop_build, plan = best_of(lambda: loop_plan(bots, exclude), repeats)
+        vector_build, frame = best_of(lambda: WD.bots.plan_entry_windows(exclude=exclude, disable_kind='disable'), repeats)
+
+        def loop_schedule():
+            for bot, enable_time, disable_time in plan:
+                bot.enable_at_time(enable_time, 'America/New_York')
+                bot.disable_at_time(disable_time, 'America/New_York')
+        loop_register, _ = best_of(loop_schedule, repeats)
+        vector_register, jobs = best_of(lambda: WD.bots.schedule_entry_windows(frame), repeats)
+        WD.scheduler.stop()
+
+        print(f"{n_bots} bots: {len(frame)} time buckets, {len(jobs)} jobs")
+        print(f"example.py loop    build {loop_build * 1e3:8.2f} ms   schedule {loop_register * 1e3:8.2f} ms")
+        print(f"entry-window plan  build {vector_build * 1e3:8.2f} ms   schedule {vector_register * 1e3:8.2f} ms")
+        WD.endpts.close()
+
+
+if __name__ == '__main__':
+    run_main(*(int(a) for a in sys.argv[1:3]))
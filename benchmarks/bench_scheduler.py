@@ -0,0 +1,57 @@
+# Benchmark: lateness of 40 bot enables scheduled for the same instant, run inline on one scheduler thread
+# (max_workers=1) vs. dispatched to the scheduler's worker pool vs. coalesced into one enable_many() batch, against a
+# local stub server
+# Usage: python benchmarks/bench_scheduler.py [n_bots] [latency_ms] [throttle_ms] [max_workers]
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from WhisperDriver import Obj
+from WhisperDriver.wrapper import ApiWrapper
+from stub_server import StubServer, endpoints_pointed_at, synthetic_account, synthetic_bot
+
+
+class at_time(object):
+    """
+    Trigger firing once at a unix time
+    """
+    def __init__(self, fire_at):
+        self.fire_at = fire_at
+
+    def next_fire(self, after):
+        return self.fire_at if self.fire_at > after else None
+
+
+def run_main(n_bots=40, latency_ms=200, throttle_ms=50, max_workers=8):
+    routes = synthetic_account(n_bots)
+    routes['bots/'] = [synthetic_bot(i, status='Disabled') for i in range(n_bots)]
+    with StubServer(routes, latency_sec=latency_ms / 1e3) as stub, endpoints_pointed_at(stub.url):
+        WD = ApiWrapper('benchmark-token')
+        WD.throttle.set_delay_sec(throttle_ms / 1e3)
+        for mode, workers in (('inline', 1), ('pool', max_workers), ('batch', max_workers)):
+            for bot in WD.bots.bots_list.all:
+                bot.status = 'Disabled'
+            scheduler = Obj.WhisperTradesScheduler(WD.endpts, max_workers=workers)
+            scheduler.register_batch('enable', WD.bots.enable_many)
+            fire_at = time.time() + 0.5
+            for bot in WD.bots.bots_list.all:
+                scheduler.add_job(at_time(fire_at), bot.enable, kind='enable' if mode == 'batch' else None, target=bot.number)
+            scheduler.start()
+            runs = 1 if mode == 'batch' else n_bots
+            while len(scheduler.history) < runs:
+                time.sleep(0.05)
+            scheduler.stop()
+            if mode == 'batch':
+                report = scheduler.history[0]['result']
+                lateness = [r['queued_sec'] + scheduler.history[0]['lateness_sec'] for r in report.values()]
+            else:
+                lateness = [run['lateness_sec'] for run in scheduler.history]
+            last_done = max(run['finished_at'] for run in scheduler.history) - fire_at
+            print(f"{mode:<6} max_workers={workers:<3} {runs:>3} runs  start lateness mean={sum(lateness) / len(lateness) * 1e3:8.1f} ms  "
+                  f"max={max(lateness) * 1e3:8.1f} ms  last enable done after {last_done:6.2f} s")
+        WD.endpts.close()
+
+
+if __name__ == '__main__':
+    run_main(*(int(a) for a in sys.argv[1:5]))
@@ -0,0 +1,52 @@
+# Benchmark: per-call latency of pooled keep-alive session vs. a new connection per request (module-level requests.request)
+# Usage: python benchmarks/bench_session.py [n_calls]
+import os
+import sys
+import time
+import statistics
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from WhisperDriver.Obj.endpoints import WhisperTradesEndpoints
+from WhisperDriver.Obj.throttle import WhisperTradesThrottle
+from stub_server import StubServer, synthetic_bot
+
+
+def time_calls(fxn, n):
+    samples = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        fxn()
+        samples.append(time.perf_counter() - t0)
+    return samples
+
+
+def report(label, samples, connections):
+    print(f"{label:<28} mean={statistics.mean(samples) * 1e3:7.3f} ms  p50={statistics.median(samples) * 1e3:7.3f} ms  "
+          f"p95={sorted(samples)[int(len(samples) * 0.95) - 1] * 1e3:7.3f} ms  connections={connections}")
+
+
+def run_main(n_calls=500):
+    routes = {'bots/BOT000001': synthetic_bot(1)}
+    with StubServer(routes) as stub:
+        throttle = WhisperTradesThrottle()
+        throttle.disable()
+        endpts = WhisperTradesEndpoints('benchmark-token', throttle)
+        endpts.config.SERVER = stub.url
+        url = stub.url + 'bots/BOT000001'
+        headers = endpts.config.HEADERS
+
+        start_conns = stub.connection_count
+        per_call = time_calls(lambda: requests.request("GET", url, headers=headers, data={}), n_calls)
+        report('requests.request (no pool)', per_call, stub.connection_count - start_conns)
+
+        start_conns = stub.connection_count
+        pooled = time_calls(lambda: endpts.bots.get_bot('BOT000001'), n_calls)
+        report('pooled session', pooled, stub.connection_count - start_conns)
+        endpts.close()
+
+    print(f"speedup (mean): {statistics.mean(per_call) / statistics.mean(pooled):.2f}x")
+
+
+if __name__ == '__main__':
+    run_main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
@@ -0,0 +1,171 @@
+########################################################################################################################
+########################################################################################################################
+###   Local Stub Server for WhisperDriver Benchmarks                                                                 ###
+###                                                                                                                  ###
+###   Authored by Paul Nobrega   Contact: Paul@PaulNobrega.net                                                       ###
+###   Python Version 3.10                                                                                            ###
+########################################################################################################################
+########################################################################################################################
+import json
+from datetime import datetime
+import time
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+
+class StubServer(object):
+    """
+    Minimal HTTP/1.1 server that mimics the WhisperTrades.com API envelope ({"data": ...}) for local benchmarks.
+
+    Args:
+        routes (dict): Mapping of API path (relative to /v1/, e.g. 'bots/') to payload or callable(method, path, query) -> payload.
+        latency_sec (float): Artificial server-side latency added to every request.
+    """
+    def __init__(self, routes: dict = None, latency_sec: float = 0.0) -> None:
+        self.routes = routes or {}
+        self.latency_sec = latency_sec
+        self.request_count = 0
+        self.connection_count = 0
+        self.__httpd = None
+        self.__thread = None
+
+    def __enter__(self) -> 'StubServer':
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.stop()
+        return
+
+    @property
+    def url(self) -> str:
+        return f'http://127.0.0.1:{self.__httpd.server_address[1]}/v1/'
+
+    def start(self) -> str:
+        """
+        Start serving in a background thread and return the base url
+        """
+        server = self
+
+        class handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                server.connection_count += 1
+                super().setup()
+
+            def log_message(self, *args):
+                return
+
+            def _respond(self):
+                server.request_count += 1
+                length = int(self.headers.get('Content-Length') or 0)
+                if length:
+                    self.rfile.read(length)
+                if server.latency_sec:
+                    time.sleep(server.latency_sec)
+                parsed = urlparse(self.path)
+                path = parsed.path[len('/v1/'):] if parsed.path.startswith('/v1/') else parsed.path.lstrip('/')
+                payload = server.routes.get(path, server.routes.get(path.rstrip('/') + '/', []))
+                if callable(payload):
+                    payload = payload(self.command, path, parsed.query)
+                status = 200
+                headers = {}
+                if isinstance(payload, tuple):
+                    status, payload, headers = payload
+                body = json.dumps(payload if isinstance(payload, dict) and 'data' in payload else {'data': payload}).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_GET = _respond
+            do_PUT = _respond
+
+        self.__httpd = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        self.__httpd.daemon_threads = True
+        self.__thread = threading.Thread(target=self.__httpd.serve_forever, daemon=True)
+        self.__thread.start()
+        return self.url
+
+    def stop(self) -> None:
+        """
+        Shut down the server thread
+        """
+        if self.__httpd is not None:
+            self.__httpd.shutdown()
+            self.__httpd.server_close()
+            self.__httpd = None
+        return
+
+
+@contextmanager
+def endpoints_pointed_at(url: str):
+    """
+    Within the context, every new WhisperTradesEndpoints sends its requests to url instead of api.whispertrades.com
+    """
+    from WhisperDriver.Obj.endpoints import WhisperTradesEndpoints
+    original_init = WhisperTradesEndpoints.__init__
+
+    def init(self, *args, **kwargs):
+        original_init(self, *args, **kwargs)
+        self.config.SERVER = url
+
+    WhisperTradesEndpoints.__init__ = init
+    try:
+        yield
+    finally:
+        WhisperTradesEndpoints.__init__ = original_init
+
+
+def synthetic_account(n_bots: int = 200, n_variables: int = 50, n_reports: int = 20) -> dict:
+    """
+    Return stub routes for a synthetic account with n_bots bots, n_variables variables and n_reports reports
+    """
+    return {
+        'bots/': [synthetic_bot(i, 'Enabled' if i % 3 else 'Disabled') for i in range(n_bots)],
+        'bots/positions': [],
+        'bots/reports/': [{'number': f'REP{i:04d}', 'name': f'Report {i}'} for i in range(n_reports)],
+        'bots/variables/': [{'number': f'VAR{i:04d}', 'name': f'var_{i}', 'bot': None, 'value': str(i), 'free_text_value': '', 'last_updated_at': '', 'conditions': []} for i in range(n_variables)],
+        'broker_connections/': [{'number': 'BRK0001', 'name': 'Paper', 'broker': 'Schwab'}],
+    }
+
+
+def synthetic_bot(i: int, status: str = 'Enabled') -> dict:
+    """
+    Return a synthetic bot payload shaped like the WhisperTrades.com bots endpoint
+    """
+    return {
+        'number': f'BOT{i:06d}',
+        'name': f'Synthetic Bot {i}',
+        'broker_connection': {'number': 'BRK0001', 'name': 'Paper', 'broker': 'Schwab'},
+        'is_paper': True,
+        'status': status,
+        'can_enable': status != 'Enabled',
+        'can_disable': status == 'Enabled',
+        'symbol': 'SPX',
+        'type': 'Put Credit Spread',
+        'notes': '',
+        'last_active_at': '2026-01-02T15:30:00.000000Z',
+        'disabled_at': None,
+        'entry_condition': {
+            'frequency': 'Daily',
+            'maximum_entries_per_day': 1,
+            'maximum_concurrent_positions': 1,
+            'earliest_time_of_day': datetime(2026, 1, 2, 9 + (i % 6), (i * 5) % 60).strftime('%I:%M %p'),
+            'latest_time_of_day': '03:45 PM',
+            'put_short_strike_target_delta': 0.1,
+            'allocation_type': 'Contracts',
+            'contract_quantity': 1,
+        },
+        'exit_condition': {'profit_target_percent': 50, 'stop_loss_percent': 200, 'exit_time_of_day': '03:50 PM'},
+        'adjustments': [],
+        'notifications': [],
+        'variables': [{'number': f'VAR{i % 50:04d}', 'name': f'var_{i % 50}'}],
+    }
@@ -0,0 +1,16 @@
+import os
+import sys
+import types
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+from stub_server import synthetic_bot
+from WhisperDriver.Obj.bots import WhisperTradesBots
+
+
+def test_single_bot_number():
+    bots = WhisperTradesBots(types.SimpleNamespace(_endpts=None))
+    bots.bots_list.sync_bots([synthetic_bot(i) for i in range(3)])
+    # Already enabled, so skipped without a request
+    report = bots.enable_many('BOT000001')
+    assert list(report) == ['BOT000001']
+    assert report['BOT000001']['result'] == 'skipped'
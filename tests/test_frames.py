@@ -0,0 +1,68 @@
+import math
+import os
+import sys
+import types
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+from stub_server import synthetic_bot
+from WhisperDriver.Obj.bots import WhisperTradesBots
+from WhisperDriver.Obj.frames import pnl_by_bot, positions_frame
+
+
+def _bots(positions=()):
+    bots = WhisperTradesBots(types.SimpleNamespace(_endpts=None))
+    bots.bots_list.sync_bots([synthetic_bot(i) for i in range(3)])
+    bots.bots_list.update_positions_all_bots(list(positions))
+    return bots
+
+
+def test_positions_frame_missing_status():
+    positions = [
+        {'number': 'POS1', 'bot': {'number': 'BOT1'}, 'status': 'open', 'symbol': 'SPX', 'profit': 10},
+        {'number': 'POS2', 'bot': {'number': 'BOT1'}, 'status': None, 'symbol': 'SPX', 'profit': 5},
+        {'number': 'POS3', 'bot': {'number': 'BOT2'}, 'symbol': 'QQQ', 'profit': -2},
+    ]
+    frame = positions_frame(positions)
+    assert str(frame['status'].dtype) == 'category'
+    assert frame['status'].iloc[0] == 'OPEN'
+    assert frame['status'].iloc[1:].isna().all()
+    pnl = pnl_by_bot(frame)
+    assert math.isclose(pnl['total'].sum(), 13.0)
+
+
+def test_rollups_build_frame_from_bots():
+    positions = [
+        {'number': 'POS1', 'bot': {'number': 'BOT000000'}, 'status': 'OPEN', 'symbol': 'QQQ', 'profit': 10, 'max_risk': 100},
+        {'number': 'POS2', 'bot': {'number': 'BOT000000'}, 'status': 'CLOSED', 'symbol': 'QQQ', 'profit': '4.5'},
+        {'number': 'POS3', 'bot': {'number': 'BOT000001'}, 'status': 'open', 'profit': -2, 'max_risk': 50},
+    ]
+    bots = _bots(positions)
+    frame = bots.positions_frame()
+    assert list(frame['number']) == ['POS1', 'POS2', 'POS3']
+    assert list(frame['bot']) == ['BOT000000', 'BOT000000', 'BOT000001']
+    # Missing symbol is taken from the bot
+    assert list(frame['symbol']) == ['QQQ', 'QQQ', 'SPX']
+    assert list(frame['status']) == ['OPEN', 'CLOSED', 'OPEN']
+
+    pnl = bots.pnl_by_bot()
+    assert math.isclose(pnl.loc['BOT000000', 'realized'], 4.5)
+    assert math.isclose(pnl.loc['BOT000000', 'unrealized'], 10.0)
+    assert pnl.loc['BOT000000', 'positions'] == 2
+    assert pnl.loc['BOT000001', 'open_positions'] == 1
+    assert 'BOT000002' not in pnl.index
+
+    risk = bots.open_risk_by_symbol()
+    assert math.isclose(risk.loc['QQQ', 'max_risk'], 100.0)
+    assert math.isclose(risk.loc['SPX', 'unrealized'], -2.0)
+
+
+def test_rollups_without_positions():
+    bots = _bots()
+    assert len(bots.positions_frame()) == 0
+    pnl = bots.pnl_by_bot()
+    assert pnl.empty
+    assert list(pnl.columns) == ['realized', 'unrealized', 'total', 'positions', 'open_positions']
+    risk = bots.open_risk_by_symbol()
+    assert risk.empty
+    assert list(risk.columns) == ['max_risk', 'unrealized', 'open_positions']
+    assert pnl_by_bot(positions_frame([])).empty
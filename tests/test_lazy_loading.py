@@ -0,0 +1,43 @@
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+from stub_server import StubServer, endpoints_pointed_at, synthetic_account
+from WhisperDriver.wrapper import ApiWrapper
+
+
+def test_concurrent_first_access_waits_for_load():
+    with StubServer(synthetic_account(n_bots=20), latency_sec=0.2) as stub, endpoints_pointed_at(stub.url):
+        WD = ApiWrapper('test-token', lazy=True)
+        try:
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                counts = list(pool.map(lambda _: len(WD.bots.bots_list.all), range(8)))
+            assert counts == [20] * 8
+            assert WD.bots('BOT000005').number == 'BOT000005'
+        finally:
+            WD.endpts.close()
+
+
+def test_failed_load_is_retried():
+    with StubServer(synthetic_account(n_bots=5)) as stub, endpoints_pointed_at(stub.url):
+        WD = ApiWrapper('test-token', lazy=True)
+        try:
+            load = WD.variables.variables_list._loader
+            calls = []
+
+            def flaky_load():
+                calls.append(1)
+                if len(calls) == 1:
+                    raise ConnectionError('first load fails')
+                load()
+
+            WD.variables.variables_list._loader = flaky_load
+            with pytest.raises(ConnectionError):
+                WD.variables.variables_list.all
+            assert len(WD.variables.variables_list.all) == 50
+            assert len(calls) == 2
+        finally:
+            WD.endpts.close()
@@ -0,0 +1,41 @@
+import threading
+import time
+
+from WhisperDriver.Obj.scheduler import WhisperTradesScheduler
+
+
+class late_trigger(object):
+    """
+    Fires once, late_sec in the past (as found after the machine was suspended)
+    """
+    def __init__(self, late_sec):
+        self.fire_at = time.time() - late_sec
+
+    def next_fire(self, after):
+        fire_at, self.fire_at = self.fire_at, None
+        return fire_at
+
+
+def _run_once(scheduler, trigger, **kwargs):
+    ran = threading.Event()
+    scheduler.add_job(trigger, ran.set, **kwargs)
+    scheduler.start()
+    try:
+        deadline = time.time() + 5
+        while not scheduler.history and time.time() < deadline:
+            time.sleep(0.01)
+    finally:
+        scheduler.stop()
+    return ran.is_set(), [run['status'] for run in scheduler.history]
+
+
+def test_late_job_in_memory_still_runs():
+    ran, statuses = _run_once(WhisperTradesScheduler(None), late_trigger(600))
+    assert ran
+    assert statuses == ['ok']
+
+
+def test_late_job_with_own_misfire_policy_is_missed():
+    ran, statuses = _run_once(WhisperTradesScheduler(None), late_trigger(600), misfire_policy='skip')
+    assert not ran
+    assert statuses == ['missed']
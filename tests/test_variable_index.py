@@ -0,0 +1,36 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+from stub_server import StubServer, endpoints_pointed_at, synthetic_account
+from WhisperDriver.wrapper import ApiWrapper
+
+
+def test_variable_index_populated_at_construction():
+    with StubServer(synthetic_account(n_bots=3)) as stub, endpoints_pointed_at(stub.url):
+        WD = ApiWrapper('test-token')
+        try:
+            requests_made = stub.request_count
+            bot = WD.bots.bots_list.all[0]
+            variables = WD.variables.variables_for_bot(bot.number)
+            assert [vari.number for vari in variables] == [bot_var['number'] for bot_var in bot.variables]
+            assert bot.number in WD.variables.bots_for_variable(variables[0].number)
+            assert stub.request_count == requests_made
+        finally:
+            WD.endpts.close()
+
+
+def test_enriched_variables_are_not_reported_as_changes():
+    with StubServer(synthetic_account(n_bots=3)) as stub, endpoints_pointed_at(stub.url):
+        WD = ApiWrapper('test-token')
+        try:
+            WD.bots.get_all_bot_variables()
+            bot = WD.bots.bots_list.all[0]
+            assert 'value' in bot.variables[0]
+            changes = WD.bots.update_all_bots()
+            assert changes['settings_changed'] == []
+            assert changes['changed_fields'] == {}
+            # Unchanged variables keep the enriched entries
+            assert 'value' in bot.variables[0]
+        finally:
+            WD.endpts.close()